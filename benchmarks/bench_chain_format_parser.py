@@ -0,0 +1,88 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Benchmark the loading of large chain definition files.
+
+Compares the previous loading path (pure-Python YAML loader and one pydantic
+model per link) with the current one (JSON fast path or libyaml, bulk
+validation, optional trusted mode) on a generated ring chain.
+
+Usage::
+
+    python benchmarks/bench_chain_format_parser.py --links 200000
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import yaml
+
+from markov_solver.parser.base import load_document
+from markov_solver.parser.chain_format_parser import ChainFormatParser
+from markov_solver.parser.schema import MarkovChainDefinition
+
+
+def generate(links: int) -> dict:  # type: ignore[type-arg]
+    return {
+        "symbols": {"lambda": 1.5},
+        "chain": [
+            {"from": f"S{i}", "to": f"S{(i + 1) % links}", "value": "lambda"}
+            for i in range(links)
+        ],
+    }
+
+
+def measure(label: str, func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:.<56}{elapsed:>10.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--links", type=int, default=200_000)
+    parser.add_argument(
+        "--yaml-links",
+        type=int,
+        default=50_000,
+        help="Links for the pure-Python YAML loader, which is much slower.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "chain.json"
+        json_path.write_text(json.dumps(generate(args.links)))
+        yaml_path = Path(tmp) / "chain.yaml"
+        yaml_path.write_text(yaml.dump(generate(args.yaml_links), Dumper=yaml.CDumper))
+        json_content = json_path.read_text()
+        yaml_content = yaml_path.read_text()
+
+        print(f"JSON definition with {args.links} links")
+        raw = load_document(json_content)
+        measure("yaml.safe_load (previous)", lambda: yaml.safe_load(json_content))
+        measure("load_document (JSON fast path)", lambda: load_document(json_content))
+        measure(
+            "MarkovChainDefinition.model_validate (previous)",
+            lambda: MarkovChainDefinition.model_validate(raw),
+        )
+        measure(
+            "ChainFormatParser.parse", lambda: ChainFormatParser().parse(json_content)
+        )
+        measure(
+            "ChainFormatParser(trusted=True).parse",
+            lambda: ChainFormatParser(trusted=True).parse(json_content),
+        )
+
+        print(f"YAML definition with {args.yaml_links} links")
+        measure("yaml.safe_load (previous)", lambda: yaml.safe_load(yaml_content))
+        measure("load_document (libyaml)", lambda: load_document(yaml_content))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Benchmark the parsing of large DOT files.
+
+Compares the previous line regex with the tokenizer-based reader on a
+generated ring chain, and reports the time spent tokenizing and building
+the chain.
+
+Usage::
+
+    python benchmarks/bench_dot_parser.py --edges 1000000
+"""
+
+import argparse
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from markov_solver.parser.dot_parser import DotParser, DotTokenizer
+
+PREVIOUS_EDGE_PATTERN = re.compile(
+    r'^\s*"?([^"\s\->]+)"?\s*->\s*"?([^"\s\[]+)"?\s*'
+    r'(?:\[\s*label\s*=\s*"?([^"\]]+)"?\s*])?',
+    re.MULTILINE,
+)
+
+
+def generate(edges: int) -> str:
+    lines = ["digraph {"]
+    lines.extend(
+        f'    S{i} -> S{(i + 1) % edges} [label="lambda"]' for i in range(edges)
+    )
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def measure(label: str, func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:.<56}{elapsed:>10.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "chain.dot"
+        path.write_text(generate(args.edges))
+        content = path.read_text()
+
+        print(f"DOT file with {args.edges} edges")
+        measure(
+            "EDGE_PATTERN.findall (previous, no chain)",
+            lambda: PREVIOUS_EDGE_PATTERN.findall(content),
+        )
+
+        def tokenize_file() -> None:
+            with path.open() as stream:
+                for _ in DotTokenizer(stream):
+                    pass
+
+        measure("tokenize", tokenize_file)
+
+        def parse_file() -> None:
+            with path.open() as stream:
+                DotParser().parse_stream(stream)
+
+        measure("DotParser.parse_stream", parse_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Benchmark the evaluation of link values.
+
+Evaluates a set of distinct rate expressions many times, with the compiled
+expressions and with Python eval after replacing the symbols in the string,
+as link values used to be evaluated. Then, evaluates the numeric link values
+of an imported matrix, given as strings, as imported matrices used to store
+them.
+
+Usage::
+
+    python benchmarks/bench_expression.py --distinct 100 --repeat 100 \
+        --nonzeros 200000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from markov_solver.model.expression import compile_expression, evaluate
+
+SYMBOLS = {"lambda_": 1.5, "mu": 2.0, "p": 0.3}
+
+
+def replace_eval(value: str) -> float:
+    for k, v in SYMBOLS.items():
+        value = value.replace(k, str(v))
+    return float(eval(value))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--distinct", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--nonzeros", type=int, default=200_000)
+    args = parser.parse_args()
+
+    values = ["lambda_*p + mu*{}".format(i) for i in range(args.distinct)]
+    compile_expression.cache_clear()
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        compiled = [float(evaluate(value, SYMBOLS)) for value in values]
+    print(f"compiled {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        replaced = [replace_eval(value) for value in values]
+    print(f"eval {time.perf_counter() - start:.3f}s")
+    assert compiled == replaced
+
+    # Imported matrix: distinct numbers, most of them seen once.
+    rng = np.random.default_rng(0)
+    numbers = [repr(x) for x in rng.exponential(size=args.nonzeros).tolist()]
+    compile_expression.cache_clear()
+    start = time.perf_counter()
+    compiled = [float(evaluate(value, SYMBOLS)) for value in numbers]
+    print(f"imported matrix compiled {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    replaced = [replace_eval(value) for value in numbers]
+    print(f"imported matrix eval {time.perf_counter() - start:.3f}s")
+    assert compiled == replaced
+    assert compile_expression.cache_info().currsize == 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Benchmark the preconditioners of the Krylov steady-state solver.
+
+Solves a stiff tandem queue, whose transfers are much faster than arrivals
+and services, with GMRES and every preconditioner, and reports the setup
+time of the preconditioner, the iteration time and the number of
+iterations, along with the time of the sparse direct solver.
+
+Usage::
+
+    python benchmarks/bench_krylov.py --capacity 150
+"""
+
+import argparse
+import time
+
+import numpy as np
+from scipy import sparse  # type: ignore
+
+from markov_solver.solver.krylov import (
+    PRECONDITIONERS,
+    KrylovSolver,
+    solve_steady_state_krylov,
+)
+from markov_solver.solver.numeric import SolverError, solve_steady_state
+
+
+def generate(capacity: int, transfer: float) -> sparse.csr_matrix:
+    size = capacity + 1
+    i, j = np.divmod(np.arange(size * size), size)
+    rows, cols, values = [], [], []
+    for mask, target, rate in (
+        (i < capacity, (i + 1) * size + j, 1.0),
+        ((i > 0) & (j < capacity), (i - 1) * size + j + 1, transfer),
+        (j > 0, i * size + j - 1, 1.2),
+    ):
+        rows.append(np.flatnonzero(mask))
+        cols.append(target[mask])
+        values.append(np.full(int(mask.sum()), rate))
+    rates = sparse.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(size * size, size * size),
+    )
+    return sparse.csr_matrix(
+        rates - sparse.diags(np.asarray(rates.sum(axis=1)).ravel())
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--capacity", type=int, default=150)
+    parser.add_argument("--transfer", type=float, default=1000.0)
+    args = parser.parse_args()
+
+    generator = generate(args.capacity, args.transfer)
+    print(f"Tandem queue with {generator.shape[0]} states")
+    start = time.perf_counter()
+    expected = solve_steady_state(generator)
+    print(f"{'direct':.<24}{time.perf_counter() - start:>10.3f}s")
+    print(
+        f"{'preconditioner':<24}{'setup':>11}{'iterate':>11}{'iters':>8}{'error':>11}"
+    )
+    for preconditioner in PRECONDITIONERS:
+        solver = KrylovSolver(preconditioner, max_iterations=200)
+        try:
+            error = np.abs(
+                solve_steady_state_krylov(generator, solver) - expected
+            ).max()
+        except SolverError:
+            error = float("nan")
+        diagnostics = solver.diagnostics
+        assert diagnostics is not None
+        print(
+            f"{preconditioner:.<24}{diagnostics.setup_time:>10.3f}s"
+            f"{diagnostics.solve_time:>10.3f}s{diagnostics.iterations:>8}{error:>11.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Benchmark the export of chain matrices.
+
+Compares MarkovChain.matrixs() with the streaming dense CSV writer on a small
+ring chain, and reports the time spent by the sparse writers on a large one.
+
+Usage::
+
+    python benchmarks/bench_matrix_exporter.py --states 500000
+"""
+
+import argparse
+import os
+import time
+from typing import Callable
+
+from markov_solver.exporter.matrix_exporter import (
+    write_csr,
+    write_dense_csv,
+    write_triplets,
+)
+from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.model.markov_link import MarkovLink
+
+
+def generate(states: int) -> MarkovChain:
+    chain = MarkovChain()
+    ring = [chain.add_state(f"S{i}") for i in range(states)]
+    for i in range(states):
+        chain.add_link(MarkovLink(ring[i], ring[(i + 1) % states], "1.5"))
+        chain.add_link(MarkovLink(ring[i], ring[i - 1], "0.5"))
+    return chain
+
+
+def measure(label: str, func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:.<56}{elapsed:>10.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dense-states", type=int, default=200)
+    parser.add_argument("--states", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        chain = generate(args.dense_states)
+        print(f"Ring chain with {args.dense_states} states")
+        measure("matrixs (previous)", chain.matrixs)
+        measure(
+            "write_dense_csv (transition)",
+            lambda: write_dense_csv(chain, devnull, kind="transition"),
+        )
+
+        chain = generate(args.states)
+        print(f"Ring chain with {args.states} states")
+        measure("write_triplets (generator)", lambda: write_triplets(chain, devnull))
+        measure("write_csr (generator)", lambda: write_csr(chain, devnull))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Benchmark chains defined by a vectorized transition function.
+
+Defines a tandem queue by a function computing the transitions of batches
+of states, and reports the time of a vector product, against the product
+with the materialized CSR rates, and of the steady-state solve with GMRES
+on the vector products.
+
+Usage::
+
+    python benchmarks/bench_operator_chain.py --capacity 300
+"""
+
+import argparse
+import time
+from typing import Tuple
+
+import numpy as np
+
+from markov_solver.model.operator_chain import OperatorChain, Transitions
+
+
+def tandem(capacity: int) -> Transitions:
+    size = capacity + 1
+
+    def transitions(states: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        i, j = np.divmod(states, size)
+        sources, targets, rates = [], [], []
+        for mask, target, rate in (
+            (i < capacity, states + size, 1.0),
+            ((i > 0) & (j < capacity), states - size + 1, 2.0),
+            (j > 0, states - 1, 1.2),
+        ):
+            sources.append(states[mask])
+            targets.append(target[mask])
+            rates.append(np.full(int(mask.sum()), rate))
+        return np.concatenate(sources), np.concatenate(targets), np.concatenate(rates)
+
+    return transitions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--capacity", type=int, default=300)
+    parser.add_argument("--solve-capacity", type=int, default=100)
+    args = parser.parse_args()
+
+    chain = OperatorChain((args.capacity + 1) ** 2, tandem(args.capacity))
+    print(f"Tandem queue with {chain.size} states")
+    x = np.full(chain.size, 1.0 / chain.size)
+    chain.diagonal()
+    start = time.perf_counter()
+    chain.vector_product(x)
+    print(f"operator product {time.perf_counter() - start:.3f}s")
+    rates = chain.rates_matrix()
+    transposed = rates.T.tocsr()
+    start = time.perf_counter()
+    transposed @ x
+    print(f"sparse product {time.perf_counter() - start:.3f}s  {rates.nnz} nonzeros")
+
+    small = OperatorChain((args.solve_capacity + 1) ** 2, tandem(args.solve_capacity))
+    start = time.perf_counter()
+    solution = small.solve()
+    assert solution.diagnostics is not None
+    print(
+        f"solve {small.size} states {time.perf_counter() - start:.3f}s  "
+        f"{solution.diagnostics.iterations} iterations  "
+        f"residual {solution.residual:.1e}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Benchmark the exchange of generator matrices with a process pool.
+
+Builds the generator of a tandem queue and runs the same batch of tasks in a
+process pool twice: once pickling the matrix with every task and returning
+the solution vectors, and once passing shared memory handles and writing
+the solutions to a shared results array. Reports the pickled size of the
+task arguments and the wall time of both batches. With --task touch, the
+tasks only read the matrix, to time the exchange alone.
+
+Usage::
+
+    python benchmarks/bench_shared_memory.py --capacity 300 --tasks 8
+"""
+
+import argparse
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+from scipy import sparse  # type: ignore
+
+from markov_solver.solver.numeric import solve_shared, solve_steady_state
+from markov_solver.utils.shared_memory import (
+    ArrayHandle,
+    MatrixHandle,
+    SharedArrays,
+    attach_array,
+    attach_matrix,
+)
+
+
+def tandem(capacity: int) -> Any:
+    size = capacity + 1
+    ones = np.ones(capacity)
+    up = sparse.diags(ones, 1)
+    down = sparse.diags(ones, -1)
+    eye = sparse.identity(size)
+    rates = (
+        sparse.kron(up, eye)
+        + 2.0 * sparse.kron(down, up)
+        + 1.2 * sparse.kron(eye, down)
+    )
+    rates = sparse.csr_matrix(rates)
+    return sparse.csr_matrix(
+        rates - sparse.diags(np.asarray(rates.sum(axis=1)).ravel())
+    )
+
+
+def touch_pickled(generator: Any) -> np.ndarray:
+    return np.asarray(generator.diagonal())
+
+
+def touch_shared(generator: MatrixHandle, results: ArrayHandle, row: int) -> float:
+    attach_array(results)[row] = attach_matrix(generator).diagonal()
+    return 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--capacity", type=int, default=300)
+    parser.add_argument("--tasks", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--task", choices=("solve", "touch"), default="solve")
+    args = parser.parse_args()
+
+    generator = tandem(args.capacity)
+    n = generator.shape[0]
+    print(f"Tandem queue with {n} states, {generator.nnz} nonzeros")
+    pickled, shared = (
+        (solve_steady_state, solve_shared)
+        if args.task == "solve"
+        else (touch_pickled, touch_shared)
+    )
+
+    with ProcessPoolExecutor(args.workers) as pool:
+        start = time.perf_counter()
+        solutions = list(pool.map(pickled, [generator] * args.tasks))
+        elapsed = time.perf_counter() - start
+        size = len(pickle.dumps(generator)) + solutions[0].nbytes
+        print(f"pickled {elapsed:.3f}s  {size / 2**20:.1f} MiB per task")
+
+        with SharedArrays() as arrays:
+            matrix = arrays.share_matrix(generator)
+            results, view = arrays.create_array((args.tasks, n))
+            start = time.perf_counter()
+            list(
+                pool.map(
+                    shared,
+                    [matrix] * args.tasks,
+                    [results] * args.tasks,
+                    range(args.tasks),
+                )
+            )
+            elapsed = time.perf_counter() - start
+            size = len(pickle.dumps((matrix, results, args.tasks)))
+            print(f"shared {elapsed:.3f}s  {size} bytes per task")
+            assert np.allclose(view[0], solutions[0])
+            del view
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Benchmark the state-space explorer.
+
+Explores a tandem queue with the given capacity, whose state space has
+(capacity + 1)^2 states, with 1, 4 and 16 workers, and reports the states
+explored per second. The --work option adds busy work to every expansion, to
+mimic costly successor functions.
+
+Usage::
+
+    python benchmarks/bench_state_space.py --capacity 1000 --workers 1 4 16
+"""
+
+import argparse
+from functools import partial
+from typing import Iterator, List, Tuple
+
+from markov_solver.model.state_space import explore
+
+
+def tandem(
+    capacity: int, work: int, state: Tuple[int, int]
+) -> Iterator[Tuple[Tuple[int, int], float]]:
+    for _ in range(work):
+        pass
+    i, j = state
+    if i < capacity:
+        yield (i + 1, j), 1.0
+    if i > 0 and j < capacity:
+        yield (i - 1, j + 1), 2.0
+    if j > 0:
+        yield (i, j - 1), 3.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--capacity", type=int, default=300)
+    parser.add_argument("--work", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    successors = partial(tandem, args.capacity, args.work)
+    print(f"Tandem queue with {(args.capacity + 1) ** 2} states")
+    workers: List[int] = args.workers
+    for count in workers:
+        space = explore([(0, 0)], successors, workers=count)
+        label = f"{count} workers"
+        print(f"{label:.<40}{space.elapsed:>10.3f}s{space.throughput:>14,.0f} states/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Benchmark a sweep over the symbols of a large chain.
+
+Builds a birth-death chain whose links repeat a few rate expressions, then
+changes a symbol several times, rebuilding the generator matrix after each
+change. The first build walks the links; the following ones only evaluate
+the distinct expressions and gather their values by expression id.
+
+Usage::
+
+    python benchmarks/bench_symbol_sweep.py --states 200000 --points 5
+"""
+
+import argparse
+import time
+
+from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.model.markov_link import MarkovLink
+from markov_solver.model.markov_state import MarkovState
+
+
+def generate(n: int) -> MarkovChain:
+    chain = MarkovChain()
+    chain.add_symbols(lambda_=1.0, mu=2.0)
+    states = [chain.add_state(MarkovState(str(i))) for i in range(n)]
+    for i in range(n - 1):
+        chain.add_link(MarkovLink(states[i], states[i + 1], str("lambda_")))
+        down = "mu*{}".format(i % 4 + 1)
+        chain.add_link(MarkovLink(states[i + 1], states[i], down))
+    return chain
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=200_000)
+    parser.add_argument("--points", type=int, default=5)
+    args = parser.parse_args()
+
+    chain = generate(args.states)
+    strings = len({id(link.value) for link in chain.links})
+    print(
+        f"Birth-death chain with {len(chain.links)} links, "
+        f"{len(chain.expressions)} expressions, {strings} value strings"
+    )
+    start = time.perf_counter()
+    chain.generator_matrix()
+    print(f"first build {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    for k in range(args.points):
+        chain.add_symbols(lambda_=1.0 + 0.1 * k)
+        chain.generator_matrix()
+    elapsed = (time.perf_counter() - start) / args.points
+    print(f"sweep {elapsed:.3f}s per point")
+
+
+if __name__ == "__main__":
+    main()
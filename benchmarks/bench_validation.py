@@ -0,0 +1,51 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Benchmark the validation of a large chain.
+
+Builds a birth-death chain whose rates are symbolic expressions, with a
+fraction of negative rates and undefined symbols, and reports the time of
+the validation pass and the number of violations found.
+
+Usage::
+
+    python benchmarks/bench_validation.py --states 500000
+"""
+
+import argparse
+import time
+
+from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.model.markov_link import MarkovLink
+from markov_solver.model.markov_state import MarkovState
+
+
+def generate(n: int) -> MarkovChain:
+    chain = MarkovChain()
+    chain.add_symbols(lambda_=1.0, mu=2.0)
+    states = [chain.add_state(MarkovState(str(i))) for i in range(n)]
+    for i in range(n - 1):
+        up = "-lambda_" if i % 1000 == 0 else "lambda_"
+        down = "nu" if i % 5000 == 0 else "mu*{}".format(i % 4 + 1)
+        chain.add_link(MarkovLink(states[i], states[i + 1], up))
+        chain.add_link(MarkovLink(states[i + 1], states[i], down))
+    return chain
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=500_000)
+    args = parser.parse_args()
+
+    chain = generate(args.states)
+    print(
+        f"Birth-death chain with {len(chain.states)} states, {len(chain.links)} links"
+    )
+    start = time.perf_counter()
+    report = chain.validate()
+    elapsed = time.perf_counter() - start
+    print(f"validate {elapsed:.3f}s  {report.counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,28 @@
 #!/usr/bin/env python3
 
 import os
+from typing import Optional, Tuple
 
 import click
 
 from markov_solver.constants import __version__
-from markov_solver.parser.markov_chain_parser import create_chain_from_file
+from markov_solver.model.markov_chain import SOLVE_METHODS, SYMBOLIC_MAX_STATES
+from markov_solver.parser.markov_chain_parser import (
+    STRING_FORMATS,
+    create_chain_from_file,
+    create_chain_from_stream,
+)
+from markov_solver.solver.krylov import PRECONDITIONERS
+from markov_solver.solver.numeric import PRECISIONS
 from markov_solver.utils import guiutils, logutils
-from markov_solver.results.report import SimpleReport as Report
+from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.model.validation import MAX_REPORTED, ROW_SUM_TOLERANCE
+from markov_solver.results.report import (
+    SOLUTION_FORMATS,
+    SUMMARY_TOP_K,
+    PassageReport,
+    SolutionReport,
+)
 
 logger = logutils.get_logger(__name__)
 
@@ -31,12 +46,37 @@ def main(ctx: click.Context, debug: bool) -> None:
         logger.debug("Debug Mode: {}".format("on" if debug else "off"))
 
 
+def load_chain(
+    definition: str, stdin_format: str, validate: bool = True
+) -> MarkovChain:
+    if definition == "-":
+        markov_chain = create_chain_from_stream(
+            click.get_text_stream("stdin"), stdin_format
+        )
+    else:
+        markov_chain = create_chain_from_file(definition)
+    if validate:
+        report = markov_chain.validate()
+        for warning in report.warnings:
+            logger.warning(warning.message)
+        if not report.valid:
+            raise click.ClickException("Invalid chain definition:\n{}".format(report))
+    return markov_chain
+
+
 @main.command(help="Solve Markov Chain.")
 @click.option(
     "--definition",
     required=True,
-    type=click.Path(exists=True),
-    help="Chain definition file.",
+    type=click.Path(exists=True, allow_dash=True),
+    help="Chain definition file, or - to read it from stdin.",
+)
+@click.option(
+    "--stdin-format",
+    default="ndjson",
+    show_default=True,
+    type=click.Choice(STRING_FORMATS),
+    help="Format of the chain definition read from stdin.",
 )
 @click.option(
     "--outdir",
@@ -45,23 +85,284 @@ def main(ctx: click.Context, debug: bool) -> None:
     type=click.Path(exists=False),
     help="Output directory.",
 )
+@click.option(
+    "--results-format",
+    default="csv",
+    show_default=True,
+    type=click.Choice(SOLUTION_FORMATS),
+    help="Format of the state probabilities saved in the output directory.",
+)
+@click.option(
+    "--top-k",
+    default=SUMMARY_TOP_K,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Number of most likely states to show, or 0 to show all.",
+)
+@click.option(
+    "--min-prob",
+    default=None,
+    type=click.FloatRange(min=0, max=1),
+    help="Minimum probability of the states to show.",
+)
+@click.option(
+    "--method",
+    default="auto",
+    show_default=True,
+    type=click.Choice(SOLVE_METHODS),
+    help="Solve method. With auto, large or slow chains are solved numerically. "
+    "With iad, states are partitioned by their first component.",
+)
+@click.option(
+    "--symbolic-timeout",
+    default=60.0,
+    show_default=True,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Maximum seconds for the symbolic solver before falling back to numeric.",
+)
+@click.option(
+    "--max-symbolic-states",
+    default=SYMBOLIC_MAX_STATES,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Maximum number of states for the symbolic solver in auto mode.",
+)
+@click.option(
+    "--preconditioner",
+    default="ilu0",
+    show_default=True,
+    type=click.Choice(PRECONDITIONERS),
+    help="Preconditioner of the krylov method.",
+)
+@click.option(
+    "--refinement-steps",
+    default=0,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Iterative refinement steps of the numeric and krylov methods.",
+)
+@click.option(
+    "--precision",
+    default="float64",
+    show_default=True,
+    type=click.Choice(PRECISIONS),
+    help="Precision of the residuals and probabilities of the numeric and krylov "
+    "methods.",
+)
+@click.option(
+    "--validate/--no-validate",
+    default=True,
+    show_default=True,
+    help="Check the link values and the states of the chain before solving it.",
+)
 @click.pass_context
-def solve(ctx: click.Context, definition: str, outdir: str) -> None:
-    logger.info("Arguments: definition={} | outdir={}".format(definition, outdir))
-    markov_chain = create_chain_from_file(definition)
-    states_probabilities = markov_chain.solve()
+def solve(
+    ctx: click.Context,
+    definition: str,
+    stdin_format: str,
+    outdir: str,
+    results_format: str,
+    top_k: int,
+    min_prob: Optional[float],
+    method: str,
+    symbolic_timeout: float,
+    max_symbolic_states: int,
+    preconditioner: str,
+    refinement_steps: int,
+    precision: str,
+    validate: bool,
+) -> None:
+    logger.info(
+        "Arguments: definition={} | outdir={} | method={}".format(
+            definition, outdir, method
+        )
+    )
+    markov_chain = load_chain(definition, stdin_format, validate)
+    try:
+        states_probabilities = markov_chain.solve(
+            method=method,
+            symbolic_timeout=symbolic_timeout,
+            max_symbolic_states=max_symbolic_states,
+            preconditioner=preconditioner,
+            refinement_steps=refinement_steps,
+            precision=precision,
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--method") from e
 
-    report = Report("MARKOV CHAIN SOLUTION")
-    for state in sorted(states_probabilities):
-        report.add("states probability", state, states_probabilities[state])
+    report = SolutionReport(
+        "MARKOV CHAIN SOLUTION",
+        states_probabilities,
+        markov_chain.measures(states_probabilities),
+    )
+    summary = report.summary(top_k=top_k or None, min_prob=min_prob)
 
-    print(report)
-    report.save_txt(os.path.join(outdir, "result.txt"), append=True, empty=True)
-    report.save_csv(os.path.join(outdir, "result.csv"), append=True, empty=True)
+    print(summary)
+    summary.save_txt(os.path.join(outdir, "result.txt"), append=True, empty=True)
+    report.save(
+        os.path.join(outdir, "result.{}".format(results_format)), results_format
+    )
 
     markov_chain.render_graph(os.path.join(outdir, "MarkovChain"), "svg")
     markov_chain.render_graph(os.path.join(outdir, "MarkovChain"), "png")
 
 
+@main.command(help="Compute first passage times to target states.")
+@click.option(
+    "--definition",
+    required=True,
+    type=click.Path(exists=True, allow_dash=True),
+    help="Chain definition file, or - to read it from stdin.",
+)
+@click.option(
+    "--stdin-format",
+    default="ndjson",
+    show_default=True,
+    type=click.Choice(STRING_FORMATS),
+    help="Format of the chain definition read from stdin.",
+)
+@click.option(
+    "--target",
+    "targets",
+    required=True,
+    multiple=True,
+    help="Target state name. Repeat the option for several targets.",
+)
+@click.option(
+    "--moments",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of moments of the passage times to compute.",
+)
+@click.option(
+    "--time",
+    "times",
+    multiple=True,
+    type=click.FloatRange(min=0),
+    help="Time t of the distribution function P(T <= t). Repeat for several times.",
+)
+@click.option(
+    "--method",
+    default="direct",
+    show_default=True,
+    type=click.Choice(["direct", "krylov"]),
+    help="Solver of the passage-time system: sparse LU or preconditioned GMRES.",
+)
+@click.option(
+    "--preconditioner",
+    default="ilu0",
+    show_default=True,
+    type=click.Choice(PRECONDITIONERS),
+    help="Preconditioner of the krylov method.",
+)
+@click.option(
+    "--outdir",
+    default="out",
+    show_default=True,
+    type=click.Path(exists=False),
+    help="Output directory.",
+)
+@click.option(
+    "--top-k",
+    default=SUMMARY_TOP_K,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Number of states to show, or 0 to show all.",
+)
+@click.option(
+    "--validate/--no-validate",
+    default=True,
+    show_default=True,
+    help="Check the link values and the states of the chain before solving it.",
+)
+def passage(
+    definition: str,
+    stdin_format: str,
+    targets: Tuple[str, ...],
+    moments: int,
+    times: Tuple[float, ...],
+    method: str,
+    preconditioner: str,
+    outdir: str,
+    top_k: int,
+    validate: bool,
+) -> None:
+    logger.info(
+        "Arguments: definition={} | targets={} | outdir={}".format(
+            definition, ", ".join(targets), outdir
+        )
+    )
+    markov_chain = load_chain(definition, stdin_format, validate)
+    try:
+        passage_times = markov_chain.first_passage(
+            targets,
+            moments,
+            preconditioner=preconditioner if method == "krylov" else None,
+        )
+        distribution = (
+            markov_chain.passage_time_distribution(targets, times) if times else None
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--target") from e
+
+    report = PassageReport("FIRST PASSAGE TIMES", passage_times, distribution)
+    summary = report.summary(top_k=top_k or None)
+
+    print(summary)
+    summary.save_txt(os.path.join(outdir, "passage.txt"), append=True, empty=True)
+    report.save_csv(os.path.join(outdir, "passage.csv"), empty=True)
+    if distribution is not None:
+        report.save_cdf_csv(os.path.join(outdir, "passage_cdf.csv"), empty=True)
+
+
+@main.command(help="Check the link values and the states of a Markov Chain.")
+@click.option(
+    "--definition",
+    required=True,
+    type=click.Path(exists=True, allow_dash=True),
+    help="Chain definition file, or - to read it from stdin.",
+)
+@click.option(
+    "--stdin-format",
+    default="ndjson",
+    show_default=True,
+    type=click.Choice(STRING_FORMATS),
+    help="Format of the chain definition read from stdin.",
+)
+@click.option(
+    "--stochastic/--no-stochastic",
+    default=False,
+    show_default=True,
+    help="Check that the link values of every state are probabilities summing to 1.",
+)
+@click.option(
+    "--tolerance",
+    default=ROW_SUM_TOLERANCE,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Largest accepted difference from 1 of the row sums of stochastic chains.",
+)
+@click.option(
+    "--max-reported",
+    default=MAX_REPORTED,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Number of violations of each kind to describe.",
+)
+def validate(
+    definition: str,
+    stdin_format: str,
+    stochastic: bool,
+    tolerance: float,
+    max_reported: int,
+) -> None:
+    markov_chain = load_chain(definition, stdin_format, validate=False)
+    report = markov_chain.validate(stochastic, tolerance, max_reported)
+    print(report)
+    if not report.valid:
+        raise click.ClickException("Invalid chain definition")
+
+
 if __name__ == "__main__":
     main(obj={})
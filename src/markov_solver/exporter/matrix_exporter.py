@@ -0,0 +1,227 @@
+"""
+Exporters of Markov chains to Matrix Market and NumPy/SciPy matrix files, and
+streaming writers of their matrices in triplet, CSR and dense CSV form.
+"""
+
+import csv
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+from scipy import io as scipy_io  # type: ignore
+from scipy import sparse  # type: ignore
+
+from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.utils.file_utils import create_dir_tree
+from markov_solver.utils.matrix_utils import states_sidecar_path, write_state_names
+
+MATRIX_KINDS = ("generator", "transition")
+# Sparse rows converted and written at a time by the triplet writer.
+CHUNK_ROWS = 1024
+# Values written at a time for each CSR array, or densified by the dense
+# writer.
+CHUNK_VALUES = 1 << 16
+
+
+def _generator(chain: MarkovChain) -> Tuple[List[str], sparse.csr_matrix]:
+    states, generator = chain.generator_matrix()
+    return [state.pretty_str() for state in states], generator
+
+
+def _matrix(chain: MarkovChain, kind: str) -> Tuple[List[str], sparse.csr_matrix]:
+    if kind == "generator":
+        return _generator(chain)
+    if kind == "transition":
+        states, transition = chain.sparse_transition_matrix()
+        return [state.pretty_str() for state in states], transition
+    raise ValueError(f"Unknown matrix kind: {kind}. Supported: {MATRIX_KINDS}")
+
+
+def write_triplets(
+    chain: MarkovChain,
+    stream: TextIO,
+    kind: str = "generator",
+    chunk_rows: int = CHUNK_ROWS,
+) -> None:
+    """
+    Write the nonzero entries of a chain matrix as CSV triplets, one per line,
+    with a from,to,value header, a block of rows at a time.
+    :param chain: the Markov chain.
+    :param stream: the text stream to write to.
+    :param kind: (string) the matrix to write: generator or transition.
+    :param chunk_rows: (int) the number of rows converted at a time.
+    :return: (void)
+    :raise ValueError: if the matrix kind is unknown.
+    """
+    names, matrix = _matrix(chain, kind)
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(("from", "to", "value"))
+    for start in range(0, matrix.shape[0], chunk_rows):
+        block = matrix[start : start + chunk_rows].tocoo()
+        writer.writerows(
+            (names[row], names[col], value)
+            for row, col, value in zip(
+                (block.row + start).tolist(), block.col.tolist(), block.data.tolist()
+            )
+        )
+
+
+def write_csr(
+    chain: MarkovChain,
+    stream: TextIO,
+    kind: str = "generator",
+    chunk_values: int = CHUNK_VALUES,
+) -> None:
+    """
+    Write a chain matrix in CSR form as four CSV lines, each starting with its
+    name: states, indptr, indices and data, as in scipy.sparse.csr_matrix.
+    :param chain: the Markov chain.
+    :param stream: the text stream to write to.
+    :param kind: (string) the matrix to write: generator or transition.
+    :param chunk_values: (int) the number of array values written at a time.
+    :return: (void)
+    :raise ValueError: if the matrix kind is unknown.
+    """
+    names, matrix = _matrix(chain, kind)
+    csv.writer(stream, lineterminator="\n").writerow(["states", *names])
+    for name, array in (
+        ("indptr", matrix.indptr),
+        ("indices", matrix.indices),
+        ("data", matrix.data),
+    ):
+        stream.write(name)
+        for start in range(0, len(array), chunk_values):
+            stream.write(",")
+            stream.write(
+                ",".join(map(repr, array[start : start + chunk_values].tolist()))
+            )
+        stream.write("\n")
+
+
+def write_dense_csv(
+    chain: MarkovChain,
+    stream: TextIO,
+    kind: str = "generator",
+    chunk_values: int = CHUNK_VALUES,
+) -> None:
+    """
+    Write a chain matrix as a dense CSV adjacency matrix, with the state names
+    in the header row and first column, densifying a block of rows at a time.
+    The transition matrix can be read back with the CSV adjacency parser.
+    :param chain: the Markov chain.
+    :param stream: the text stream to write to.
+    :param kind: (string) the matrix to write: generator or transition.
+    :param chunk_values: (int) the number of matrix values densified at a
+    time, in whole rows.
+    :return: (void)
+    :raise ValueError: if the matrix kind is unknown.
+    """
+    names, matrix = _matrix(chain, kind)
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(["", *names])
+    chunk_rows = max(1, chunk_values // max(1, matrix.shape[1]))
+    for start in range(0, matrix.shape[0], chunk_rows):
+        block = matrix[start : start + chunk_rows].toarray().tolist()
+        writer.writerows([name, *row] for name, row in zip(names[start:], block))
+
+
+MATRIX_WRITERS: Dict[str, Callable[..., None]] = {
+    "triplet": write_triplets,
+    "csr": write_csr,
+    "dense": write_dense_csv,
+}
+
+
+def export_matrix(
+    chain: MarkovChain, path: Union[str, Path], form: str = "triplet", **kwargs: Any
+) -> None:
+    """
+    Write a chain matrix to a text file, streaming it in the given form.
+    :param chain: the Markov chain.
+    :param path: (string) the file path.
+    :param form: (string) the form: triplet, csr or dense.
+    :param kwargs: the options of the writer, e.g. kind.
+    :return: (void)
+    :raise ValueError: if the form or the matrix kind is unknown.
+    """
+    if form not in MATRIX_WRITERS:
+        raise ValueError(
+            f"Unknown matrix form: {form}. Supported: {tuple(MATRIX_WRITERS)}"
+        )
+    create_dir_tree(str(path))
+    with open(path, "w", newline="") as f:
+        MATRIX_WRITERS[form](chain, f, **kwargs)
+
+
+def export_matrix_market(
+    chain: MarkovChain,
+    path: Union[str, Path],
+    states_path: Optional[Union[str, Path]] = None,
+) -> None:
+    """
+    Export the generator matrix of a chain in Matrix Market coordinate format,
+    with the state names in a sidecar file, one per line, following the rows.
+    Self-loops do not affect the chain behaviour and are not exported.
+    :param chain: the Markov chain.
+    :param path: (string) the .mtx file path.
+    :param states_path: (string) the sidecar file path; defaults to the .mtx
+    file path with the .states extension.
+    :return: (void)
+    """
+    names, generator = _generator(chain)
+    create_dir_tree(str(path))
+    scipy_io.mmwrite(
+        str(path),
+        generator,
+        comment="generator matrix exported by markov-solver",
+        field="real",
+        symmetry="general",
+    )
+    write_state_names(states_path or states_sidecar_path(path), names)
+
+
+def export_numpy(
+    chain: MarkovChain, path: Union[str, Path], compressed: bool = True
+) -> None:
+    """
+    Export the generator matrix of a chain as a SciPy sparse matrix archive,
+    readable with scipy.sparse.load_npz, with the state names stored in its
+    states array. Self-loops do not affect the chain behaviour and are not
+    exported.
+    :param chain: the Markov chain.
+    :param path: (string) the .npz file path.
+    :param compressed: (bool) if True, compress the archive.
+    :return: (void)
+    """
+    names, generator = _generator(chain)
+    create_dir_tree(str(path))
+    save = np.savez_compressed if compressed else np.savez
+    # Same layout as scipy.sparse.save_npz, plus the state names.
+    save(
+        str(path),
+        format=np.array(b"csr"),
+        shape=np.array(generator.shape),
+        data=generator.data,
+        indices=generator.indices,
+        indptr=generator.indptr,
+        states=np.array(names, dtype=str),
+    )
+
+
+def export_chain(chain: MarkovChain, path: Union[str, Path]) -> None:
+    """
+    Export the generator matrix of a chain in the format of the file extension.
+    :param chain: the Markov chain.
+    :param path: (string) the .mtx or .npz file path.
+    :return: (void)
+    :raise ValueError: if the file extension is not supported.
+    """
+    extension = Path(path).suffix.lower()
+    if extension == ".mtx":
+        export_matrix_market(chain, path)
+    elif extension == ".npz":
+        export_numpy(chain, path)
+    else:
+        raise ValueError(
+            f"Unsupported export file extension: {extension}. Supported: .mtx, .npz"
+        )
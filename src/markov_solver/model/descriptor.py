@@ -0,0 +1,270 @@
+"""
+Kronecker (descriptor) representation of the generator of a chain composed
+of interacting components, in the style of stochastic automata networks.
+"""
+
+from functools import reduce
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse  # type: ignore
+
+from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.solver.krylov import (
+    GMRES_RESTART,
+    KRYLOV_MAX_ITERATIONS,
+    KRYLOV_TOLERANCE,
+    KrylovSolver,
+    solve_steady_state_operator,
+)
+
+# A synchronized event: its rate and the matrix of each component, or None
+# for the components that it does not involve.
+Event = Tuple[float, List[Optional[np.ndarray]]]
+
+
+class Descriptor(object):
+    """
+    The generator matrix of a chain whose state is the tuple of the local
+    states of some components, as a sum of Kronecker products of small
+    component matrices:
+    Q = sum_k I x ... x L_k x ... x I + sum_e r_e (W_e,1 x ... x W_e,K - D_e)
+    where L_k holds the local rates of component k, every synchronized event
+    e changes the local states of the components it involves at once, with
+    rate r_e times the product of the entries of their matrices W_e,k, and
+    the diagonal matrix D_e makes its rows sum to zero.
+    The generator is never stored: the vector products x Q are computed by
+    the shuffle algorithm, multiplying x by one small factor at a time, in
+    O(N sum_k n_k) operations and O(N) memory for N states.
+    """
+
+    def __init__(self, sizes: Sequence[int]) -> None:
+        """
+        Creates a new descriptor without transitions.
+        :param sizes: (list(int)) the number of local states of each component.
+        :raise ValueError: if there are no components or a size is not
+        positive.
+        """
+        if not sizes or min(sizes) < 1:
+            raise ValueError("The components must have at least one local state")
+        self.sizes = tuple(int(size) for size in sizes)
+        self.locals: List[Optional[np.ndarray]] = [None] * len(self.sizes)
+        self.events: List[Event] = []
+        self._balance: Optional[np.ndarray] = None
+
+    @property
+    def size(self) -> int:
+        """
+        Return the number of states of the composed chain.
+        :return: (int) the product of the component sizes.
+        """
+        return int(np.prod(self.sizes, dtype=np.int64))
+
+    def add_local(self, component: int, rates: Any) -> None:
+        """
+        Add local transitions to a component: its diagonal entries are
+        ignored, and the rates add up to the ones added before.
+        :param component: (int) the index of the component.
+        :param rates: (numpy.ndarray or sparse matrix) the n_k x n_k matrix of
+        the local rates.
+        :return: (void)
+        :raise ValueError: if the component or the matrix shape is not valid.
+        """
+        matrix = self.__factor(component, rates)
+        np.fill_diagonal(matrix, 0.0)
+        previous = self.locals[component]
+        self.locals[component] = matrix if previous is None else previous + matrix
+        self._balance = None
+
+    def add_event(self, factors: Mapping[int, Any], rate: float = 1.0) -> None:
+        """
+        Add a synchronized event, changing the local states of the components
+        it involves at once. Its rate from a state is the rate times the
+        product of the entries of the component matrices: an event that
+        involves a single component is a local transition.
+        :param factors: the n_k x n_k matrix of each component involved, by
+        component index.
+        :param rate: (float) the rate of the event.
+        :return: (void)
+        :raise ValueError: if the event involves no component, or a component
+        or a matrix shape is not valid.
+        """
+        if not factors:
+            raise ValueError("The event must involve at least one component")
+        matrices: List[Optional[np.ndarray]] = [None] * len(self.sizes)
+        for component, matrix in factors.items():
+            matrices[component] = self.__factor(component, matrix)
+        self.events.append((float(rate), matrices))
+        self._balance = None
+
+    def vector_product(self, x: np.ndarray) -> np.ndarray:
+        """
+        Multiply a vector by the generator matrix, without building it.
+        :param x: (numpy.ndarray) the vector, following the states order.
+        :return: (numpy.ndarray) the product x Q.
+        """
+        x = np.asarray(x, dtype=float)
+        result: np.ndarray = x * self.__balance()
+        for component, matrix in enumerate(self.locals):
+            if matrix is not None:
+                result += self.__shuffle(x, [(component, matrix)])
+        for rate, matrices in self.events:
+            factors = [
+                (k, matrix) for k, matrix in enumerate(matrices) if matrix is not None
+            ]
+            result += rate * self.__shuffle(x, factors)
+        return result
+
+    def diagonal(self) -> np.ndarray:
+        """
+        Return the diagonal of the generator matrix.
+        :return: (numpy.ndarray) the N diagonal entries.
+        """
+        diagonal = self.__balance().copy()
+        for rate, matrices in self.events:
+            diagonal += rate * self.__kron(
+                [None if m is None else np.diagonal(m) for m in matrices]
+            )
+        return diagonal
+
+    def state(self, index: int) -> Tuple[int, ...]:
+        """
+        Return the local states of a state of the composed chain.
+        :param index: (int) the index of the state.
+        :return: (tuple(int)) the local state of each component.
+        """
+        return tuple(int(i) for i in np.unravel_index(index, self.sizes))
+
+    def marginals(self, x: np.ndarray) -> List[np.ndarray]:
+        """
+        Return the marginal distributions of the components.
+        :param x: (numpy.ndarray) a distribution over the states.
+        :return: (list(numpy.ndarray)) the distribution of the local states of
+        each component.
+        """
+        tensor = np.asarray(x).reshape(self.sizes)
+        axes = range(len(self.sizes))
+        return [tensor.sum(axis=tuple(a for a in axes if a != k)) for k in axes]
+
+    def to_sparse(self) -> Any:
+        """
+        Build the generator matrix, e.g. to check a descriptor on small models.
+        :return: (scipy.sparse.csr_matrix) the N x N generator matrix.
+        """
+        n = self.size
+        generator = sparse.diags(self.__balance())
+        for component, matrix in enumerate(self.locals):
+            if matrix is not None:
+                generator = generator + self.__sparse_kron(
+                    [matrix if k == component else None for k in range(len(self.sizes))]
+                )
+        for rate, matrices in self.events:
+            generator = generator + rate * self.__sparse_kron(matrices)
+        return sparse.csr_matrix(generator, shape=(n, n))
+
+    def to_chain(self) -> MarkovChain:
+        """
+        Build the Markov chain of the descriptor, whose states are the tuples
+        of the local states; only feasible for small models.
+        :return: the Markov chain.
+        """
+        return MarkovChain.from_matrix(
+            self.to_sparse(), [self.state(i) for i in range(self.size)]
+        )
+
+    def solve(
+        self,
+        preconditioner: str = "jacobi",
+        tolerance: float = KRYLOV_TOLERANCE,
+        max_iterations: int = KRYLOV_MAX_ITERATIONS,
+        restart: int = GMRES_RESTART,
+        method: str = "bicgstab",
+    ) -> Tuple[np.ndarray, KrylovSolver]:
+        """
+        Solve the steady-state distribution with a preconditioned Krylov
+        method on the vector products of the descriptor. BiCGSTAB keeps about
+        ten vectors of N entries; GMRES keeps restart + 1 of them, and its
+        restarts stall on large models with the jacobi preconditioner.
+        :param preconditioner: (string) "jacobi" or "none".
+        :param tolerance: (float) the relative residual norm to reach.
+        :param max_iterations: (int) the maximum number of restart cycles;
+        BiCGSTAB runs at most max_iterations times restart iterations.
+        :param restart: (int) the number of iterations between restarts.
+        :param method: (string) the Krylov method, "bicgstab" or "gmres".
+        :return: the steady-state probabilities, following the states order,
+        and the solver, with its diagnostics.
+        :raise ValueError: if the preconditioner needs the generator matrix.
+        :raise SolverError: if the chain has no unique steady-state
+        distribution or the solver does not converge.
+        """
+        solver = KrylovSolver(
+            preconditioner, tolerance, max_iterations, restart, method=method
+        )
+        probabilities = solve_steady_state_operator(
+            self.vector_product, self.diagonal(), solver
+        )
+        return probabilities, solver
+
+    def __factor(self, component: int, matrix: Any) -> np.ndarray:
+        if not 0 <= component < len(self.sizes):
+            raise ValueError("Unknown component: {}".format(component))
+        dense = matrix.toarray() if sparse.issparse(matrix) else np.array(matrix)
+        size = self.sizes[component]
+        if dense.shape != (size, size):
+            raise ValueError(
+                "Expected a {0}x{0} matrix for component {1}, not {2}".format(
+                    size, component, dense.shape
+                )
+            )
+        return np.asarray(dense, dtype=float)
+
+    def __balance(self) -> np.ndarray:
+        # The diagonal entries making the rows of Q sum to zero, without the
+        # diagonal entries of the Kronecker products.
+        if self._balance is None:
+            balance = np.zeros(self.size)
+            for component, matrix in enumerate(self.locals):
+                if matrix is not None:
+                    balance -= self.__kron(
+                        [
+                            matrix.sum(axis=1) if k == component else None
+                            for k in range(len(self.sizes))
+                        ]
+                    )
+            for rate, matrices in self.events:
+                balance -= rate * self.__kron(
+                    [None if m is None else m.sum(axis=1) for m in matrices]
+                )
+            self._balance = balance
+        return self._balance
+
+    def __kron(self, vectors: Sequence[Optional[np.ndarray]]) -> np.ndarray:
+        # The Kronecker product of vectors, with None for vectors of ones.
+        tensor = np.ones(())
+        for size, vector in zip(self.sizes, vectors):
+            tensor = np.multiply.outer(
+                tensor, np.ones(size) if vector is None else vector
+            )
+        return np.asarray(tensor.ravel(), dtype=float)
+
+    def __sparse_kron(self, matrices: Sequence[Optional[np.ndarray]]) -> Any:
+        return reduce(
+            lambda product, factor: sparse.kron(product, factor, format="csr"),
+            (
+                sparse.identity(size) if matrix is None else sparse.csr_matrix(matrix)
+                for size, matrix in zip(self.sizes, matrices)
+            ),
+        )
+
+    def __shuffle(
+        self, x: np.ndarray, factors: Sequence[Tuple[int, np.ndarray]]
+    ) -> np.ndarray:
+        # x (I x ... x A_k x ... x I) for every factor in turn: viewing x as a
+        # left x n_k x right tensor, the product is A_k^T applied to the
+        # middle index, for all the left and right indices at once.
+        result = x
+        for component, matrix in factors:
+            left = int(np.prod(self.sizes[:component], dtype=np.int64))
+            size = self.sizes[component]
+            result = np.matmul(matrix.T, result.reshape(left, size, -1)).ravel()
+        return result
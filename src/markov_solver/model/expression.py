@@ -0,0 +1,356 @@
+"""
+A restricted compiler of the arithmetic expressions of link values and
+rewards: expressions are parsed once, checked against a whitelist of
+syntax and functions, and compiled to bytecode that can only read the
+given symbols, so that definitions from untrusted sources cannot run code.
+"""
+
+import ast
+import io
+import keyword
+import math
+import tokenize
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+# Functions of the expressions, applying to scalars and arrays alike.
+EXPRESSION_FUNCTIONS: Dict[str, Any] = {
+    "abs": np.abs,
+    "minimum": np.minimum,
+    "maximum": np.maximum,
+    "min": np.minimum,
+    "max": np.maximum,
+    "where": np.where,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "floor": np.floor,
+    "ceil": np.ceil,
+}
+# Longest accepted expression, bounding the time and the memory of parsing.
+MAX_EXPRESSION_LENGTH = 10_000
+EXPRESSION_CACHE_SIZE = 4096
+
+_OPERATORS = (
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.UAdd,
+    ast.USub,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.Eq,
+    ast.NotEq,
+)
+_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Load) + _OPERATORS
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression is not valid or cannot be evaluated."""
+
+
+class UndefinedSymbolError(ExpressionError):
+    """Raised when an expression refers to a symbol without a value."""
+
+    def __init__(self, name: str, source: str) -> None:
+        super().__init__("Symbol {} is not defined, in {!r}".format(name, source))
+        self.name = name
+
+
+def mangle(name: str) -> str:
+    """
+    Return the name of a symbol in the compiled expressions: Python keywords,
+    such as lambda, are valid symbols, renamed with a leading underscore,
+    which user symbols cannot have.
+    :param name: (string) the symbol.
+    :return: (string) the compiled name.
+    """
+    return "_" + name if keyword.iskeyword(name) else name
+
+
+class CompiledExpression(object):
+    """
+    An expression compiled to bytecode, with the symbols it refers to.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        code: Any,
+        symbols: FrozenSet[str],
+        functions: FrozenSet[str] = frozenset(),
+    ) -> None:
+        """
+        Creates a new compiled expression; use compile_expression.
+        :param source: (string) the expression.
+        :param code: the bytecode of the expression.
+        :param symbols: the symbols in the expression, functions excluded.
+        :param functions: the functions called by the expression.
+        """
+        self.source = source
+        self.code = code
+        self.symbols = symbols
+        self._functions = {name: EXPRESSION_FUNCTIONS[name] for name in functions}
+        self._names: Tuple[Tuple[str, str], ...] = tuple(
+            (symbol, mangle(symbol)) for symbol in sorted(symbols)
+        )
+
+    def evaluate(self, variables: Mapping[str, Any]) -> Any:
+        """
+        Evaluate the expression over scalar or array variables.
+        :param variables: the values of the symbols, by name.
+        :return: the value of the expression.
+        :raise UndefinedSymbolError: if a symbol has no value.
+        :raise ExpressionError: if the expression cannot be evaluated, e.g.
+        dividing a number by zero.
+        """
+        namespace: Dict[str, Any] = {"__builtins__": {}, **self._functions}
+        for symbol, name in self._names:
+            try:
+                namespace[name] = variables[symbol]
+            except KeyError:
+                raise UndefinedSymbolError(symbol, self.source) from None
+        try:
+            return eval(self.code, namespace)
+        except Exception as e:
+            raise ExpressionError(
+                "Cannot evaluate {!r}: {}".format(self.source, e)
+            ) from e
+
+    def __repr__(self) -> str:
+        return "CompiledExpression({!r})".format(self.source)
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Parse and compile an expression of numbers, symbols, arithmetic and
+    comparison operators, and calls of EXPRESSION_FUNCTIONS. Integers are
+    compiled as floats, so that powers cannot grow without bound. Expressions
+    are cached: each distinct string is compiled once.
+    :param source: (string) the expression.
+    :return: the compiled expression.
+    :raise ExpressionError: if the expression is too long, is not valid, or
+    uses syntax outside the whitelist.
+    """
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(
+            "Expression longer than {} characters".format(MAX_EXPRESSION_LENGTH)
+        )
+    try:
+        tree = ast.parse(_mangle_keywords(source.strip()), mode="eval")
+    except (SyntaxError, tokenize.TokenError, RecursionError, MemoryError) as e:
+        raise ExpressionError("Invalid expression {!r}: {}".format(source, e)) from e
+    symbols = set()
+    functions = set()
+    callees = set()
+    # Calls are walked before their callee names.
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ExpressionError(
+                    "Invalid constant {!r} in {!r}".format(node.value, source)
+                )
+            node.value = float(node.value)
+        elif isinstance(node, ast.Name):
+            if id(node) not in callees:
+                symbols.add(_unmangle(node.id, source))
+        elif isinstance(node, ast.Call):
+            if (
+                not isinstance(node.func, ast.Name)
+                or node.func.id not in EXPRESSION_FUNCTIONS
+                or node.keywords
+                or any(isinstance(arg, ast.Starred) for arg in node.args)
+            ):
+                raise ExpressionError(
+                    "Invalid function call in {!r}, supported functions: {}".format(
+                        source, ", ".join(EXPRESSION_FUNCTIONS)
+                    )
+                )
+            functions.add(node.func.id)
+            callees.add(id(node.func))
+        elif not isinstance(node, _NODES):
+            raise ExpressionError(
+                "Invalid syntax {} in {!r}".format(type(node).__name__, source)
+            )
+        if isinstance(node, ast.Compare) and len(node.ops) > 1:
+            raise ExpressionError("Chained comparison in {!r}".format(source))
+    code = compile(tree, "<expression>", "eval")
+    return CompiledExpression(source, code, frozenset(symbols), frozenset(functions))
+
+
+def evaluate(expression: Union[str, float], variables: Mapping[str, Any]) -> Any:
+    """
+    Evaluate an expression, compiling it if it is not cached.
+    :param expression: (string) the expression, or a number.
+    :param variables: the values of the symbols, by name.
+    :return: the value of the expression.
+    :raise ExpressionError: if the expression is not valid or cannot be
+    evaluated.
+    """
+    if isinstance(expression, (int, float)):
+        return float(expression)
+    # Numbers, e.g. the values of imported matrices, are not compiled, so
+    # that they do not evict the expressions from the cache.
+    try:
+        value = float(expression)
+    except ValueError:
+        pass
+    else:
+        # Strings such as nan or inf are symbols.
+        if math.isfinite(value):
+            return value
+    return compile_expression(expression).evaluate(variables)
+
+
+class ExpressionTable(object):
+    """
+    The distinct expressions of a chain, by integer id. The expressions are
+    evaluated once per assignment of the symbols: the values of many links
+    are then gathered from the ids of their expressions in one indexing
+    operation.
+    """
+
+    def __init__(self) -> None:
+        """
+        Creates a new empty table.
+        """
+        self.expressions: List[Union[str, float]] = []
+        self._ids: Dict[Union[str, float], int] = {}
+        # Values of the last symbol assignment, and which of them are known.
+        self._symbols: Optional[Tuple[Tuple[str, float], ...]] = None
+        self._values = np.zeros(0)
+        self._evaluated = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.expressions)
+
+    def __getitem__(self, expression_id: int) -> Union[str, float]:
+        return self.expressions[expression_id]
+
+    def intern(self, expression: Union[str, float]) -> int:
+        """
+        Return the id of an expression, adding it to the table if needed.
+        :param expression: (string) the expression, or a number.
+        :return: (int) the id of the expression.
+        """
+        expression_id = self._ids.get(expression)
+        if expression_id is None:
+            expression_id = self._ids[expression] = len(self.expressions)
+            self.expressions.append(expression)
+        return expression_id
+
+    def ids(self, expressions: Iterable[Union[str, float]]) -> np.ndarray:
+        """
+        Return the ids of many expressions, adding the new ones to the table.
+        :param expressions: the expressions.
+        :return: (numpy.ndarray) the ids.
+        """
+        return np.fromiter(
+            (self.intern(expression) for expression in expressions), dtype=np.int64
+        )
+
+    def compact(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Drop the expressions whose ids are not given, e.g. the former values
+        of updated links, keeping the values already evaluated. The ids held
+        before are not valid anymore.
+        :param ids: (numpy.ndarray) the ids of the expressions to keep.
+        :return: (numpy.ndarray) the new ids, following the given ones.
+        """
+        kept, new_ids = np.unique(np.asarray(ids, dtype=np.int64), return_inverse=True)
+        self.expressions = [self.expressions[i] for i in kept.tolist()]
+        self._ids = {expression: i for i, expression in enumerate(self.expressions)}
+        known = kept[kept < len(self._values)]
+        self._values = np.concatenate(
+            [self._values[known], np.full(len(kept) - len(known), np.nan)]
+        )
+        self._evaluated = np.concatenate(
+            [self._evaluated[known], np.zeros(len(kept) - len(known), dtype=bool)]
+        )
+        result: np.ndarray = new_ids.reshape(-1).astype(np.int64)
+        return result
+
+    def gather(
+        self,
+        ids: np.ndarray,
+        symbols: Mapping[str, float],
+        errors: Optional[Dict[int, ExpressionError]] = None,
+    ) -> np.ndarray:
+        """
+        Return the values of expressions, evaluating only the distinct ones
+        not yet evaluated with the same symbols.
+        :param ids: (numpy.ndarray) the ids of the expressions.
+        :param symbols: the values of the symbols, by name.
+        :param errors: if given, the errors of the expressions that cannot be
+        evaluated are stored here, by id, and their values are NaN.
+        :return: (numpy.ndarray) the values, following the ids.
+        :raise ExpressionError: if an expression cannot be evaluated and no
+        errors are collected.
+        """
+        key = tuple(sorted(symbols.items()))
+        if key != self._symbols:
+            self._symbols = key
+            self._evaluated = np.zeros(len(self), dtype=bool)
+            self._values = np.full(len(self), np.nan)
+        elif len(self._values) < len(self):
+            grown = len(self) - len(self._values)
+            self._values = np.concatenate([self._values, np.full(grown, np.nan)])
+            self._evaluated = np.concatenate(
+                [self._evaluated, np.zeros(grown, dtype=bool)]
+            )
+        ids = np.asarray(ids, dtype=np.int64)
+        pending = np.unique(ids)
+        pending = pending[~self._evaluated[pending]]
+        for expression_id in pending.tolist():
+            try:
+                self._values[expression_id] = float(
+                    evaluate(self.expressions[expression_id], symbols)
+                )
+            except ExpressionError as e:
+                if errors is None:
+                    raise
+                errors[expression_id] = e
+                continue
+            self._evaluated[expression_id] = True
+        values: np.ndarray = self._values[ids]
+        return values
+
+
+def _mangle_keywords(source: str) -> str:
+    tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+    if not any(t.type == tokenize.NAME and keyword.iskeyword(t.string) for t in tokens):
+        return source
+    return tokenize.untokenize(
+        (t.type, mangle(t.string) if t.type == tokenize.NAME else t.string)
+        for t in tokens
+    )
+
+
+def _unmangle(name: str, source: str) -> str:
+    if not name.startswith("_"):
+        return name
+    if keyword.iskeyword(name[1:]):
+        return name[1:]
+    raise ExpressionError(
+        "Invalid symbol {} in {!r}: symbols cannot start with _".format(name, source)
+    )
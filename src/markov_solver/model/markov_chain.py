@@ -1,12 +1,99 @@
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
-
+import multiprocessing
+import threading
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
 import sympy  # type: ignore
 from graphviz import Digraph  # type: ignore
-
+from scipy import sparse  # type: ignore
+
+from markov_solver.model.expression import (
+    ExpressionError,
+    ExpressionTable,
+    UndefinedSymbolError,
+    evaluate,
+)
 from markov_solver.model.markov_link import MarkovLink
+from markov_solver.model.markov_reward import MarkovReward, state_variables
 from markov_solver.model.markov_state import MarkovState
-
-FLOATING_POINT_PRECISION = 12
+from markov_solver.model.validation import (
+    MAX_REPORTED,
+    ROW_SUM_TOLERANCE,
+    ValidationReport,
+    check_reachability,
+    check_row_sums,
+    check_values,
+)
+from markov_solver.results.solution import (
+    PassageTimeDistribution,
+    PassageTimeSolution,
+    SteadyStateSolution,
+)
+from markov_solver.solver.aggregation import (
+    IAD_MAX_ITERATIONS,
+    IAD_TOLERANCE,
+    AggregationSolver,
+    partition_labels,
+)
+from markov_solver.solver.krylov import (
+    KRYLOV_MAX_ITERATIONS,
+    KRYLOV_TOLERANCE,
+    KrylovSolver,
+    solve_steady_state_krylov,
+)
+from markov_solver.solver.numeric import (
+    ConvergenceDiagnostics,
+    SteadyStateSolver,
+    precision_dtype,
+    residual_norm,
+)
+from markov_solver.solver.passage import (
+    UNIFORMIZATION_EPSILON,
+    first_passage_moments,
+    passage_time_cdf,
+)
+from markov_solver.utils import logutils
+from markov_solver.utils.async_utils import run_blocking
+from markov_solver.utils.shared_memory import GeneratorHandle, SharedArrays
+
+SYMBOLIC_MAX_STATES = 50
+# The block of each state: a function of the state, or a mapping from names.
+Partition = Union[Callable[[MarkovState], Any], Mapping[str, Any]]
+SOLVE_METHODS = ("auto", "symbolic", "numeric", "iad", "krylov")
+# Former link values kept in the expression table before it is compacted,
+# beyond two per link.
+EXPRESSION_SLACK = 64
+
+logger = logutils.get_logger(__name__)
+
+# Sorted states, their indices and the off-diagonal CSR rates matrix.
+RatesCache = Tuple[List[MarkovState], Dict[MarkovState, int], Any]
+# Sorted states, their indices, and the rows, columns and expression ids of
+# the links, self-loops excluded.
+LinksCache = Tuple[
+    List[MarkovState], Dict[MarkovState, int], np.ndarray, np.ndarray, np.ndarray
+]
+
+
+class SymbolicTimeoutError(Exception):
+    """Raised when the symbolic solver exceeds its time budget."""
+
+
+def _solve_sympy_equations(equations: List[Any], variables: Set[Any]) -> Dict[str, Any]:
+    solutions = sympy.solve(equations, variables)
+    return {symbol.name: value for symbol, value in solutions.items()}
 
 
 class MarkovChain:
@@ -14,21 +101,115 @@ class MarkovChain:
         self.states: Set[MarkovState] = set()
         self.links: Set[MarkovLink] = set()
         self.symbols: Dict[str, float] = dict()
+        self.rewards: Dict[str, MarkovReward] = dict()
+        self._init_caches()
+
+    def _init_caches(self) -> None:
+        # Numeric caches, kept up to date by the editing methods: changes made
+        # directly on states/links/symbols must be followed by invalidate().
+        self._rates: Optional[RatesCache] = None
+        self._links: Optional[LinksCache] = None
+        self._dirty_states: Set[MarkovState] = set()
+        # The distinct link values: links share their strings, and each value
+        # is evaluated once per assignment of the symbols.
+        self.expressions = ExpressionTable()
+        self._steady_state_solver = SteadyStateSolver()
+        self._lock = threading.RLock()
 
     def add_state(self, value: Union[MarkovState, Any]) -> MarkovState:
         state = value if isinstance(value, MarkovState) else MarkovState(value)
+        count = len(self.states)
         self.states.add(state)
+        if len(self.states) != count:
+            self._rates = self._links = None
         return state
 
     def add_link(self, link: MarkovLink) -> bool:
-        if link not in self.links:
-            self.links.add(link)
+        link.value = self.expressions[self.expressions.intern(link.value)]
+        count = len(self.links)
+        self.links.add(link)
+        if len(self.links) != count:
+            self._dirty_states.add(link.tail)
+            self._links = None
+            return True
+        return False
+
+    def update_link(
+        self, state1: MarkovState, state2: MarkovState, value: Union[str, float]
+    ) -> Optional[MarkovLink]:
+        """
+        Update the value of the link from state1 to state2.
+        :param state1: the tail state.
+        :param state2: the head state.
+        :param value: the new link value.
+        :return: the updated link, if it exists; None, otherwise.
+        """
+        link = self.find_link(state1, state2)
+        if link is None:
+            return None
+        self.links.discard(link)
+        value = self.expressions[self.expressions.intern(value)]
+        updated = MarkovLink(link.tail, link.head, value)
+        self.links.add(updated)
+        self._dirty_states.add(link.tail)
+        self._links = None
+        # Former values are dropped once they outnumber the links.
+        if len(self.expressions) > 2 * len(self.links) + EXPRESSION_SLACK:
+            with self._lock:
+                self.expressions.compact(
+                    self.expressions.ids(link.value for link in self.links)
+                )
+        return updated
+
+    def remove_link(self, link: MarkovLink) -> bool:
+        """
+        Remove a link.
+        :param link: the link to remove.
+        :return: True, if the link was removed; False, if it did not exist.
+        """
+        if link in self.links:
+            self.links.discard(link)
+            self._dirty_states.add(link.tail)
+            self._links = None
             return True
         return False
 
+    def remove_state(self, state: MarkovState) -> bool:
+        """
+        Remove a state together with its incoming and outgoing links.
+        :param state: the state to remove.
+        :return: True, if the state was removed; False, if it did not exist.
+        """
+        if state not in self.states:
+            return False
+        self.states.discard(state)
+        self.links = {
+            link for link in self.links if link.tail != state and link.head != state
+        }
+        self._rates = self._links = None
+        return True
+
     def add_symbols(self, **kwargs: float) -> None:
         for symbol, value in kwargs.items():
             self.symbols[symbol] = value
+        self._rates = None
+
+    def add_reward(self, reward: MarkovReward) -> MarkovReward:
+        """
+        Add a reward structure, replacing the one with the same name, if any.
+        :param reward: the reward structure.
+        :return: the reward structure.
+        """
+        self.rewards[reward.name] = reward
+        return reward
+
+    def invalidate(self) -> None:
+        """
+        Drop the numeric caches, after states, links or symbols have been
+        changed without the chain methods.
+        :return: (void)
+        """
+        self._rates = self._links = None
 
     def in_links(self, state: MarkovState) -> List[MarkovLink]:
         return list(link for link in self.links if link.head == state)
@@ -70,19 +251,552 @@ class MarkovChain:
                     tmatrix[r][c] = self.__evaluate_factor(tmatrix[r][c])
         return tmatrix
 
-    def solve(self) -> Dict[str, Any]:
+    def generator_matrix(self) -> Tuple[List[MarkovState], Any]:
+        """
+        Build the sparse generator matrix of the Markov chain.
+        Off-diagonal entries are the evaluated link values, diagonal entries
+        make every row sum to zero; self-loops do not affect the balance
+        equations, so they are left out.
+        :return: the sorted states and the CSR generator matrix, whose rows
+        and columns follow the states order.
+        """
+        with self._lock:
+            states, _, rates = self.__rates_matrix()
+        generator = rates - sparse.diags(np.asarray(rates.sum(axis=1)).ravel())
+        return list(states), sparse.csr_matrix(generator)
+
+    def rates_matrix(self) -> Tuple[List[MarkovState], Any]:
+        """
+        Build the sparse matrix of the evaluated link values, self-loops
+        included.
+        :return: the sorted states and the CSR matrix, whose rows and columns
+        follow the states order.
+        """
+        states = self.get_states()
+        index = {state: i for i, state in enumerate(states)}
+        with self._lock:
+            return states, self.__link_rates(index, self.links, loops=True)
+
+    def sparse_transition_matrix(self) -> Tuple[List[MarkovState], Any]:
+        """
+        Build the sparse transition matrix of the Markov chain, the evaluated
+        counterpart of transition_matrix(): every row holds the link values,
+        self-loops included, divided by their sum.
+        :return: the sorted states and the CSR transition matrix, whose rows
+        and columns follow the states order.
+        """
+        states, rates = self.rates_matrix()
+        totals = np.asarray(rates.sum(axis=1)).ravel()
+        totals[totals == 0.0] = 1.0
+        return states, sparse.csr_matrix(sparse.diags(1.0 / totals) @ rates)
+
+    def share_generator(self, arrays: SharedArrays) -> GeneratorHandle:
+        """
+        Copy the state names and the generator matrix to shared memory, so
+        that worker processes attach to them instead of receiving a copy of
+        the chain with every task.
+        :param arrays: the owner of the new segments.
+        :return: the handle of the generator, to pass to the workers.
+        """
+        states, generator = self.generator_matrix()
+        return arrays.share_generator(
+            [state.pretty_str() for state in states], generator
+        )
+
+    def validate(
+        self,
+        stochastic: bool = False,
+        tolerance: float = ROW_SUM_TOLERANCE,
+        max_reported: int = MAX_REPORTED,
+    ) -> ValidationReport:
+        """
+        Check the chain in a single pass over its links, evaluating each
+        distinct link value once: links to undeclared states, undefined
+        symbols, values that cannot be evaluated, negative rates, and, for
+        stochastic chains, rows that do not sum to 1. Then, the reachability
+        of the states is checked on the graph of the positive links.
+        :param stochastic: (bool) if True, the link values are the
+        probabilities of a discrete-time chain.
+        :param tolerance: (float) the largest accepted difference from 1 of
+        the row sums of stochastic chains.
+        :param max_reported: (int) the number of violations of each kind to
+        describe.
+        :return: the report of all the violations.
+        """
+        report = ValidationReport(max_reported)
+        # Sorting the names is much faster than sorting the states, and the
+        # violations are still described in a stable order.
+        states = list(self.states)
+        names = [state.pretty_str() for state in states]
+        order = np.argsort(np.array(names, dtype=str), kind="stable").tolist()
+        states = [states[i] for i in order]
+        names = [names[i] for i in order]
+        index = {state: i for i, state in enumerate(states)}
+        tails: List[int] = []
+        heads: List[int] = []
+        expressions: List[Any] = []
+        dangling: List[MarkovLink] = []
+        for link in self.links:
+            tail, head = index.get(link.tail), index.get(link.head)
+            if tail is None or head is None:
+                dangling.append(link)
+                continue
+            tails.append(tail)
+            heads.append(head)
+            expressions.append(link.value)
+        report.add(
+            "dangling-state",
+            (
+                "Link {} -> {} refers to an undeclared state".format(
+                    link.tail.pretty_str(), link.head.pretty_str()
+                )
+                for link in dangling
+            ),
+            len(dangling),
+        )
+
+        errors: Dict[int, ExpressionError] = {}
+        with self._lock:
+            ids = self.expressions.ids(expressions)
+            values = self.expressions.gather(ids, self.symbols, errors)
+        undefined: Dict[str, List[str]] = {}
+        invalid: List[str] = []
+        for expression_id, error in sorted(errors.items()):
+            value = self.expressions[expression_id]
+            if isinstance(error, UndefinedSymbolError):
+                undefined.setdefault(error.name, []).append(str(value))
+            else:
+                invalid.append("Link value {!r}: {}".format(value, error))
+        report.add(
+            "undefined-symbol",
+            (
+                "Symbol {} is not defined, in {}".format(name, ", ".join(values[:3]))
+                for name, values in undefined.items()
+            ),
+            len(undefined),
+        )
+        report.add("invalid-value", invalid, len(invalid))
+
+        tails_array = np.array(tails, dtype=np.int64)
+        heads_array = np.array(heads, dtype=np.int64)
+        check_values(report, names, tails_array, heads_array, values)
+        if stochastic:
+            check_row_sums(report, names, tails_array, values, tolerance)
+        check_reachability(report, names, tails_array, heads_array, values)
+        return report
+
+    @classmethod
+    def from_matrix(
+        cls,
+        matrix: Any,
+        states: Optional[Sequence[Union[str, Tuple[int, ...]]]] = None,
+    ) -> "MarkovChain":
+        """
+        Build a Markov chain from a generator or transition matrix.
+        Every nonzero off-diagonal entry becomes a link, with its value.
+        Positive diagonal entries (transition matrices) become self-loops,
+        while the non-positive ones of generator matrices are left out, since
+        they only balance the rows.
+        :param matrix: (sparse matrix or numpy.ndarray) the n x n matrix.
+        :param states: (list(string)) the state names, or tuple values,
+        following the rows; defaults to the row indices.
+        :return: the Markov chain.
+        :raise ValueError: if the matrix is not square, its entries are not
+        finite, or the number of state names does not match.
+        """
+        coo = sparse.coo_matrix(matrix)
+        n = coo.shape[0]
+        if coo.shape[0] != coo.shape[1]:
+            raise ValueError(f"The matrix must be square, not {coo.shape}")
+        names: List[Union[str, Tuple[int, ...]]] = (
+            [str(i) for i in range(n)] if states is None else list(states)
+        )
+        if len(names) != n:
+            raise ValueError(f"Expected {n} state names, got {len(names)}")
+        values = np.asarray(coo.data, dtype=float)
+        if not np.all(np.isfinite(values)):
+            raise ValueError("The matrix entries must be finite")
+
+        chain = cls()
+        markov_states = [chain.add_state(MarkovState(name)) for name in names]
+        keep = (values != 0.0) & ((coo.row != coo.col) | (values > 0.0))
+        for row, col, value in zip(
+            coo.row[keep].tolist(), coo.col[keep].tolist(), values[keep].tolist()
+        ):
+            chain.add_link(MarkovLink(markov_states[row], markov_states[col], value))
+        return chain
+
+    def solve(
+        self,
+        method: str = "auto",
+        symbolic_timeout: Optional[float] = None,
+        max_symbolic_states: int = SYMBOLIC_MAX_STATES,
+        partition: Optional[Partition] = None,
+        tolerance: float = IAD_TOLERANCE,
+        max_iterations: int = IAD_MAX_ITERATIONS,
+        preconditioner: str = "ilu0",
+        refinement_steps: int = 0,
+        precision: str = "float64",
+    ) -> SteadyStateSolution:
         """
         Solves a Markov Chain.
+        With the "auto" method, the chain is solved symbolically unless it has
+        more than max_symbolic_states states or the symbolic solver exceeds
+        symbolic_timeout: in both cases, it falls back to the numeric solver.
+        The "iad" method solves nearly completely decomposable chains by
+        iterative aggregation-disaggregation over a partition of the states.
+        The "krylov" method solves the system of the numeric solver with
+        preconditioned GMRES.
+        The "numeric" and "krylov" solutions can be improved by iterative
+        refinement, with the residuals computed in float64 or longdouble
+        precision; their residual is in the solution.
+        :param method: (string) one of "auto", "symbolic", "numeric", "iad" or
+        "krylov".
+        :param symbolic_timeout: (float) the maximum number of seconds for the
+        symbolic solver, if any.
+        :param max_symbolic_states: (int) the maximum number of states for the
+        symbolic solver in "auto" mode.
+        :param partition: the block of each state for the "iad" method and the
+        block-jacobi preconditioner, as a function of the state or a mapping
+        from state names; for "iad", defaults to the first component of tuple
+        states, or of states named like A0B1, and for block-jacobi to the
+        strongly connected components.
+        :param tolerance: (float) the tolerance of the iterative methods.
+        :param max_iterations: (int) the maximum iterations of the iterative
+        methods, in restart cycles for "krylov".
+        :param preconditioner: (string) the preconditioner of the "krylov"
+        method, one of "none", "ilu0", "ilut" or "block-jacobi".
+        :param refinement_steps: (int) the number of iterative refinement
+        steps of the "numeric" and "krylov" methods.
+        :param precision: (string) the precision of the probability vector of
+        the "numeric" and "krylov" methods, "float64" or "longdouble".
+        :return: the solutions of the Markov Chain.
+        :raise SymbolicTimeoutError: if the "symbolic" method times out.
+        :raise ValueError: if the partition, the preconditioner or the
+        precision is not valid.
+        :raise SolverError: if an iterative method does not converge.
+        """
+        if method not in SOLVE_METHODS:
+            raise ValueError(
+                "Unknown solve method: {}. Supported: {}".format(
+                    method, ", ".join(SOLVE_METHODS)
+                )
+            )
+        precision_dtype(precision)
+
+        if method == "auto" and len(self.states) > max_symbolic_states:
+            logger.debug(
+                "Chain has {} states (> {}): using numeric solver".format(
+                    len(self.states), max_symbolic_states
+                )
+            )
+            method = "numeric"
+
+        if method == "numeric":
+            return self.__solve_numeric(refinement_steps, precision)
+        if method == "iad":
+            return self.__solve_aggregation(partition, tolerance, max_iterations)
+        if method == "krylov":
+            return self.__solve_krylov(
+                preconditioner,
+                partition,
+                tolerance,
+                max_iterations,
+                refinement_steps,
+                precision,
+            )
+
+        try:
+            return self.__solve_symbolic(symbolic_timeout)
+        except SymbolicTimeoutError:
+            if method == "symbolic":
+                raise
+            logger.warning(
+                "Symbolic solver timed out after {}s: using numeric solver".format(
+                    symbolic_timeout
+                )
+            )
+            return self.__solve_numeric(refinement_steps, precision)
+
+    async def async_solve(
+        self,
+        executor: Optional[Executor] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> SteadyStateSolution:
+        """
+        Solves a Markov Chain without blocking the event loop.
+        :param executor: the executor running the solver; defaults to the one
+        configured with async_utils.set_default_executor.
+        :param timeout: (float) the maximum number of seconds to wait, if any.
+        :param kwargs: the solver options, as accepted by solve.
         :return: the solutions of the Markov Chain.
+        :raise asyncio.TimeoutError: if the timeout expires.
         """
+        return await run_blocking(
+            self.solve, executor=executor, timeout=timeout, **kwargs
+        )
+
+    def __solve_symbolic(self, timeout: Optional[float]) -> SteadyStateSolution:
         equations, variables = self.generate_sympy_equations()
-        solutions = sympy.solve(equations, variables)
+        if timeout is None:
+            solutions = _solve_sympy_equations(equations, variables)
+        else:
+            # sympy cannot be interrupted, so it runs in a disposable process
+            # that is terminated when the time budget expires.
+            with multiprocessing.Pool(1) as pool:
+                result = pool.apply_async(
+                    _solve_sympy_equations, (equations, variables)
+                )
+                try:
+                    solutions = result.get(timeout)
+                except multiprocessing.TimeoutError as e:
+                    raise SymbolicTimeoutError(
+                        "Symbolic solver exceeded {}s".format(timeout)
+                    ) from e
+        return SteadyStateSolution(solutions, "symbolic")
+
+    def __solve_numeric(
+        self, refinement_steps: int, precision: str
+    ) -> SteadyStateSolution:
+        states, generator = self.generator_matrix()
+        probabilities = self._steady_state_solver.solve(
+            generator, refinement_steps, precision
+        )
+        return self.__numeric_solution(states, generator, probabilities, "numeric")
+
+    def __solve_aggregation(
+        self, partition: Optional[Partition], tolerance: float, max_iterations: int
+    ) -> SteadyStateSolution:
+        states, generator = self.generator_matrix()
+        solver = AggregationSolver(tolerance, max_iterations)
+        labels = partition_labels(self.__partition_blocks(states, partition))
+        probabilities = solver.solve(generator, labels)
+        return self.__numeric_solution(
+            states, generator, probabilities, "iad", solver.diagnostics
+        )
 
-        state_solutions: Dict[str, Any] = {}
-        for symbol, value in solutions.items():
-            state_solutions[symbol.name] = value
+    def __solve_krylov(
+        self,
+        preconditioner: str,
+        partition: Optional[Partition],
+        tolerance: float,
+        max_iterations: int,
+        refinement_steps: int,
+        precision: str,
+    ) -> SteadyStateSolution:
+        states, generator = self.generator_matrix()
+        solver = self.__krylov_solver(
+            states, preconditioner, partition, tolerance, max_iterations
+        )
+        probabilities = solve_steady_state_krylov(
+            generator, solver, refinement_steps, precision
+        )
+        return self.__numeric_solution(
+            states, generator, probabilities, "krylov", solver.diagnostics
+        )
 
-        return state_solutions
+    @staticmethod
+    def __numeric_solution(
+        states: List[MarkovState],
+        generator: Any,
+        probabilities: np.ndarray,
+        method: str,
+        diagnostics: Optional[ConvergenceDiagnostics] = None,
+    ) -> SteadyStateSolution:
+        return SteadyStateSolution(
+            {
+                state.pretty_str(): probability
+                for state, probability in zip(
+                    states, probabilities.astype(float).tolist()
+                )
+            },
+            method,
+            probabilities,
+            diagnostics,
+            residual_norm(generator, probabilities),
+        )
+
+    def __krylov_solver(
+        self,
+        states: List[MarkovState],
+        preconditioner: str,
+        partition: Optional[Partition],
+        tolerance: float,
+        max_iterations: int,
+    ) -> KrylovSolver:
+        labels = (
+            partition_labels(self.__partition_blocks(states, partition))
+            if partition is not None
+            else None
+        )
+        return KrylovSolver(preconditioner, tolerance, max_iterations, labels=labels)
+
+    @staticmethod
+    def __partition_blocks(
+        states: List[MarkovState], partition: Optional[Partition]
+    ) -> List[Any]:
+        if callable(partition):
+            return [partition(state) for state in states]
+        if partition is not None:
+            try:
+                return [partition[state.pretty_str()] for state in states]
+            except KeyError as e:
+                raise ValueError("No block for state {}".format(e.args[0])) from e
+        first = state_variables(states).get("A")
+        if first is None or np.isnan(first).any():
+            raise ValueError(
+                "Cannot detect a partition: states are not tuples or named like "
+                "A0B1. Pass a partition of the states."
+            )
+        blocks: List[Any] = first.tolist()
+        return blocks
+
+    def first_passage(
+        self,
+        targets: Sequence[Union[MarkovState, Any]],
+        moments: int = 1,
+        preconditioner: Optional[str] = None,
+        partition: Optional[Partition] = None,
+        tolerance: float = KRYLOV_TOLERANCE,
+        max_iterations: int = KRYLOV_MAX_ITERATIONS,
+    ) -> PassageTimeSolution:
+        """
+        Compute the first passage times to a set of target states, from every
+        state, with a sparse direct solver or, given a preconditioner, with
+        preconditioned GMRES. For chains defined by transition probabilities,
+        mean times are in steps, since self-loops and exits balance out;
+        higher moments are those of the continuous-time chain.
+        :param targets: the target states, or their values.
+        :param moments: (int) the number of moments to compute.
+        :param preconditioner: (string) the preconditioner of the Krylov
+        solver, one of "none", "ilu0", "ilut" or "block-jacobi"; None, to use
+        the direct solver.
+        :param partition: the block of each state for the block-jacobi
+        preconditioner, as a function of the state or a mapping from state
+        names; defaults to the strongly connected components.
+        :param tolerance: (float) the tolerance of the Krylov solver.
+        :param max_iterations: (int) the maximum restart cycles of the Krylov
+        solver.
+        :return: the passage times, infinite from the states that may never
+        reach the targets.
+        :raise ValueError: if a target is not a state of the chain, or there
+        are no targets.
+        :raise SolverError: if the passage-time system is singular, or the
+        Krylov solver does not converge.
+        """
+        names, target_names, generator, mask = self.__passage_system(targets)
+        if preconditioner is None:
+            return PassageTimeSolution(
+                names, target_names, first_passage_moments(generator, mask, moments)
+            )
+        solver = self.__krylov_solver(
+            self.get_states(), preconditioner, partition, tolerance, max_iterations
+        )
+        result = first_passage_moments(generator, mask, moments, solver=solver)
+        return PassageTimeSolution(names, target_names, result, solver.diagnostics)
+
+    def passage_time_distribution(
+        self,
+        targets: Sequence[Union[MarkovState, Any]],
+        times: Sequence[float],
+        epsilon: float = UNIFORMIZATION_EPSILON,
+    ) -> PassageTimeDistribution:
+        """
+        Compute the distribution function P(T <= t) of the first passage time
+        to a set of target states, from every state, for all the given times
+        at once, by uniformization of the chain with absorbing targets.
+        :param targets: the target states, or their values.
+        :param times: (list(float)) the non-negative times.
+        :param epsilon: (float) the truncation error of the Poisson sums.
+        :return: the probabilities, by starting state and time.
+        :raise ValueError: if a target is not a state of the chain, there are
+        no targets, or a time is negative.
+        """
+        names, target_names, generator, mask = self.__passage_system(targets)
+        return PassageTimeDistribution(
+            names,
+            target_names,
+            [float(t) for t in times],
+            passage_time_cdf(generator, mask, times, epsilon),
+        )
+
+    def __passage_system(
+        self, targets: Sequence[Union[MarkovState, Any]]
+    ) -> Tuple[List[str], List[str], Any, np.ndarray]:
+        target_states = [
+            target if isinstance(target, MarkovState) else MarkovState(target)
+            for target in targets
+        ]
+        states, generator = self.generator_matrix()
+        index = {state: i for i, state in enumerate(states)}
+        mask = np.zeros(len(states), dtype=bool)
+        for state in target_states:
+            if state not in index:
+                raise ValueError("Unknown target state: {}".format(state))
+            mask[index[state]] = True
+        return (
+            [state.pretty_str() for state in states],
+            [state.pretty_str() for state in target_states],
+            generator,
+            mask,
+        )
+
+    def measures(self, solution: SteadyStateSolution) -> Dict[str, float]:
+        """
+        Evaluate the performance measures defined by the reward structures.
+        :param solution: the steady-state solution of the chain.
+        :return: the expected reward per time unit, by reward name.
+        :raise ValueError: if a reward cannot be evaluated, or the solution
+        misses some states.
+        """
+        return {
+            name: float(values[0])
+            for name, values in self.batch_measures([solution]).items()
+        }
+
+    def batch_measures(
+        self, solutions: Sequence[SteadyStateSolution]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Evaluate the performance measures for several solutions of the chain,
+        e.g. the points of a sweep sharing its link values: the rewards are
+        evaluated once, and all the measures with a single matrix product.
+        :param solutions: the steady-state solutions of the chain.
+        :return: the expected rewards per time unit, following the solutions,
+        by reward name.
+        :raise ValueError: if a reward cannot be evaluated, or a solution
+        misses some states.
+        """
+        if not self.rewards:
+            return {}
+        states, rates = self.rates_matrix()
+        index = {state: i for i, state in enumerate(states)}
+        # Chain symbols take precedence over state variables of the same name.
+        variables = {**state_variables(states), **self.symbols}
+        rewards = np.column_stack(
+            [
+                reward.rewards(index, rates, variables, self.symbols)
+                for reward in self.rewards.values()
+            ]
+        )
+        names = [state.pretty_str() for state in states]
+        distributions = np.vstack(
+            [self.__distribution(names, solution) for solution in solutions]
+        )
+        values = distributions @ rewards
+        return {name: values[:, j] for j, name in enumerate(self.rewards)}
+
+    def __distribution(
+        self, names: List[str], solution: SteadyStateSolution
+    ) -> np.ndarray:
+        solution_names, vector = solution.as_arrays()
+        if solution_names == names:
+            return vector
+        try:
+            return np.array([float(solution[name]) for name in names])
+        except KeyError as e:
+            raise ValueError("The solution misses state {}".format(e)) from e
 
     def generate_sympy_equations(self) -> Tuple[List[Any], Set[Any]]:
         """
@@ -132,12 +846,13 @@ class MarkovChain:
     def matrixs(self) -> str:
         """
         Return the string representation of the matrix.
+        Large chains should be written with the streaming writers of
+        markov_solver.exporter.matrix_exporter instead.
         :return: the string representation.
         """
-        s = ""
-        for r in self.transition_matrix():
-            s += "{}\n".format(",".join(map(str, r)))
-        return s
+        return "".join(
+            "{}\n".format(",".join(map(str, r))) for r in self.transition_matrix()
+        )
 
     def render_graph(
         self, filename: str = "out/MarkovChain", format: str = "svg"
@@ -154,13 +869,86 @@ class MarkovChain:
 
         graph.render(filename=filename, format=format)
 
+    def __rates_matrix(self) -> RatesCache:
+        """
+        Return the off-diagonal rates matrix, rebuilding only the rows of the
+        states whose outgoing links changed since the last call.
+        """
+        if self._rates is not None and not self._dirty_states.issubset(self._rates[1]):
+            self._rates = None
+
+        if self._rates is None:
+            # Only the values are computed again after the symbols change.
+            if self._links is None:
+                states = self.get_states()
+                index = {state: i for i, state in enumerate(states)}
+                rows, cols, ids = self.__link_arrays(index, self.links)
+                # Keep only the values of the current links in the table.
+                ids = self.expressions.compact(ids)
+                self._links = (states, index, rows, cols, ids)
+            states, index, rows, cols, ids = self._links
+            n = len(states)
+            values = self.expressions.gather(ids, self.symbols)
+            rates = sparse.csr_matrix((values, (rows, cols)), shape=(n, n))
+        else:
+            states, index, rates = self._rates
+            if self._dirty_states:
+                keep = np.ones(len(states))
+                keep[[index[state] for state in self._dirty_states]] = 0.0
+                changed = (
+                    link for link in self.links if link.tail in self._dirty_states
+                )
+                rates = sparse.diags(keep) @ rates + self.__link_rates(index, changed)
+                rates = sparse.csr_matrix(rates)
+
+        self._rates = (states, index, rates)
+        self._dirty_states.clear()
+        return self._rates
+
+    def __link_rates(
+        self, index: Dict[MarkovState, int], links: Any, loops: bool = False
+    ) -> Any:
+        rows, cols, ids = self.__link_arrays(index, links, loops)
+        n = len(index)
+        values = self.expressions.gather(ids, self.symbols)
+        return sparse.csr_matrix((values, (rows, cols)), shape=(n, n))
+
+    def __link_arrays(
+        self, index: Dict[MarkovState, int], links: Any, loops: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the rows, columns and expression ids of links.
+        """
+        rows: List[int] = []
+        cols: List[int] = []
+        expressions: List[Any] = []
+        for link in links:
+            if link.tail == link.head and not loops:
+                continue
+            rows.append(index[link.tail])
+            cols.append(index[link.head])
+            expressions.append(link.value)
+        return (
+            np.array(rows, dtype=np.int64),
+            np.array(cols, dtype=np.int64),
+            self.expressions.ids(expressions),
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "states": self.states,
+            "links": self.links,
+            "symbols": self.symbols,
+            "rewards": self.rewards,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.rewards = dict()
+        self.__dict__.update(state)
+        self._init_caches()
+
     def __evaluate_factor(self, factor: Any) -> float:
-        if isinstance(factor, int) or isinstance(factor, float):
-            return float(factor)
-        value = factor
-        for k, v in self.symbols.items():
-            value = value.replace(k, str(v))
-        return float(round(eval(value), FLOATING_POINT_PRECISION))
+        return float(evaluate(factor, self.symbols))
 
     def __str__(self) -> str:
         return "States: {}\nLinks: {}\nSymbols: {}\n".format(
@@ -18,7 +18,7 @@ class MarkovLink:
         return self.__str__()
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return hash((self.tail, self.head, self.value))
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, MarkovLink):
@@ -0,0 +1,204 @@
+import math
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from markov_solver.model.expression import (
+    ExpressionError,
+    compile_expression,
+    evaluate,
+)
+from markov_solver.model.markov_state import MarkovState
+
+# Number of states named in the error of an undefined state reward.
+MAX_UNDEFINED_STATES = 5
+
+# Names of tuple states, as printed by MarkovState.pretty_str (e.g. A0B1).
+TUPLE_NAME_PATTERN = re.compile(r"(?:[A-Z]-?\d+)+")
+TUPLE_COMPONENT_PATTERN = re.compile(r"([A-Z])(-?\d+)")
+
+
+def state_variables(states: List[MarkovState]) -> Dict[str, np.ndarray]:
+    """
+    Return the variables of state reward expressions, as arrays following the
+    states: value, the numeric value of each state, and A, B, ..., the
+    components of tuple states or of states named like A0B1. Entries that do
+    not apply to a state are NaN.
+    :param states: (list(MarkovState)) the states.
+    :return: the arrays, by variable name.
+    """
+    n = len(states)
+    values = np.full(n, math.nan)
+    components: Dict[str, np.ndarray] = {}
+
+    def component(letter: str) -> np.ndarray:
+        if letter not in components:
+            components[letter] = np.full(n, math.nan)
+        return components[letter]
+
+    for i, state in enumerate(states):
+        value = state.value
+        if isinstance(value, tuple):
+            for k, item in enumerate(value):
+                component(chr(ord("A") + k))[i] = item
+            continue
+        try:
+            values[i] = float(value)
+        except (TypeError, ValueError):
+            if isinstance(value, str) and TUPLE_NAME_PATTERN.fullmatch(value):
+                for letter, item in TUPLE_COMPONENT_PATTERN.findall(value):
+                    component(letter)[i] = int(item)
+    return {"value": values, **components}
+
+
+def evaluate_expression(
+    expression: Union[str, float], variables: Mapping[str, Any]
+) -> Any:
+    """
+    Evaluate a reward expression over scalar or array variables.
+    :param expression: (string) the expression, or a number.
+    :param variables: the variables, by name.
+    :return: the value of the expression.
+    :raise ValueError: if the expression cannot be evaluated.
+    """
+    try:
+        return evaluate(expression, variables)
+    except ExpressionError as e:
+        raise ValueError(
+            "Invalid reward expression {!r}: {}".format(expression, e)
+        ) from e
+
+
+class MarkovReward:
+    """
+    A reward structure, whose expected value under the steady-state
+    distribution is a performance measure: states earn the value of the state
+    expression per time unit, and transitions earn their reward each time
+    they are taken, i.e. at the rate of their link.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        state: Optional[Union[str, float]] = None,
+        transitions: Optional[
+            Mapping[Tuple[MarkovState, MarkovState], Union[str, float]]
+        ] = None,
+    ) -> None:
+        """
+        Creates a new reward structure.
+        :param name: (string) the name of the measure.
+        :param state: (string) the expression of the state rewards, over the
+        state variables (see state_variables) and the chain symbols, if any.
+        Chain symbols take precedence over state variables of the same name,
+        and the expression must only use state variables that apply to every
+        state.
+        :param transitions: the rewards of transitions, by (tail, head) states.
+        """
+        self.name = name
+        self.state = state
+        self.transitions: Dict[Tuple[MarkovState, MarkovState], Union[str, float]] = (
+            dict(transitions or {})
+        )
+
+    def add_transition(
+        self, tail: MarkovState, head: MarkovState, value: Union[str, float]
+    ) -> None:
+        """
+        Set the reward of the transitions from tail to head.
+        :param tail: the source state.
+        :param head: the target state.
+        :param value: (string) the reward, a number or an expression over the
+        chain symbols.
+        :return: (void)
+        """
+        self.transitions[(tail, head)] = value
+
+    def rewards(
+        self,
+        index: Mapping[MarkovState, int],
+        rates: Any,
+        variables: Mapping[str, Any],
+        symbols: Mapping[str, float],
+    ) -> np.ndarray:
+        """
+        Return the reward earned per time unit in every state, i.e. the state
+        reward plus the rewards of the outgoing transitions times their rates.
+        :param index: the position of every state.
+        :param rates: (sparse matrix) the evaluated link values, self-loops
+        included, following the positions of the states.
+        :param variables: the state variables, as arrays over the states, and
+        the chain symbols.
+        :param symbols: the chain symbols.
+        :return: (numpy.ndarray) the rewards, following the positions.
+        :raise ValueError: if an expression cannot be evaluated, the state
+        expression uses a state variable that does not apply to some states,
+        or a transition refers to a state that is not in the chain.
+        """
+        n = len(index)
+        rewards = np.zeros(n)
+        if self.state is not None:
+            rewards += np.broadcast_to(
+                np.asarray(evaluate_expression(self.state, variables), dtype=float),
+                (n,),
+            )
+            self.__check_defined(index, variables, symbols)
+        if self.transitions:
+            try:
+                rows = np.array([index[tail] for tail, _ in self.transitions])
+                cols = np.array([index[head] for _, head in self.transitions])
+            except KeyError as e:
+                raise ValueError(
+                    "Reward {} refers to unknown state {}".format(self.name, e)
+                ) from e
+            values = np.fromiter(
+                (
+                    float(evaluate_expression(value, symbols))
+                    for value in self.transitions.values()
+                ),
+                dtype=float,
+            )
+            link_rates = np.asarray(rates[rows, cols]).ravel()
+            rewards += np.bincount(rows, weights=link_rates * values, minlength=n)
+        return rewards
+
+    def __check_defined(
+        self,
+        index: Mapping[MarkovState, int],
+        variables: Mapping[str, Any],
+        symbols: Mapping[str, float],
+    ) -> None:
+        if not isinstance(self.state, str):
+            return
+        used = sorted(
+            name
+            for name in compile_expression(self.state).symbols
+            if name not in symbols and isinstance(variables.get(name), np.ndarray)
+        )
+        undefined = np.zeros(len(index), dtype=bool)
+        for name in used:
+            undefined |= np.isnan(variables[name])
+        if not undefined.any():
+            return
+        states = [state.pretty_str() for state, i in index.items() if undefined[i]]
+        raise ValueError(
+            "Reward {} uses {}, undefined in states {}{}".format(
+                self.name,
+                ", ".join(used),
+                ", ".join(states[:MAX_UNDEFINED_STATES]),
+                (
+                    " and {} more".format(len(states) - MAX_UNDEFINED_STATES)
+                    if len(states) > MAX_UNDEFINED_STATES
+                    else ""
+                ),
+            )
+        )
+
+    def __str__(self) -> str:
+        return "{}(state={}, transitions={})".format(
+            self.name, self.state, len(self.transitions)
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -23,7 +23,7 @@ class MarkovState:
         return self.__str__()
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return hash(self.value)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, MarkovState):
@@ -0,0 +1,221 @@
+"""
+Markov chains defined by a vectorized function of their transitions, solved
+by matrix-free iterative solvers without materializing their links.
+"""
+
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse  # type: ignore
+from scipy.sparse.linalg import LinearOperator  # type: ignore
+
+from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.results.solution import SteadyStateSolution
+from markov_solver.solver.krylov import (
+    GMRES_RESTART,
+    KRYLOV_MAX_ITERATIONS,
+    KRYLOV_TOLERANCE,
+    KrylovSolver,
+    solve_steady_state_operator,
+)
+
+# The transitions out of a batch of states, as the arrays of their source
+# indices, target indices and rates.
+Transitions = Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+# States whose transitions are computed at a time.
+BATCH_SIZE = 1 << 16
+OPERATOR_SOLVE_METHODS = ("auto", "krylov")
+
+
+class OperatorChain(object):
+    """
+    A Markov chain over the states 0, ..., n - 1 whose transitions are
+    computed on demand, for batches of states, by a vectorized function.
+    The generator matrix is never stored: it is available as a
+    scipy LinearOperator, and every vector product calls the function again
+    for all the states.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        transitions: Transitions,
+        names: Optional[Sequence[str]] = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        """
+        Creates a new chain.
+        :param size: (int) the number of states.
+        :param transitions: the function returning the (sources, targets,
+        rates) arrays of the transitions out of an array of state indices,
+        whose sources must be in the array; self-loops are ignored and the
+        rates of duplicate transitions add up.
+        :param names: (list(string)) the state names, following the indices;
+        defaults to the indices.
+        :param batch_size: (int) the number of states whose transitions are
+        computed at a time.
+        :raise ValueError: if the size is negative, the batch size is not
+        positive, or the number of names does not match.
+        """
+        if size < 0:
+            raise ValueError("The number of states must not be negative")
+        if batch_size < 1:
+            raise ValueError("The batch size must be positive")
+        if names is not None and len(names) != size:
+            raise ValueError(f"Expected {size} state names, got {len(names)}")
+        self.size = size
+        self.transitions = transitions
+        self.names = names
+        self.batch_size = batch_size
+        self._diagonal: Optional[np.ndarray] = None
+
+    def get_names(self) -> List[str]:
+        """
+        Return the state names.
+        :return: (list(string)) the names, following the state indices.
+        """
+        if self.names is None:
+            return [str(i) for i in range(self.size)]
+        return list(self.names)
+
+    def vector_product(self, x: np.ndarray) -> np.ndarray:
+        """
+        Multiply a vector by the generator matrix, without building it.
+        :param x: (numpy.ndarray) the vector, following the state indices.
+        :return: (numpy.ndarray) the product x Q.
+        :raise ValueError: if the transitions are not valid.
+        """
+        x = np.asarray(x, dtype=float)
+        result: np.ndarray = x * self.diagonal()
+        for sources, targets, rates in self.__batches():
+            result += np.bincount(targets, x[sources] * rates, minlength=self.size)
+        return result
+
+    def diagonal(self) -> np.ndarray:
+        """
+        Return the diagonal of the generator matrix, the opposite of the exit
+        rates of the states, computed once.
+        :return: (numpy.ndarray) the diagonal entries.
+        :raise ValueError: if the transitions are not valid.
+        """
+        if self._diagonal is None:
+            diagonal = np.zeros(self.size)
+            for sources, _, rates in self.__batches():
+                diagonal -= np.bincount(sources, rates, minlength=self.size)
+            self._diagonal = diagonal
+        return self._diagonal
+
+    def operator(self) -> LinearOperator:
+        """
+        Return the transposed generator matrix as a linear operator, whose
+        matvec is the vector product x Q.
+        :return: (scipy.sparse.linalg.LinearOperator) the n x n operator Q^T.
+        """
+        return LinearOperator(
+            (self.size, self.size), matvec=self.vector_product, dtype=float
+        )
+
+    def rates_matrix(self) -> Any:
+        """
+        Build the sparse matrix of the rates, e.g. to check a chain on small
+        models.
+        :return: (scipy.sparse.csr_matrix) the n x n off-diagonal rates.
+        :raise ValueError: if the transitions are not valid.
+        """
+        rows: List[np.ndarray] = [np.zeros(0, dtype=np.int64)]
+        cols: List[np.ndarray] = [np.zeros(0, dtype=np.int64)]
+        values: List[np.ndarray] = [np.zeros(0)]
+        for sources, targets, rates in self.__batches():
+            rows.append(sources)
+            cols.append(targets)
+            values.append(rates)
+        matrix = sparse.csr_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(self.size, self.size),
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+    def to_chain(self) -> MarkovChain:
+        """
+        Build the Markov chain with a link for every transition; only
+        feasible for small models.
+        :return: the Markov chain.
+        :raise ValueError: if the transitions are not valid.
+        """
+        return MarkovChain.from_matrix(self.rates_matrix(), self.get_names())
+
+    def solve(
+        self,
+        method: str = "auto",
+        preconditioner: str = "jacobi",
+        tolerance: float = KRYLOV_TOLERANCE,
+        max_iterations: int = KRYLOV_MAX_ITERATIONS,
+        restart: int = GMRES_RESTART,
+    ) -> SteadyStateSolution:
+        """
+        Solves the chain with preconditioned GMRES on the vector products, as
+        the "krylov" method of MarkovChain.solve().
+        :param method: (string) "auto" or "krylov".
+        :param preconditioner: (string) "jacobi" or "none".
+        :param tolerance: (float) the relative residual norm to reach.
+        :param max_iterations: (int) the maximum number of restart cycles.
+        :param restart: (int) the number of iterations between restarts.
+        :return: the solutions of the chain.
+        :raise ValueError: if the method or the preconditioner is not valid,
+        or the transitions are not valid.
+        :raise SolverError: if the chain has no unique steady-state
+        distribution or the solver does not converge.
+        """
+        if method not in OPERATOR_SOLVE_METHODS:
+            raise ValueError(
+                "Unknown solve method for operator chains: {}. Supported: {}".format(
+                    method, ", ".join(OPERATOR_SOLVE_METHODS)
+                )
+            )
+        solver = KrylovSolver(preconditioner, tolerance, max_iterations, restart)
+        diagonal = self.diagonal()
+        probabilities = solve_steady_state_operator(
+            self.vector_product, diagonal, solver
+        )
+        # Same scaled residual as residual_norm, on the vector product.
+        scale = float(np.max(-diagonal, initial=0.0)) or 1.0
+        residual = float(np.abs(self.vector_product(probabilities)).sum()) / scale
+        return SteadyStateSolution(
+            dict(zip(self.get_names(), probabilities.tolist())),
+            "krylov",
+            probabilities,
+            solver.diagnostics,
+            residual,
+        )
+
+    def __batches(self) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        for start in range(0, self.size, self.batch_size):
+            stop = min(start + self.batch_size, self.size)
+            batch = np.arange(start, stop)
+            sources, targets, rates = (
+                np.asarray(array) for array in self.transitions(batch)
+            )
+            if not sources.shape == targets.shape == rates.shape:
+                raise ValueError("Sources, targets and rates must have the same shape")
+            if len(sources) and (
+                sources.min() < 0
+                or targets.min() < 0
+                or max(sources.max(), targets.max()) >= self.size
+            ):
+                raise ValueError("Transition out of the states of the chain")
+            # Transitions out of other batches would be counted twice.
+            if len(sources) and (sources.min() < start or sources.max() >= stop):
+                raise ValueError(
+                    "Transition out of a state outside the batch {}..{}".format(
+                        start, stop - 1
+                    )
+                )
+            rates = rates.astype(float)
+            if not np.all(np.isfinite(rates)) or np.any(rates < 0.0):
+                raise ValueError("The rates must be finite and non-negative")
+            keep = sources != targets
+            sources = sources[keep].astype(np.int64)
+            targets = targets[keep].astype(np.int64)
+            yield sources, targets, rates[keep]
@@ -0,0 +1,335 @@
+"""
+Reachability exploration of the state space of a Markov chain, generated by a
+successor function, optionally in parallel across worker processes.
+"""
+
+import multiprocessing
+import queue
+import time
+import traceback
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse  # type: ignore
+
+from markov_solver.model.markov_chain import MarkovChain
+
+# The successors of a state, as (state, rate) pairs.
+Successors = Callable[[Any], Iterable[Tuple[Any, float]]]
+# A batch of messages from a worker: sender, targets, source indices, rates.
+Batch = Tuple[int, List[Any], List[int], List[float]]
+
+# Messages sent at a time from a worker to another.
+BATCH_SIZE = 4096
+# Seconds between checks that the workers are still alive.
+POLL_INTERVAL = 0.1
+
+
+class ExplorationError(Exception):
+    pass
+
+
+class StateSpace(object):
+    """
+    The reachable states of a generated chain and the sparse matrix of the
+    rates between them.
+    """
+
+    def __init__(self, states: List[Any], rates: Any, elapsed: float) -> None:
+        """
+        Creates a new state space.
+        :param states: (list) the states, following the rows of the matrix.
+        :param rates: (scipy.sparse.csr_matrix) the n x n matrix of the rates,
+        with the rates of duplicate transitions summed.
+        :param elapsed: (float) the seconds spent exploring.
+        """
+        self.states = states
+        self.rates = rates
+        self.elapsed = elapsed
+
+    @property
+    def throughput(self) -> float:
+        """
+        Return the number of states explored per second.
+        :return: (float) the throughput.
+        """
+        return len(self.states) / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def to_chain(self) -> MarkovChain:
+        """
+        Build the Markov chain of the state space, with a link for every
+        nonzero rate. States that are strings or tuples of integers keep their
+        value; any other state is named after its string representation.
+        :return: the Markov chain.
+        """
+        values = [
+            state if isinstance(state, (str, tuple)) else str(state)
+            for state in self.states
+        ]
+        return MarkovChain.from_matrix(self.rates, values)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+
+def partition_of(state: Any, workers: int) -> int:
+    """
+    Return the worker owning a state. The partition hashes the representation
+    of the state, which is the same in every process, unlike the hash of
+    strings.
+    :param state: the state.
+    :param workers: (int) the number of workers.
+    :return: (int) the rank of the owner, in [0, workers).
+    """
+    return zlib.crc32(repr(state).encode()) % workers
+
+
+def explore(
+    initial: Iterable[Any],
+    successors: Successors,
+    workers: int = 1,
+    batch_size: int = BATCH_SIZE,
+    context: Optional[str] = None,
+) -> StateSpace:
+    """
+    Explore the states reachable from the initial ones.
+    With more than one worker, the states are partitioned by hash across
+    worker processes. Each worker expands the new states it owns, and sends
+    their successors to their owners in batches, through one queue per
+    worker, until a round discovers no new state. The partial matrices of the
+    workers are finally assembled into a single CSR matrix.
+    States must be hashable, picklable and have a deterministic
+    representation, e.g. tuples of integers. With more than one worker, the
+    successor function must be picklable, unless the context is "fork".
+    :param initial: the initial states.
+    :param successors: the function returning the (state, rate) pairs of the
+    transitions out of a state.
+    :param workers: (int) the number of worker processes; with 1, the state
+    space is explored in the calling process.
+    :param batch_size: (int) the messages sent at a time to a worker.
+    :param context: (string) the multiprocessing start method, if not the
+    default one.
+    :return: the state space, ordered by worker and then by discovery.
+    :raise ValueError: if the number of workers or the batch size is not
+    positive.
+    :raise ExplorationError: if a worker fails.
+    """
+    if workers < 1:
+        raise ValueError("The number of workers must be positive")
+    if batch_size < 1:
+        raise ValueError("The batch size must be positive")
+    initial = list(initial)
+    start = time.perf_counter()
+    if workers == 1:
+        parts = [_explore_partition(0, 1, initial, successors, batch_size)]
+    else:
+        parts = _explore_parallel(initial, successors, workers, batch_size, context)
+    states, rates = _assemble(parts)
+    return StateSpace(states, rates, time.perf_counter() - start)
+
+
+def _explore_parallel(
+    initial: List[Any],
+    successors: Successors,
+    workers: int,
+    batch_size: int,
+    context: Optional[str],
+) -> List[Tuple[Any, ...]]:
+    """
+    Coordinate the workers: collect the reports of every round, tell each
+    worker how many batches it has to receive and whether the exploration is
+    over, and finally collect the partial matrices.
+    """
+    ctx: Any = multiprocessing.get_context(context)
+    inboxes = [ctx.Queue() for _ in range(workers)]
+    control = ctx.Queue()
+    processes = [
+        ctx.Process(
+            target=_run_partition,
+            args=(rank, workers, initial, successors, inboxes, control, batch_size),
+            daemon=True,
+        )
+        for rank in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    parts: Dict[int, Tuple[Any, ...]] = {}
+    reports: List[Tuple[int, List[int]]] = []
+    try:
+        while len(parts) < workers:
+            kind, rank, *payload = _next_message(control, processes)
+            if kind == "error":
+                raise ExplorationError(
+                    "Exploration failed in worker {}:\n{}".format(rank, payload[0])
+                )
+            if kind == "part":
+                parts[rank] = payload[0]
+                continue
+            step, sent, batches = payload
+            reports.append((sent, batches))
+            if len(reports) == workers:
+                total = sum(sent for sent, _ in reports)
+                for owner, inbox in enumerate(inboxes):
+                    expected = sum(batches[owner] for _, batches in reports)
+                    inbox.put(("round", step, expected, total))
+                reports = []
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        for q in [*inboxes, control]:
+            q.close()
+    return list(parts.values())
+
+
+def _next_message(control: Any, processes: List[Any]) -> Tuple[Any, ...]:
+    while True:
+        try:
+            message: Tuple[Any, ...] = control.get(timeout=POLL_INTERVAL)
+            return message
+        except queue.Empty:
+            for rank, process in enumerate(processes):
+                if not process.is_alive() and process.exitcode != 0:
+                    raise ExplorationError(
+                        "Worker {} exited with code {}".format(rank, process.exitcode)
+                    )
+
+
+def _run_partition(
+    rank: int,
+    workers: int,
+    initial: List[Any],
+    successors: Successors,
+    inboxes: List[Any],
+    control: Any,
+    batch_size: int,
+) -> None:
+    try:
+        part = _explore_partition(
+            rank, workers, initial, successors, batch_size, inboxes, control
+        )
+    except Exception:
+        control.put(("error", rank, traceback.format_exc()))
+    else:
+        control.put(("part", rank, part))
+
+
+def _explore_partition(
+    rank: int,
+    workers: int,
+    initial: List[Any],
+    successors: Successors,
+    batch_size: int,
+    inboxes: Sequence[Any] = (),
+    control: Any = None,
+) -> Tuple[Any, ...]:
+    """
+    Explore the states owned by a worker, in rounds. In every round, the
+    worker assigns a local index to the new states it received, expands them,
+    sends the successors owned by other workers in batches, and reports to
+    the coordinator the number of transitions and of batches it sent. The
+    coordinator answers with the number of batches to receive and the total
+    number of transitions of the round: the exploration ends, for all the
+    workers at once, after a round without transitions.
+    Every transition is recorded by the owner of its target, with the worker
+    and local index of its source.
+    """
+    index: Dict[Any, int] = {}
+    states: List[Any] = []
+    sources: List[int] = []
+    tails: List[int] = []
+    heads: List[int] = []
+    rates: List[float] = []
+    # Batches of the next round, received while waiting for the current one.
+    early: List[Batch] = []
+
+    owned = [state for state in initial if partition_of(state, workers) == rank]
+    inbox: List[Batch] = [(-1, owned, [], [])]
+    step = 0
+    while True:
+        frontier = []
+        for sender, targets, locals_, values in inbox:
+            for i, state in enumerate(targets):
+                local = index.get(state)
+                if local is None:
+                    local = index[state] = len(states)
+                    states.append(state)
+                    frontier.append(local)
+                if sender >= 0:
+                    sources.append(sender)
+                    tails.append(locals_[i])
+                    heads.append(local)
+                    rates.append(values[i])
+
+        outboxes: List[Tuple[List[Any], List[int], List[float]]] = [
+            ([], [], []) for _ in range(workers)
+        ]
+        batches = [0] * workers
+        sent = 0
+        for local in frontier:
+            for target, rate in successors(states[local]):
+                owner = partition_of(target, workers) if workers > 1 else 0
+                box = outboxes[owner]
+                box[0].append(target)
+                box[1].append(local)
+                box[2].append(float(rate))
+                sent += 1
+                if owner != rank and len(box[0]) >= batch_size:
+                    inboxes[owner].put(("batch", step, rank, *box))
+                    batches[owner] += 1
+                    outboxes[owner] = ([], [], [])
+        inbox = [(rank, *outboxes[rank])]
+        if workers == 1:
+            if sent == 0:
+                break
+            step += 1
+            continue
+
+        for owner, box in enumerate(outboxes):
+            if owner != rank and box[0]:
+                inboxes[owner].put(("batch", step, rank, *box))
+                batches[owner] += 1
+        control.put(("report", rank, step, sent, batches))
+
+        inbox.extend(early)
+        received = len(early)
+        early = []
+        expected = total = -1
+        while received != expected:
+            kind, batch_step, *payload = inboxes[rank].get()
+            if kind == "round":
+                expected, total = payload
+                continue
+            sender, targets, locals_, values = payload
+            if batch_step == step:
+                inbox.append((sender, targets, locals_, values))
+                received += 1
+            else:
+                early.append((sender, targets, locals_, values))
+        if total == 0:
+            break
+        step += 1
+
+    return (
+        rank,
+        states,
+        np.array(sources, dtype=np.int64),
+        np.array(tails, dtype=np.int64),
+        np.array(heads, dtype=np.int64),
+        np.array(rates, dtype=float),
+    )
+
+
+def _assemble(parts: List[Tuple[Any, ...]]) -> Tuple[List[Any], Any]:
+    parts = sorted(parts, key=lambda part: part[0])
+    offsets = np.cumsum([0] + [len(part[1]) for part in parts])
+    states = [state for part in parts for state in part[1]]
+    rows = np.concatenate([offsets[part[2]] + part[3] for part in parts])
+    cols = np.concatenate([offsets[part[0]] + part[4] for part in parts])
+    values = np.concatenate([part[5] for part in parts])
+    n = len(states)
+    rates = sparse.csr_matrix((values, (rows, cols)), shape=(n, n))
+    rates.sum_duplicates()
+    return states, rates
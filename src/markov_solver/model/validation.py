@@ -0,0 +1,224 @@
+"""
+Validation of Markov chains, checking all the evaluated link values at once
+with array operations.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Sequence
+
+import numpy as np
+from scipy import sparse  # type: ignore
+
+from markov_solver.solver.numeric import closed_classes
+
+# Violations that make a chain invalid.
+ERROR_KINDS = (
+    "undefined-symbol",
+    "invalid-value",
+    "negative-rate",
+    "row-sum",
+    "dangling-state",
+)
+# Violations that leave the chain solvable, but are likely mistakes.
+WARNING_KINDS = ("unreachable-state", "reducible")
+# Violations of each kind described in a report; the others are only counted.
+MAX_REPORTED = 20
+ROW_SUM_TOLERANCE = 1e-9
+
+
+class Violation(NamedTuple):
+    """A violation found by the validation of a chain."""
+
+    kind: str  # one of ERROR_KINDS or WARNING_KINDS
+    message: str
+
+
+class ChainValidationError(ValueError):
+    """Raised when a chain has invalid links or states."""
+
+    def __init__(self, report: "ValidationReport") -> None:
+        super().__init__(str(report))
+        self.report = report
+
+
+class ValidationReport(object):
+    """
+    The violations found by the validation of a chain: all of them are
+    counted, and the first max_reported of each kind are described.
+    """
+
+    def __init__(self, max_reported: int = MAX_REPORTED) -> None:
+        """
+        Creates a new empty report.
+        :param max_reported: (int) the number of violations of each kind to
+        describe.
+        """
+        self.max_reported = max_reported
+        self.violations: List[Violation] = []
+        self.counts: Dict[str, int] = {}
+
+    def add(self, kind: str, messages: Iterable[str], count: int) -> None:
+        """
+        Add the violations of a kind.
+        :param kind: (string) the kind of the violations.
+        :param messages: the descriptions of the violations; only the first
+        max_reported are consumed.
+        :param count: (int) the total number of violations.
+        :return: (void)
+        """
+        if count == 0:
+            return
+        self.counts[kind] = self.counts.get(kind, 0) + count
+        reported = sum(1 for violation in self.violations if violation.kind == kind)
+        for message in messages:
+            if reported >= self.max_reported:
+                break
+            self.violations.append(Violation(kind, message))
+            reported += 1
+
+    @property
+    def errors(self) -> List[Violation]:
+        return [v for v in self.violations if v.kind in ERROR_KINDS]
+
+    @property
+    def warnings(self) -> List[Violation]:
+        return [v for v in self.violations if v.kind in WARNING_KINDS]
+
+    @property
+    def valid(self) -> bool:
+        return not any(kind in ERROR_KINDS for kind in self.counts)
+
+    def raise_if_invalid(self) -> None:
+        """
+        Raise an error if the report has errors.
+        :return: (void)
+        :raise ChainValidationError: if the chain is not valid.
+        """
+        if not self.valid:
+            raise ChainValidationError(self)
+
+    def __str__(self) -> str:
+        if not self.counts:
+            return "No violations"
+        lines = []
+        for kind, count in self.counts.items():
+            severity = "error" if kind in ERROR_KINDS else "warning"
+            lines.append("{} {} ({})".format(count, kind, severity))
+            lines.extend(
+                "  {}".format(v.message) for v in self.violations if v.kind == kind
+            )
+            described = sum(1 for v in self.violations if v.kind == kind)
+            if count > described:
+                lines.append("  ... and {} more".format(count - described))
+        return "\n".join(lines)
+
+
+def check_values(
+    report: ValidationReport,
+    names: Sequence[str],
+    tails: np.ndarray,
+    heads: np.ndarray,
+    values: np.ndarray,
+) -> None:
+    """
+    Report the negative and non-finite link values; NaN values, whose
+    expression could not be evaluated, are skipped.
+    :param report: the report to update.
+    :param names: (list(string)) the state names.
+    :param tails: (numpy.ndarray) the tail state index of every link.
+    :param heads: (numpy.ndarray) the head state index of every link.
+    :param values: (numpy.ndarray) the value of every link.
+    :return: (void)
+    """
+    wrong = np.flatnonzero((values < 0.0) | np.isinf(values))
+    report.add(
+        "negative-rate",
+        (
+            "Link {} -> {} has value {}".format(
+                names[tails[i]], names[heads[i]], values[i]
+            )
+            for i in wrong.tolist()
+        ),
+        len(wrong),
+    )
+
+
+def check_row_sums(
+    report: ValidationReport,
+    names: Sequence[str],
+    tails: np.ndarray,
+    values: np.ndarray,
+    tolerance: float = ROW_SUM_TOLERANCE,
+) -> None:
+    """
+    Report the states whose outgoing probabilities, self-loops included, do
+    not sum to 1, as in the rows of a stochastic matrix.
+    :param report: the report to update.
+    :param names: (list(string)) the state names.
+    :param tails: (numpy.ndarray) the tail state index of every link.
+    :param values: (numpy.ndarray) the value of every link.
+    :param tolerance: (float) the largest accepted difference from 1.
+    :return: (void)
+    """
+    valid = np.isfinite(values)
+    sums = np.bincount(tails[valid], values[valid], minlength=len(names))
+    # Rows with unevaluated links are already reported.
+    complete = np.bincount(tails[~valid], minlength=len(names)) == 0
+    wrong = np.flatnonzero((np.abs(sums - 1.0) > tolerance) & complete)
+    report.add(
+        "row-sum",
+        (
+            "Probabilities out of {} sum to {}".format(names[i], sums[i])
+            for i in wrong.tolist()
+        ),
+        len(wrong),
+    )
+
+
+def check_reachability(
+    report: ValidationReport,
+    names: Sequence[str],
+    tails: np.ndarray,
+    heads: np.ndarray,
+    values: np.ndarray,
+) -> None:
+    """
+    Check that the chain has a single closed class of states, from which
+    every state can be reached, by the strongly connected components of the
+    positive links. Otherwise, the chain has no unique steady-state
+    distribution, or some states have zero steady-state probability.
+    :param report: the report to update.
+    :param names: (list(string)) the state names.
+    :param tails: (numpy.ndarray) the tail state index of every link.
+    :param heads: (numpy.ndarray) the head state index of every link.
+    :param values: (numpy.ndarray) the value of every link.
+    :return: (void)
+    """
+    n = len(names)
+    if n == 0:
+        return
+    positive = values > 0.0
+    tails, heads = tails[positive], heads[positive]
+    graph = sparse.csr_matrix((np.ones(len(tails)), (tails, heads)), shape=(n, n))
+    labels, classes = closed_classes(graph)
+    if len(classes) > 1:
+        report.add(
+            "reducible",
+            [
+                "{} closed classes of states, e.g. with states {}: the steady-state "
+                "distribution is not unique".format(
+                    len(classes),
+                    ", ".join(names[int(np.argmax(labels == c))] for c in classes[:5]),
+                )
+            ],
+            1,
+        )
+        return
+    unreachable = np.flatnonzero(labels != classes[0])
+    report.add(
+        "unreachable-state",
+        (
+            "State {} cannot be reached from the recurrent states".format(names[i])
+            for i in unreachable.tolist()
+        ),
+        len(unreachable),
+    )
@@ -3,9 +3,21 @@
 
 """Base classes for Markov chain parsers."""
 
+import gc
+import json
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Mapping, TextIO
+
+import yaml
 
 from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.model.markov_reward import MarkovReward
+from markov_solver.model.markov_state import MarkovState
+
+# libyaml-backed loader when available, pure-Python otherwise.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class ParserError(Exception):
@@ -19,6 +31,82 @@ class FormatParser(ABC):
     def parse(self, content: str) -> MarkovChain:
         """Parse file content into a MarkovChain."""
 
+    def parse_stream(self, stream: TextIO) -> MarkovChain:
+        """Parse a Markov chain read from a text stream.
+
+        The default reads the whole stream and delegates to :meth:`parse`;
+        formats that can be decoded incrementally override it.
+        """
+        return self.parse(stream.read())
+
+    def parse_path(self, path: Path) -> MarkovChain:
+        """Parse a Markov chain definition file.
+
+        The default opens the file as text and delegates to
+        :meth:`parse_stream`; binary formats, or formats that read companion
+        files, override it.
+        """
+        with path.open() as stream:
+            return self.parse_stream(stream)
+
     @abstractmethod
     def supports_extension(self, extension: str) -> bool:
         """Check if this parser supports the given file extension."""
+
+
+def load_document(content: str) -> Any:
+    """Load a YAML or JSON document.
+
+    Documents that look like JSON are decoded with the standard library JSON
+    parser, which is orders of magnitude faster than YAML; everything else
+    (or JSON that fails to decode, since YAML flow style is a superset of it)
+    goes through the libyaml safe loader, if installed.
+
+    Raises:
+        ParserError: If the content is neither valid JSON nor valid YAML.
+    """
+    if content.lstrip().startswith(("{", "[")):
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            pass
+    try:
+        return yaml.load(content, Loader=YAML_LOADER)
+    except yaml.YAMLError as e:
+        raise ParserError(f"Invalid YAML/JSON: {e}") from e
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector while building a large chain.
+
+    Building a chain allocates millions of states and links that never form
+    reference cycles, yet each allocation burst triggers a collection that
+    traverses all of them. Reference counting still frees everything.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def add_rewards(mc: MarkovChain, rewards: Mapping[str, Mapping[str, Any]]) -> None:
+    """Add the reward structures of a definition to a chain.
+
+    Args:
+        mc: The chain.
+        rewards: The reward records, by name, with an optional ``state``
+            expression and an optional list of ``transitions``, each with
+            ``from``, ``to`` and ``value`` fields.
+    """
+    for name, record in rewards.items():
+        reward = mc.add_reward(MarkovReward(name, record.get("state")))
+        for transition in record.get("transitions") or ():
+            reward.add_transition(
+                MarkovState(transition["from"]),
+                MarkovState(transition["to"]),
+                transition["value"],
+            )
@@ -3,14 +3,23 @@
 
 """Parser for chain-based YAML/JSON format."""
 
-import yaml
+from typing import Any, Iterable, Mapping
+
 from pydantic import ValidationError
 
 from markov_solver.model.markov_chain import MarkovChain
 from markov_solver.model.markov_link import MarkovLink
 from markov_solver.model.markov_state import MarkovState
-from markov_solver.parser.base import FormatParser, ParserError
-from markov_solver.parser.schema import MarkovChainDefinition
+from markov_solver.parser.base import (
+    FormatParser,
+    ParserError,
+    add_rewards,
+    load_document,
+)
+from markov_solver.parser.schema import (
+    MarkovChainRecord,
+    markov_chain_record_adapter,
+)
 
 
 class ChainFormatParser(FormatParser):
@@ -23,19 +32,34 @@ class ChainFormatParser(FormatParser):
             value: "0.5"
     """
 
+    def __init__(self, trusted: bool = False) -> None:
+        """Create the parser.
+
+        Args:
+            trusted: If True, skip schema validation. Only use it for
+                     definitions produced by trusted tools.
+        """
+        self.trusted = trusted
+
     def parse(self, content: str) -> MarkovChain:
-        # Try YAML first (also handles JSON)
-        try:
-            raw_data = yaml.safe_load(content)
-        except yaml.YAMLError as e:
-            raise ParserError(f"Invalid YAML/JSON: {e}") from e
+        raw_data = load_document(content)
 
         if not raw_data:
             raise ParserError("Empty definition file")
 
-        # Validate with Pydantic schema
+        if self.trusted:
+            try:
+                mc = self._build_chain(raw_data["chain"], raw_data.get("symbols"))
+                add_rewards(mc, raw_data.get("rewards") or {})
+                return mc
+            except (KeyError, TypeError, AttributeError) as e:
+                raise ParserError(f"Invalid chain definition: {e!r}") from e
+
+        # Validate with Pydantic schema, in bulk
         try:
-            definition = MarkovChainDefinition.model_validate(raw_data)
+            definition: MarkovChainRecord = markov_chain_record_adapter.validate_python(
+                raw_data
+            )
         except ValidationError as e:
             errors = "; ".join(
                 f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
@@ -43,23 +67,30 @@ class ChainFormatParser(FormatParser):
             )
             raise ParserError(f"Invalid chain definition: {errors}") from e
 
-        return self._build_chain(definition)
+        mc = self._build_chain(definition["chain"], definition.get("symbols"))
+        add_rewards(mc, definition.get("rewards", {}))
+        return mc
 
-    def _build_chain(self, definition: MarkovChainDefinition) -> MarkovChain:
+    def _build_chain(
+        self,
+        links: Iterable[Mapping[str, Any]],
+        symbols: Mapping[str, Any] | None,
+    ) -> MarkovChain:
         mc = MarkovChain()
 
-        if definition.symbols:
+        if symbols:
             # Convert all symbol values to float
-            symbols = {k: float(v) for k, v in definition.symbols.items()}
-            mc.add_symbols(**symbols)
-
-        for link in definition.chain:
-            head = MarkovState(link.from_state)
-            tail = MarkovState(link.to_state)
-            markov_link = MarkovLink(head, tail, link.value)
-            mc.add_state(head)
-            mc.add_state(tail)
-            mc.add_link(markov_link)
+            mc.add_symbols(**{k: float(v) for k, v in symbols.items()})
+
+        states: dict[str, MarkovState] = {}
+        for link in links:
+            head = states.get(link["from"])
+            if head is None:
+                head = states[link["from"]] = mc.add_state(MarkovState(link["from"]))
+            tail = states.get(link["to"])
+            if tail is None:
+                tail = states[link["to"]] = mc.add_state(MarkovState(link["to"]))
+            mc.add_link(MarkovLink(head, tail, str(link["value"])))
 
         return mc
 
@@ -3,17 +3,425 @@
 
 """Parser for DOT/Graphviz format."""
 
+import io
 import re
+from typing import Iterator, NoReturn, TextIO
 
 from markov_solver.model.markov_chain import MarkovChain
 from markov_solver.model.markov_link import MarkovLink
 from markov_solver.model.markov_state import MarkovState
-from markov_solver.parser.base import FormatParser, ParserError
+from markov_solver.parser.base import FormatParser, ParserError, gc_paused
+
+# Size of the chunks read from streams.
+CHUNK_SIZE = 1 << 20
+
+# Edge value used when an edge has no label.
+DEFAULT_EDGE_VALUE = "1.0"
+
+KEYWORDS = {"strict", "graph", "digraph", "node", "edge", "subgraph"}
+
+PUNCTUATION = {"{", "}", "[", "]", "=", ";", ",", ":", "+", "->", "--"}
+
+# Each match is one token, with the whitespace and comments preceding it.
+# No alternative can backtrack past the token, so scanning is linear. Any
+# other character is a token of its own, which the reader rejects.
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?:\s+|//[^\n]*|/\*.*?\*/|(?m:^[ \t]*\#[^\n]*))*
+    (
+        -?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?)
+      | [A-Za-z_\x80-\U0010ffff][\w\x80-\U0010ffff]*
+      | ->|--|[{}\[\]=;,:+]
+      | "(?:[^"\\]|\\.)*"
+      | .
+    )?
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Identifiers and numerals that need no unescaping and are not keywords.
+PLAIN_ID_PATTERN = re.compile(
+    r"(?!(?i:strict|graph|digraph|node|edge|subgraph)\Z)"
+    r"(?:-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?)|[A-Za-z_\x80-\U0010ffff][\w\x80-\U0010ffff]*)\Z"
+)
+
+# Tokens left when a multi-line quoted string or comment is cut at the end
+# of a chunk.
+INCOMPLETE_TOKENS = {'"', "/"}
+
+
+class DotTokenizer:
+    """Splits a DOT document read from a stream into tokens, chunk by chunk.
+
+    Tokens are returned as their source text: quoted strings keep their
+    quotes, so they are never mistaken for punctuation or keywords. Chunks
+    are cut after their last newline, which no token spans except multi-line
+    strings, comments and HTML strings: these are held back until more input
+    is read. Chunks without them are split by the regex engine alone.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+        """Create the tokenizer.
+
+        Args:
+            stream: The text stream to read.
+            chunk_size: The number of characters read at a time.
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.chunk = ""
+        self.chunk_line = 1  # line number at the start of the chunk
+        self._pending = ""
+        self._eof = False
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            tokens = self.read_tokens()
+            if not tokens:
+                return
+            yield from tokens
+
+    def read_tokens(self) -> list[str]:
+        """Read the tokens of the next chunk.
+
+        Returns:
+            The tokens, or an empty list at the end of the stream.
+        """
+        tokens: list[str] = []
+        while not tokens and not (self._eof and not self._pending):
+            data = "" if self._eof else self.stream.read(self.chunk_size)
+            self._eof = not data
+            self._pending += data
+            cut = len(self._pending) if self._eof else self._pending.rfind("\n") + 1
+            if not cut:
+                continue
+            self.chunk_line += self.chunk.count("\n")
+            self.chunk, self._pending = self._pending[:cut], self._pending[cut:]
+
+            tokens = TOKEN_PATTERN.findall(self.chunk)
+            if "<" in self.chunk or (
+                not self._eof and not INCOMPLETE_TOKENS.isdisjoint(tokens)
+            ):
+                tokens = self._scan()
+            while tokens and not tokens[-1]:
+                tokens.pop()  # trailing whitespace and comments
+        return tokens
+
+    def line(self, index: int) -> int:
+        """Return the line number of a token of the last chunk.
+
+        Args:
+            index: The index of the token in the list returned for the chunk.
+        """
+        for i, match in enumerate(self._matches()):
+            if i == index:
+                return self.chunk_line + self.chunk.count("\n", 0, match.start(1))
+        return self.chunk_line + self.chunk.count("\n")
+
+    def _scan(self) -> list[str]:
+        # Slow path: HTML strings nest, so they are delimited by hand, and
+        # unterminated tokens are held back for the next chunk.
+        tokens = []
+        for match in self._matches():
+            token, start = match.group(1), match.start(1)
+            if token == "<":
+                end = _html_end(self.chunk, start)
+                if end is not None:
+                    tokens.append(self.chunk[start:end])
+                    continue
+            if not self._eof and (token == "<" or token in INCOMPLETE_TOKENS):
+                self._pending = self.chunk[start:] + self._pending
+                self.chunk = self.chunk[:start]
+                break
+            tokens.append(token)
+        return tokens
+
+    def _matches(self) -> Iterator[re.Match[str]]:
+        pos = 0
+        while pos < len(self.chunk):
+            match = TOKEN_PATTERN.match(self.chunk, pos)
+            if match is None or not match.group(1):
+                return
+            yield match
+            pos = match.end()
+            if match.group(1) == "<":
+                pos = _html_end(self.chunk, match.start(1)) or pos
+
+
+def _html_end(text: str, start: int) -> int | None:
+    """Return the offset past the HTML string starting at start, if complete."""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "<":
+            depth += 1
+        elif text[i] == ">":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def _unescape(value: str) -> str:
+    """Unescape a quoted DOT string: only quotes and line continuations."""
+    if "\\" not in value:
+        return value
+    return value.replace('\\"', '"').replace("\\\r\n", "").replace("\\\n", "")
+
+
+class _DotReader:
+    """Recursive descent reader of the DOT grammar, adding to a chain.
+
+    Edges are added to the chain as soon as they are read. Endpoints can be
+    nodes or subgraphs (standing for all their nodes), and edge chains such
+    as ``a -> b -> c`` add one link per hop. Undirected edges (``--``) add a
+    link in both directions. The link value is the edge label, which can
+    also be set with ``edge [label=...]`` defaults, scoped by subgraph.
+    """
+
+    def __init__(self, tokenizer: DotTokenizer) -> None:
+        self.tokenizer = tokenizer
+        self.batch: list[str] = []  # the tokens of the current chunk
+        self.pos = -1  # the position of the current token in the batch
+        self.token = ""  # the current token; empty at the end of the stream
+        self.chain = MarkovChain()
+        self.states: dict[str, MarkovState] = {}
+        self.edges = 0
+        self.edge_defaults: list[dict[str, str]] = [{}]
+        # Nodes of the subgraphs being read, innermost last.
+        self.subgraph_nodes: list[dict[str, None]] = []
+        self._advance()
+
+    def read(self) -> MarkovChain:
+        if self._is_keyword("strict"):
+            self._advance()
+        if self._is_keyword("graph") or self._is_keyword("digraph"):
+            self._advance()
+            if self.token not in PUNCTUATION:
+                self._id()
+            self._expect("{")
+            self._stmt_list()
+            self._expect("}")
+        else:
+            # Bare statement lists, without the graph header, are accepted.
+            self._stmt_list()
+        if self.token:
+            self._fail("end of file")
+        return self.chain
+
+    def _stmt_list(self) -> None:
+        while self.token and self.token != "}":
+            if not self._simple_edge_stmt():
+                self._stmt()
+            if self.token == ";":
+                self._advance()
+
+    def _simple_edge_stmt(self) -> bool:
+        # Fast path for the statements making up most large files, such as
+        # a -> b or a -> b [label=v], with plain identifiers: their tokens
+        # are checked in place instead of going through the grammar methods.
+        # Anything else, including edge chains, is left to _stmt.
+        batch, pos = self.batch, self.pos
+        end = pos + 3
+        if end >= len(batch) or batch[pos + 1] != "->" or self.subgraph_nodes:
+            return False
+        tail, head = batch[pos], batch[pos + 2]
+        if not (PLAIN_ID_PATTERN.match(tail) and PLAIN_ID_PATTERN.match(head)):
+            return False
+        value = self.edge_defaults[-1].get("label")
+        if batch[end] == "[":
+            if (
+                end + 5 >= len(batch)
+                or batch[end + 1] != "label"
+                or batch[end + 2] != "="
+                or batch[end + 4] != "]"
+            ):
+                return False
+            value = batch[end + 3]
+            if value[:1] == '"' and len(value) > 1:
+                value = _unescape(value[1:-1])
+            elif not PLAIN_ID_PATTERN.match(value):
+                return False
+            end += 5
+        if batch[end] in (":", "->", "--", "["):
+            return False
+
+        states = self.states
+        tail_state, head_state = states.get(tail), states.get(head)
+        if tail_state is None:
+            tail_state = states[tail] = self.chain.add_state(MarkovState(tail))
+        if head_state is None:
+            head_state = states[head] = self.chain.add_state(MarkovState(head))
+        self.chain.add_link(
+            MarkovLink(tail_state, head_state, value or DEFAULT_EDGE_VALUE)
+        )
+        self.edges += 1
+        self.pos = end
+        self.token = batch[end]
+        return True
+
+    def _stmt(self) -> None:
+        keyword = self.token.lower()
+        if keyword in ("graph", "node", "edge"):
+            self._advance()
+            attrs = self._attr_list()
+            if keyword == "edge":
+                self.edge_defaults[-1].update(attrs)
+            return
+
+        if keyword == "subgraph" or self.token == "{":
+            tails = self._subgraph()
+        else:
+            name = self._id()
+            if self.token == "=":
+                # Graph attribute assignment: ID '=' ID
+                self._advance()
+                self._id()
+                return
+            if self.token == ":":
+                self._port()
+            tails = [self._node(name)]
+
+        if self.token != "->" and self.token != "--":
+            self._attr_list()
+            return
+
+        hops = []
+        while self.token == "->" or self.token == "--":
+            directed = self.token == "->"
+            self._advance()
+            if self.token == "{" or self._is_keyword("subgraph"):
+                heads = self._subgraph()
+            else:
+                heads = [self._node(self._id())]
+                if self.token == ":":
+                    self._port()
+            hops.append((tails, heads, directed))
+            tails = heads
+
+        attrs = self._attr_list() if self.token == "[" else {}
+        value = attrs.get("label", self.edge_defaults[-1].get("label"))
+        self._add_links(hops, value or DEFAULT_EDGE_VALUE)
+
+    def _add_links(
+        self,
+        hops: list[tuple[list[MarkovState], list[MarkovState], bool]],
+        value: str,
+    ) -> None:
+        add_link = self.chain.add_link
+        for tails, heads, directed in hops:
+            for tail in tails:
+                for head in heads:
+                    add_link(MarkovLink(tail, head, value))
+                    self.edges += 1
+                    if not directed and tail != head:
+                        add_link(MarkovLink(head, tail, value))
+
+    def _subgraph(self) -> list[MarkovState]:
+        if self._is_keyword("subgraph"):
+            self._advance()
+            if self.token not in PUNCTUATION:
+                self._id()
+        self._expect("{")
+        self.subgraph_nodes.append({})
+        self.edge_defaults.append(dict(self.edge_defaults[-1]))
+        try:
+            self._stmt_list()
+            self._expect("}")
+        finally:
+            self.edge_defaults.pop()
+            nodes = self.subgraph_nodes.pop()
+        if self.subgraph_nodes:
+            self.subgraph_nodes[-1].update(nodes)
+        return [self.states[name] for name in nodes]
+
+    def _attr_list(self) -> dict[str, str]:
+        attrs: dict[str, str] = {}
+        while self.token == "[":
+            self._advance()
+            while self.token != "]":
+                key = self._id()
+                self._expect("=")
+                attrs[key] = self._id()
+                if self.token == "," or self.token == ";":
+                    self._advance()
+            self._advance()
+        return attrs
+
+    def _node(self, name: str) -> MarkovState:
+        state = self.states.get(name)
+        if state is None:
+            state = self.states[name] = self.chain.add_state(MarkovState(name))
+        if self.subgraph_nodes:
+            self.subgraph_nodes[-1][name] = None
+        return state
+
+    def _port(self) -> None:
+        # Ports (node:port:compass) do not affect the chain.
+        while self.token == ":":
+            self._advance()
+            self._id()
+
+    def _id(self) -> str:
+        token = self.token
+        if token in PUNCTUATION or token.lower() in KEYWORDS:
+            self._fail("an identifier")
+        first = token[:1]
+        if first == '"' and len(token) > 1:
+            value = _unescape(token[1:-1])
+            self._advance()
+            # Quoted strings can be concatenated with '+'.
+            while self.token == "+":
+                self._advance()
+                if self.token[:1] != '"' or len(self.token) < 2:
+                    self._fail("a quoted string")
+                value += _unescape(self.token[1:-1])
+                self._advance()
+            return value
+        if first == "<" and len(token) > 1:
+            self._advance()
+            return token[1:-1]
+        if not (first.isalnum() or first == "_" or len(token) > 1):
+            # End of file, or a character that cannot start a token.
+            self._fail("an identifier")
+        self._advance()
+        return token
+
+    def _is_keyword(self, keyword: str) -> bool:
+        return self.token.lower() == keyword
+
+    def _expect(self, token: str) -> None:
+        if self.token != token:
+            self._fail(repr(token))
+        self._advance()
+
+    def _advance(self) -> None:
+        self.pos += 1
+        if self.pos < len(self.batch):
+            self.token = self.batch[self.pos]
+            return
+        batch = self.tokenizer.read_tokens()
+        if batch:
+            self.batch, self.pos, self.token = batch, 0, batch[0]
+        else:
+            self.pos, self.token = len(self.batch), ""
+
+    def _fail(self, expected: str) -> NoReturn:
+        line = self.tokenizer.line(self.pos)
+        found = repr(self.token) if self.token else "end of file"
+        raise ParserError(
+            f"Invalid DOT syntax at line {line}: expected {expected}, found {found}"
+        )
 
 
 class DotParser(FormatParser):
     """Parser for DOT/Graphviz format.
 
+    Supports the full DOT statement grammar: edge chains, subgraphs as edge
+    endpoints, attribute lists with several keys, ``edge`` attribute
+    defaults, quoted, HTML and concatenated names, ports and comments. The
+    ``label`` attribute of each edge is the transition value. The graph
+    header is optional.
+
     Example::
 
         digraph {
@@ -23,33 +431,17 @@ class DotParser(FormatParser):
         }
     """
 
-    # Pattern to match edges: node1 -> node2 [label=value] or [label="value"]
-    EDGE_PATTERN = re.compile(
-        r'^\s*"?([^"\s\->]+)"?\s*->\s*"?([^"\s\[]+)"?\s*'
-        r'(?:\[\s*label\s*=\s*"?([^"\]]+)"?\s*])?',
-        re.MULTILINE,
-    )
-
     def parse(self, content: str) -> MarkovChain:
-        mc = MarkovChain()
+        return self.parse_stream(io.StringIO(content))
 
-        # Find all edges
-        matches = self.EDGE_PATTERN.findall(content)
+    def parse_stream(self, stream: TextIO) -> MarkovChain:
+        with gc_paused():
+            reader = _DotReader(DotTokenizer(stream))
+            mc = reader.read()
 
-        if not matches:
+        if not reader.edges:
             raise ParserError("No valid edges found in DOT file")
 
-        for from_state, to_state, label in matches:
-            from_state = from_state.strip()
-            to_state = to_state.strip()
-            value = label.strip() if label else "1.0"
-
-            head = MarkovState(from_state)
-            tail = MarkovState(to_state)
-            mc.add_state(head)
-            mc.add_state(tail)
-            mc.add_link(MarkovLink(head, tail, value))
-
         return mc
 
     def supports_extension(self, extension: str) -> bool:
@@ -3,14 +3,45 @@
 
 """Main parser for Markov chain definition files."""
 
+from concurrent.futures import Executor
 from pathlib import Path
+from typing import TextIO
 
 from markov_solver.model.markov_chain import MarkovChain
 from markov_solver.parser.base import FormatParser, ParserError
 from markov_solver.parser.chain_format_parser import ChainFormatParser
 from markov_solver.parser.csv_parser import CsvAdjacencyMatrixParser
 from markov_solver.parser.dot_parser import DotParser
+from markov_solver.parser.ndjson_parser import NdjsonParser
+from markov_solver.parser.sparse_parser import MatrixMarketParser, NumpyParser
 from markov_solver.parser.transition_matrix_parser import TransitionMatrixParser
+from markov_solver.utils.async_utils import run_blocking
+
+# Extensions listed in error messages, when a registered parser supports them.
+KNOWN_EXTENSIONS = [
+    ".yaml",
+    ".yml",
+    ".json",
+    ".ndjson",
+    ".jsonl",
+    ".dot",
+    ".gv",
+    ".csv",
+    ".mtx",
+    ".npz",
+    ".npy",
+]
+
+# Parsers of definitions given as strings or streams, by format name.
+FORMAT_PARSERS: dict[str, type[FormatParser]] = {
+    "chain": ChainFormatParser,
+    "matrix": TransitionMatrixParser,
+    "dot": DotParser,
+    "csv": CsvAdjacencyMatrixParser,
+    "ndjson": NdjsonParser,
+    "mtx": MatrixMarketParser,
+}
+STRING_FORMATS = tuple(FORMAT_PARSERS)
 
 
 class MarkovChainParser:
@@ -22,6 +53,9 @@ class MarkovChainParser:
         self.register_parser(ChainFormatParser())
         self.register_parser(DotParser())
         self.register_parser(CsvAdjacencyMatrixParser())
+        self.register_parser(NdjsonParser())
+        self.register_parser(MatrixMarketParser())
+        self.register_parser(NumpyParser())
 
     def register_parser(self, parser: FormatParser) -> None:
         """Register a new format parser."""
@@ -35,7 +69,7 @@ class MarkovChainParser:
 
         supported_exts: set[str] = set()
         for p in self._format_parsers:
-            for ext in [".yaml", ".yml", ".json", ".dot", ".gv", ".csv"]:
+            for ext in KNOWN_EXTENSIONS:
                 if p.supports_extension(ext):
                     supported_exts.add(ext)
 
@@ -52,9 +86,7 @@ class MarkovChainParser:
             raise ParserError(f"File not found: {file_path}")
 
         format_parser = self._get_parser_for_extension(file_path.suffix)
-        content = file_path.read_text()
-
-        return format_parser.parse(content)
+        return format_parser.parse_path(file_path)
 
     def parse_string(
         self, content: str, format_parser: FormatParser | None = None
@@ -81,6 +113,9 @@ def create_chain_from_file(path: str | Path) -> MarkovChain:
 
     Supports:
     - YAML/JSON chain format (.yaml, .yml, .json)
+    - JSON-lines link stream (.ndjson, .jsonl)
+    - Matrix Market generator matrix (.mtx)
+    - NumPy/SciPy generator matrix (.npz, .npy)
     - DOT/Graphviz format (.dot, .gv)
     - CSV adjacency matrix (.csv)
 
@@ -96,12 +131,52 @@ def create_chain_from_file(path: str | Path) -> MarkovChain:
     return _default_parser.parse_file(path)
 
 
+async def async_create_chain_from_file(
+    path: str | Path,
+    executor: Executor | None = None,
+    timeout: float | None = None,
+) -> MarkovChain:
+    """Create a MarkovChain from a definition file without blocking the loop.
+
+    Reading and parsing run in an executor, so many definitions can be
+    loaded concurrently from asyncio code.
+
+    Args:
+        path: Path to the definition file.
+        executor: Optional executor to use. If not provided, uses the one
+                  configured with ``async_utils.set_default_executor``.
+        timeout: Optional maximum number of seconds to wait.
+
+    Returns:
+        A MarkovChain instance.
+
+    Raises:
+        ParserError: If the file cannot be parsed or validated.
+        asyncio.TimeoutError: If the timeout expires.
+    """
+    return await run_blocking(
+        create_chain_from_file, path, executor=executor, timeout=timeout
+    )
+
+
+def _get_parser_for_format(format_type: str) -> FormatParser:
+    """Get a parser for a format type name."""
+    if format_type not in FORMAT_PARSERS:
+        raise ParserError(
+            f"Unknown format type: {format_type}. "
+            f"Supported: {', '.join(STRING_FORMATS)}"
+        )
+
+    return FORMAT_PARSERS[format_type]()
+
+
 def create_chain_from_string(content: str, format_type: str = "chain") -> MarkovChain:
     """Create a MarkovChain from a string.
 
     Args:
         content: The definition content as a string.
-        format_type: One of "chain", "matrix", "dot", "csv".
+        format_type: One of "chain", "matrix", "dot", "csv", "ndjson",
+                     "mtx".
 
     Returns:
         A MarkovChain instance.
@@ -109,20 +184,27 @@ def create_chain_from_string(content: str, format_type: str = "chain") -> Markov
     Raises:
         ParserError: If the content cannot be parsed.
     """
-    parsers: dict[str, FormatParser] = {
-        "chain": ChainFormatParser(),
-        "matrix": TransitionMatrixParser(),
-        "dot": DotParser(),
-        "csv": CsvAdjacencyMatrixParser(),
-    }
-
-    if format_type not in parsers:
-        raise ParserError(
-            f"Unknown format type: {format_type}. "
-            f"Supported: {', '.join(parsers.keys())}"
-        )
+    return _get_parser_for_format(format_type).parse(content)
+
+
+def create_chain_from_stream(
+    stream: TextIO, format_type: str = "ndjson"
+) -> MarkovChain:
+    """Create a MarkovChain from a text stream, such as stdin.
 
-    return parsers[format_type].parse(content)
+    Args:
+        stream: The text stream to read the definition from.
+        format_type: One of "chain", "matrix", "dot", "csv", "ndjson",
+                     "mtx".
+                     With "ndjson", the stream is read incrementally.
+
+    Returns:
+        A MarkovChain instance.
+
+    Raises:
+        ParserError: If the content cannot be parsed.
+    """
+    return _get_parser_for_format(format_type).parse_stream(stream)
 
 
 def get_parser() -> MarkovChainParser:
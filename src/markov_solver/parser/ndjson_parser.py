@@ -0,0 +1,124 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Parser for the streaming JSON-lines (NDJSON) link format."""
+
+import io
+import json
+from typing import Any, Mapping, TextIO
+
+from pydantic import ValidationError
+
+from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.model.markov_link import MarkovLink
+from markov_solver.model.markov_state import MarkovState
+from markov_solver.parser.base import FormatParser, ParserError, gc_paused
+from markov_solver.parser.schema import (
+    markov_link_record_adapter,
+    symbols_record_adapter,
+)
+
+
+class NdjsonParser(FormatParser):
+    """Parser for the JSON-lines link stream format.
+
+    Each non-blank line holds one JSON object: an optional symbols header,
+    which must come first, followed by one object per link. Lines are
+    decoded and added to the chain one at a time, so memory use does not
+    depend on the size of the input and definitions can be piped from
+    generators via stdin.
+
+    Example:
+        {"symbols": {"lambda": 1.5}}
+        {"from": "S0", "to": "S1", "value": "lambda"}
+        {"from": "S1", "to": "S0", "value": "2.0"}
+    """
+
+    def __init__(self, trusted: bool = False) -> None:
+        """Create the parser.
+
+        Args:
+            trusted: If True, skip schema validation. Only use it for
+                     definitions produced by trusted tools.
+        """
+        self.trusted = trusted
+
+    def parse(self, content: str) -> MarkovChain:
+        return self.parse_stream(io.StringIO(content))
+
+    def parse_stream(self, stream: TextIO) -> MarkovChain:
+        with gc_paused():
+            return self._read(stream)
+
+    def _read(self, stream: TextIO) -> MarkovChain:
+        mc = MarkovChain()
+        states: dict[str, MarkovState] = {}
+        links = 0
+
+        for lineno, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ParserError(f"Invalid JSON at line {lineno}: {e}") from e
+
+            if isinstance(record, dict) and "symbols" in record:
+                if links or mc.symbols:
+                    raise ParserError(
+                        f"Symbols header at line {lineno} must be the first record"
+                    )
+                self._add_symbols(mc, record["symbols"], lineno)
+                continue
+
+            link = self._validate_link(record, lineno)
+            try:
+                source, target, value = link["from"], link["to"], link["value"]
+            except KeyError as e:
+                raise ParserError(f"Invalid link at line {lineno}: {e!r}") from e
+            head = states.get(source)
+            if head is None:
+                head = states[source] = mc.add_state(MarkovState(source))
+            tail = states.get(target)
+            if tail is None:
+                tail = states[target] = mc.add_state(MarkovState(target))
+            mc.add_link(MarkovLink(head, tail, str(value)))
+            links += 1
+
+        if not links:
+            raise ParserError("Empty definition file")
+
+        return mc
+
+    def _validate_link(self, record: Any, lineno: int) -> Mapping[str, Any]:
+        if self.trusted:
+            if not isinstance(record, dict):
+                raise ParserError(f"Invalid link at line {lineno}: {record!r}")
+            return record
+        try:
+            return markov_link_record_adapter.validate_python(record)
+        except ValidationError as e:
+            raise ParserError(
+                f"Invalid link at line {lineno}: {_format_errors(e)}"
+            ) from e
+
+    def _add_symbols(self, mc: MarkovChain, symbols: Any, lineno: int) -> None:
+        if not self.trusted:
+            try:
+                symbols = symbols_record_adapter.validate_python(symbols)
+            except ValidationError as e:
+                raise ParserError(
+                    f"Invalid symbols at line {lineno}: {_format_errors(e)}"
+                ) from e
+        if symbols:
+            mc.add_symbols(**{k: float(v) for k, v in symbols.items()})
+
+    def supports_extension(self, extension: str) -> bool:
+        return extension.lower() in {".ndjson", ".jsonl"}
+
+
+def _format_errors(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc']) or 'record'}: {err['msg']}"
+        for err in error.errors()
+    )
@@ -3,7 +3,9 @@
 
 """Pydantic schemas for Markov chain definition files."""
 
-from pydantic import BaseModel, Field
+from typing import NotRequired, TypedDict
+
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class MarkovLinkSchema(BaseModel):
@@ -16,6 +18,39 @@ class MarkovLinkSchema(BaseModel):
     model_config = {"populate_by_name": True}
 
 
+class RewardTransitionSchema(BaseModel):
+    """Schema for the reward of a transition."""
+
+    from_state: str = Field(..., alias="from", description="Source state name")
+    to_state: str = Field(..., alias="to", description="Target state name")
+    value: str | int | float = Field(..., description="Reward of the transition")
+
+    model_config = {"populate_by_name": True}
+
+
+class RewardSchema(BaseModel):
+    """Schema for a reward structure, defining a performance measure.
+
+    Example::
+
+        rewards:
+          queue_length:
+            state: "value"
+          throughput:
+            transitions:
+              - from: "1"
+                to: "0"
+                value: 1
+    """
+
+    state: str | int | float | None = Field(
+        default=None, description="State reward, an expression over state variables"
+    )
+    transitions: list[RewardTransitionSchema] = Field(
+        default_factory=list, description="Rewards of transitions"
+    )
+
+
 class MarkovChainDefinition(BaseModel):
     """Schema for the chain-based Markov chain definition format.
 
@@ -33,6 +68,9 @@ class MarkovChainDefinition(BaseModel):
     symbols: dict[str, str | int | float] = Field(
         default_factory=dict, description="Optional symbolic variables"
     )
+    rewards: dict[str, RewardSchema] = Field(
+        default_factory=dict, description="Optional reward structures"
+    )
 
 
 class TransitionMatrixDefinition(BaseModel):
@@ -58,3 +96,43 @@ class TransitionMatrixDefinition(BaseModel):
     symbols: dict[str, str | int | float] = Field(
         default_factory=dict, description="Optional symbolic variables"
     )
+    rewards: dict[str, RewardSchema] = Field(
+        default_factory=dict, description="Optional reward structures"
+    )
+
+
+# Plain-dict counterparts of the models above, validated in bulk with a
+# TypeAdapter: they skip the creation of one model instance per link, which
+# dominates validation time for large chains.
+MarkovLinkRecord = TypedDict("MarkovLinkRecord", {"from": str, "to": str, "value": str})
+
+
+RewardTransitionRecord = TypedDict(
+    "RewardTransitionRecord", {"from": str, "to": str, "value": str | int | float}
+)
+
+
+class RewardRecord(TypedDict):
+    """Plain-dict form of :class:`RewardSchema`."""
+
+    state: NotRequired[str | int | float | None]
+    transitions: NotRequired[list[RewardTransitionRecord]]
+
+
+class MarkovChainRecord(TypedDict):
+    """Plain-dict form of :class:`MarkovChainDefinition`."""
+
+    chain: list[MarkovLinkRecord]
+    symbols: NotRequired[dict[str, str | int | float]]
+    rewards: NotRequired[dict[str, RewardRecord]]
+
+
+markov_chain_record_adapter: TypeAdapter[MarkovChainRecord] = TypeAdapter(
+    MarkovChainRecord
+)
+markov_link_record_adapter: TypeAdapter[MarkovLinkRecord] = TypeAdapter(
+    MarkovLinkRecord
+)
+symbols_record_adapter: TypeAdapter[dict[str, str | int | float]] = TypeAdapter(
+    dict[str, str | int | float]
+)
@@ -0,0 +1,100 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Parsers for generator matrices stored in Matrix Market and NumPy formats."""
+
+import io
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from scipy import io as scipy_io  # type: ignore
+from scipy import sparse  # type: ignore
+
+from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.parser.base import FormatParser, ParserError, gc_paused
+from markov_solver.utils.matrix_utils import read_state_names, states_sidecar_path
+
+
+def _build_chain(matrix: Any, states: list[str] | None) -> MarkovChain:
+    """Build a chain from a matrix, reporting invalid matrices as ParserError."""
+    try:
+        with gc_paused():
+            return MarkovChain.from_matrix(matrix, states)
+    except ValueError as e:
+        raise ParserError(f"Invalid matrix: {e}") from e
+
+
+class MatrixMarketParser(FormatParser):
+    """Parser for generator or transition matrices in Matrix Market format.
+
+    State names are read from the sidecar file with the same name and the
+    ``.states`` extension, one per line, following the matrix rows; without
+    it, states are named after the row indices, starting from 0.
+
+    Example:
+        %%MatrixMarket matrix coordinate real general
+        2 2 2
+        1 2 0.1
+        2 1 0.5
+    """
+
+    def parse(self, content: str) -> MarkovChain:
+        return _build_chain(self._read(io.BytesIO(content.encode())), None)
+
+    def parse_path(self, path: Path) -> MarkovChain:
+        matrix = self._read(path)
+        return _build_chain(matrix, read_state_names(states_sidecar_path(path)))
+
+    def _read(self, source: Any) -> Any:
+        try:
+            return scipy_io.mmread(source)
+        except (ValueError, IndexError, OSError) as e:
+            raise ParserError(f"Invalid Matrix Market file: {e}") from e
+
+    def supports_extension(self, extension: str) -> bool:
+        return extension.lower() == ".mtx"
+
+
+class NumpyParser(FormatParser):
+    """Parser for generator or transition matrices in NumPy/SciPy formats.
+
+    Supports sparse matrices saved with ``scipy.sparse.save_npz`` (``.npz``),
+    dense arrays saved with ``numpy.save`` (``.npy``) and archives holding a
+    single dense array saved with ``numpy.savez``. State names are read from
+    the ``states`` array of the archive, if any, or from the ``.states``
+    sidecar file; without them, states are named after the row indices.
+    """
+
+    def parse(self, content: str) -> MarkovChain:
+        raise ParserError("NumPy files are binary and can only be parsed from a file")
+
+    def parse_path(self, path: Path) -> MarkovChain:
+        try:
+            matrix, states = self._read(path)
+        except (ValueError, OSError, zipfile.BadZipFile) as e:
+            raise ParserError(f"Invalid NumPy file: {e}") from e
+
+        if states is None:
+            states = read_state_names(states_sidecar_path(path))
+        return _build_chain(matrix, states)
+
+    def _read(self, path: Path) -> tuple[Any, list[str] | None]:
+        if path.suffix.lower() == ".npy":
+            return np.load(path, allow_pickle=False), None
+
+        with np.load(path, allow_pickle=False) as archive:
+            states = archive["states"].tolist() if "states" in archive else None
+            if "format" in archive:
+                return sparse.load_npz(path), states
+            arrays = [name for name in archive.files if name != "states"]
+            if len(arrays) != 1:
+                raise ValueError(
+                    "expected a sparse matrix or a single dense array, "
+                    f"found arrays {arrays}"
+                )
+            return archive[arrays[0]], states
+
+    def supports_extension(self, extension: str) -> bool:
+        return extension.lower() in {".npz", ".npy"}
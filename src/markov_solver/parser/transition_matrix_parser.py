@@ -3,13 +3,17 @@
 
 """Parser for transition matrix YAML/JSON format."""
 
-import yaml
 from pydantic import ValidationError
 
 from markov_solver.model.markov_chain import MarkovChain
 from markov_solver.model.markov_link import MarkovLink
 from markov_solver.model.markov_state import MarkovState
-from markov_solver.parser.base import FormatParser, ParserError
+from markov_solver.parser.base import (
+    FormatParser,
+    ParserError,
+    add_rewards,
+    load_document,
+)
 from markov_solver.parser.schema import TransitionMatrixDefinition
 
 
@@ -27,10 +31,7 @@ class TransitionMatrixParser(FormatParser):
     """
 
     def parse(self, content: str) -> MarkovChain:
-        try:
-            raw_data = yaml.safe_load(content)
-        except yaml.YAMLError as e:
-            raise ParserError(f"Invalid YAML/JSON: {e}") from e
+        raw_data = load_document(content)
 
         if not raw_data:
             raise ParserError("Empty definition file")
@@ -66,6 +67,14 @@ class TransitionMatrixParser(FormatParser):
                 link = MarkovLink(head, tail, str(value))
                 mc.add_link(link)
 
+        add_rewards(
+            mc,
+            {
+                name: reward.model_dump(by_alias=True)
+                for name, reward in definition.rewards.items()
+            },
+        )
+
         return mc
 
     def supports_extension(self, extension: str) -> bool:
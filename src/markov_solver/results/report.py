@@ -3,14 +3,32 @@ Utility classes that realize reports for experiments.
 """
 
 from collections import OrderedDict
-from typing import Any, List, Optional, Tuple
+from types import TracebackType
+from typing import Any, List, Mapping, Optional, Tuple, Type
 
-from markov_solver.utils.csv_utils import save_csv
-from markov_solver.utils.file_utils import create_dir_tree, empty_file
+import numpy as np
+
+from markov_solver.results.solution import (
+    PassageTimeDistribution,
+    PassageTimeSolution,
+    SteadyStateSolution,
+)
+from markov_solver.solver.numeric import ConvergenceDiagnostics
+from markov_solver.utils.csv_utils import FLUSH_ROWS, CsvWriter, save_csv
+from markov_solver.utils.file_utils import create_dir_tree
+from markov_solver.utils.matrix_utils import states_sidecar_path, write_state_names
 
 PREC = 10
 WIDTH = 63
 PART = 4 / 6
+SUMMARY_TOP_K = 20
+SOLUTION_FORMATS = ("csv", "npz", "npy")
+
+
+def _rounded(value: float) -> float:
+    # Significant digits rather than decimals, so that the probabilities of
+    # rare states are not shown as zero.
+    return float("{:.{}g}".format(value, PREC))
 
 
 class SimpleReport(object):
@@ -55,7 +73,7 @@ class SimpleReport(object):
             ):
                 value = obj.__dict__[attr]
                 if isinstance(value, float):
-                    self.add(section_title, attr, round(value, PREC))
+                    self.add(section_title, attr, _rounded(value))
                 else:
                     self.add(section_title, attr, str(value))
 
@@ -72,7 +90,7 @@ class SimpleReport(object):
             if attr in obj.__dict__ and not callable(getattr(obj, attr)):
                 value = obj.__dict__[attr]
                 if isinstance(value, float):
-                    self.add(section_title, attr, round(value, PREC))
+                    self.add(section_title, attr, _rounded(value))
                 else:
                     self.add(section_title, attr, value)
 
@@ -100,10 +118,7 @@ class SimpleReport(object):
         """
         create_dir_tree(filename)
 
-        if empty:
-            empty_file(filename)
-
-        mode = "a+" if append else "w+"
+        mode = "a" if append and not empty else "w"
 
         with open(filename, mode) as f:
             f.write(str(self))
@@ -123,6 +138,14 @@ class SimpleReport(object):
         :param empty: (bool) if True, the file is emptied.
         :return: None
         """
+        header, row = self.csv_row()
+        save_csv(filename, header, [row], append, skip_header, empty)
+
+    def csv_row(self) -> Tuple[List[str], Tuple[str, ...]]:
+        """
+        Return the CSV header and row of the report.
+        :return: the header names and the row values.
+        """
         header = ["name"]
         row: List[str] = [self.title]
 
@@ -130,10 +153,9 @@ class SimpleReport(object):
             for p in self.params[section]:
                 header.append("{}_{}".format(section, p[0]))
                 row.append(
-                    str(round(p[1], PREC)) if isinstance(p[1], float) else str(p[1])
+                    str(_rounded(p[1])) if isinstance(p[1], float) else str(p[1])
                 )
-        data = [tuple(row)]
-        save_csv(filename, header, data, append, skip_header, empty)
+        return header, tuple(row)
 
     def __str__(self) -> str:
         """
@@ -159,7 +181,319 @@ class SimpleReport(object):
             for p in section[1]:
                 s += fmt_value.format(
                     str(p[0]),
-                    str(round(p[1], PREC)) if isinstance(p[1], float) else str(p[1]),
+                    str(_rounded(p[1])) if isinstance(p[1], float) else str(p[1]),
                 )
 
         return s
+
+
+class PassageReport(object):
+    """
+    The report of first passage times in long format, one row per starting
+    state, with a column per moment.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        solution: PassageTimeSolution,
+        distribution: Optional[PassageTimeDistribution] = None,
+    ) -> None:
+        """
+        Creates a new passage-time report.
+        :param title: (string) the title of the report.
+        :param solution: the passage times.
+        :param distribution: the distribution function of the passage times
+        at some times, if any.
+        """
+        self.title = title
+        self.solution = solution
+        self.distribution = distribution
+
+    def summary(self, top_k: Optional[int] = SUMMARY_TOP_K) -> SimpleReport:
+        """
+        Return the text summary of the passage times, limited to the first
+        states.
+        :param top_k: (int) the number of states to show; None, to show all.
+        :return: the summary report.
+        """
+        report = SimpleReport(self.title)
+        report.add("passage", "targets", ", ".join(self.solution.targets))
+        report.add("passage", "states", len(self.solution.names))
+        add_diagnostics(report, self.solution.diagnostics)
+        names = self.solution.names if top_k is None else self.solution.names[:top_k]
+        for name in names:
+            report.add("mean first passage time", name, self.solution[name])
+        if self.distribution is not None:
+            for name in names:
+                for t, p in zip(self.distribution.times, self.distribution[name]):
+                    report.add("passage time cdf", "{} t={}".format(name, t), p)
+        return report
+
+    def save_csv(
+        self, filename: str, append: bool = False, empty: bool = False
+    ) -> None:
+        """
+        Save the passage times as a tall CSV, with one index,state,moment_1,...
+        row per state, written in batches.
+        :param filename: (string) the filename.
+        :param append: (bool) if True, append to an existing file.
+        :param empty: (bool) if True, the file is emptied.
+        :return: (void)
+        """
+        moments = self.solution.moments
+        header = ["index", "state"] + [
+            "moment_{}".format(k + 1) for k in range(moments.shape[1])
+        ]
+        with CsvWriter(filename, header, append=append, empty=empty) as writer:
+            writer.write_rows(
+                (i, name, *row)
+                for i, (name, row) in enumerate(
+                    zip(self.solution.names, moments.tolist())
+                )
+            )
+
+    def save_cdf_csv(
+        self, filename: str, append: bool = False, empty: bool = False
+    ) -> None:
+        """
+        Save the distribution function of the passage times as a tall CSV,
+        with one index,state,time,probability row per state and time.
+        :param filename: (string) the filename.
+        :param append: (bool) if True, append to an existing file.
+        :param empty: (bool) if True, the file is emptied.
+        :return: (void)
+        :raise ValueError: if the report has no distribution.
+        """
+        distribution = self.distribution
+        if distribution is None:
+            raise ValueError("The report has no passage time distribution")
+        header = ["index", "state", "time", "probability"]
+        with CsvWriter(filename, header, append=append, empty=empty) as writer:
+            for i, (name, row) in enumerate(
+                zip(distribution.names, distribution.cdf.tolist())
+            ):
+                writer.write_rows(
+                    (i, name, t, p) for t, p in zip(distribution.times, row)
+                )
+
+    def __str__(self) -> str:
+        """
+        Return the string representation, limited to the first states.
+        :return: (string) the string representation.
+        """
+        return str(self.summary())
+
+
+class ReportWriter(object):
+    """
+    Writes a sequence of reports with the same parameters, e.g. the points of a
+    sweep, as the rows of a CSV file kept open across reports.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        append: bool = False,
+        empty: bool = False,
+        flush_rows: int = FLUSH_ROWS,
+    ) -> None:
+        """
+        Creates a new report writer; the file is opened by the first report.
+        :param filename: (string) the filename.
+        :param append: (bool) if True, append to an existing file.
+        :param empty: (bool) if True, the file is emptied.
+        :param flush_rows: (int) the number of rows buffered before writing.
+        """
+        self.filename = filename
+        self.append = append
+        self.empty = empty
+        self.flush_rows = flush_rows
+        self._writer: Optional[CsvWriter] = None
+
+    def write(self, report: SimpleReport) -> None:
+        """
+        Write a report as a CSV row; the first report also writes the header,
+        if the file is empty.
+        :param report: the report.
+        :return: (void)
+        """
+        header, row = report.csv_row()
+        if self._writer is None:
+            self._writer = CsvWriter(
+                self.filename,
+                header,
+                append=self.append,
+                empty=self.empty,
+                flush_rows=self.flush_rows,
+            )
+        self._writer.write_row(row)
+
+    def flush(self) -> None:
+        """
+        Write the buffered rows to the file.
+        :return: (void)
+        """
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """
+        Write the buffered rows and close the file.
+        :return: (void)
+        """
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def add_diagnostics(
+    report: SimpleReport, diagnostics: Optional[ConvergenceDiagnostics]
+) -> None:
+    """
+    Add the convergence history and timings of an iterative solver, if any,
+    to the solver section of a report.
+    :param report: the report.
+    :param diagnostics: the diagnostics, or None for direct solvers.
+    :return: (void)
+    """
+    if diagnostics is None:
+        return
+    if diagnostics.preconditioner is not None:
+        report.add("solver", "preconditioner", diagnostics.preconditioner)
+    report.add("solver", "iterations", diagnostics.iterations)
+    report.add("solver", "residual", diagnostics.residual)
+    report.add("solver", "setup time (s)", diagnostics.setup_time)
+    report.add("solver", "iteration time (s)", diagnostics.solve_time)
+
+
+class SolutionReport(object):
+    """
+    The report of a steady-state solution in long format, one row per state
+    (index, name, probability), backed by the arrays of the solution: it
+    scales to chains whose states would not fit in the columns of a report.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        solution: SteadyStateSolution,
+        measures: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        """
+        Creates a new solution report.
+        :param title: (string) the title of the report.
+        :param solution: the steady-state solution.
+        :param measures: the performance measures, by name, if any.
+        """
+        self.title = title
+        self.solution = solution
+        self.measures = dict(measures or {})
+        self.names, self.probabilities = solution.as_arrays()
+
+    def summary(
+        self, top_k: Optional[int] = SUMMARY_TOP_K, min_prob: Optional[float] = None
+    ) -> SimpleReport:
+        """
+        Return the text summary of the solution, limited to the most likely
+        states.
+        :param top_k: (int) the maximum number of states to show; None, to
+        show all.
+        :param min_prob: (float) the minimum probability of the states to
+        show, if any.
+        :return: the summary report.
+        """
+        report = SimpleReport(self.title)
+        report.add("solver", "method", self.solution.method)
+        report.add("solver", "states", len(self.names))
+        add_diagnostics(report, self.solution.diagnostics)
+        if self.solution.residual is not None:
+            report.add("solver", "precision", self.solution.precision)
+            report.add("solver", "balance residual", self.solution.residual)
+        for name, value in self.measures.items():
+            report.add("measures", name, value)
+        for name, probability in self.solution.query(top_k, min_prob).items():
+            report.add("states probability", name, probability)
+        return report
+
+    def save_csv(
+        self, filename: str, append: bool = False, empty: bool = False
+    ) -> None:
+        """
+        Save the solution as a tall CSV, with one index,state,probability row
+        per state, written in batches.
+        :param filename: (string) the filename.
+        :param append: (bool) if True, append to an existing file.
+        :param empty: (bool) if True, the file is emptied.
+        :return: (void)
+        """
+        with CsvWriter(
+            filename, ["index", "state", "probability"], append=append, empty=empty
+        ) as writer:
+            writer.write_rows(
+                zip(range(len(self.names)), self.names, self.probabilities.tolist())
+            )
+
+    def save_npz(self, filename: str) -> None:
+        """
+        Save the solution as a NumPy archive with the states, probabilities and
+        method arrays.
+        :param filename: (string) the filename.
+        :return: (void)
+        """
+        create_dir_tree(filename)
+        np.savez(
+            filename,
+            states=np.array(self.names, dtype=str),
+            probabilities=self.probabilities,
+            method=np.array(self.solution.method),
+        )
+
+    def save_npy(self, filename: str) -> None:
+        """
+        Save the probabilities as a NumPy array, with the state names in the
+        .states sidecar file, one per line.
+        :param filename: (string) the filename.
+        :return: (void)
+        """
+        create_dir_tree(filename)
+        np.save(filename, self.probabilities)
+        write_state_names(states_sidecar_path(filename), self.names)
+
+    def save(self, filename: str, format: str = "csv") -> None:
+        """
+        Save the solution in the given format.
+        :param filename: (string) the filename.
+        :param format: (string) one of "csv", "npz" or "npy".
+        :return: (void)
+        :raise ValueError: if the format is not supported.
+        """
+        if format == "csv":
+            self.save_csv(filename, empty=True)
+        elif format == "npz":
+            self.save_npz(filename)
+        elif format == "npy":
+            self.save_npy(filename)
+        else:
+            raise ValueError(
+                "Unknown solution format: {}. Supported: {}".format(
+                    format, ", ".join(SOLUTION_FORMATS)
+                )
+            )
+
+    def __str__(self) -> str:
+        """
+        Return the string representation, limited to the most likely states.
+        :return: (string) the string representation.
+        """
+        return str(self.summary())
@@ -0,0 +1,188 @@
+"""
+Solutions computed by the Markov chain solvers.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from markov_solver.solver.numeric import ConvergenceDiagnostics
+
+
+class SteadyStateSolution(Dict[str, Any]):
+    """
+    The steady-state probabilities of a Markov chain, keyed by state name,
+    along with the method that computed them and their accuracy.
+    """
+
+    def __init__(
+        self,
+        probabilities: Mapping[str, Any],
+        method: str,
+        vector: Optional[np.ndarray] = None,
+        diagnostics: Optional[ConvergenceDiagnostics] = None,
+        residual: Optional[float] = None,
+    ) -> None:
+        """
+        Creates a new solution.
+        :param probabilities: the probability of each state, by state name.
+        :param method: (string) the method used to solve the chain.
+        :param vector: (numpy.ndarray) the probabilities as floats, following
+        the order of the states, if already available, in the precision of
+        the solver: the probabilities by name are float64.
+        :param diagnostics: the convergence history of iterative methods.
+        :param residual: (float) the residual of the balance equations, as
+        the 1-norm of x Q scaled by the largest exit rate, for numeric
+        methods.
+        """
+        super().__init__(probabilities)
+        self.method = method
+        self.diagnostics = diagnostics
+        self.residual = residual
+        self._vector = vector
+
+    @property
+    def precision(self) -> str:
+        """
+        Return the precision of the probability vector.
+        :return: (string) "longdouble" or "float64".
+        """
+        vector = self._vector
+        if vector is not None and vector.dtype == np.longdouble:
+            return "longdouble"
+        return "float64"
+
+    def as_arrays(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Return the state names and their probabilities as a float vector, in
+        the precision of the solver.
+        :return: the state names and the probabilities, in the same order.
+        """
+        if self._vector is None or len(self._vector) != len(self):
+            self._vector = np.fromiter(
+                (float(value) for value in self.values()), dtype=float, count=len(self)
+            )
+        return list(self), self._vector
+
+    def query(
+        self, top_k: Optional[int] = None, min_prob: Optional[float] = None
+    ) -> "SteadyStateSolution":
+        """
+        Select the most likely states, without sorting the whole solution.
+        :param top_k: (int) the maximum number of states, if any.
+        :param min_prob: (float) the minimum probability of the states, if any.
+        :return: the solution restricted to the selected states, by
+        decreasing probability.
+        """
+        names, vector = self.as_arrays()
+        if min_prob is None:
+            candidates = np.arange(len(vector))
+        else:
+            candidates = np.flatnonzero(vector >= min_prob)
+        if top_k is not None and top_k < len(candidates):
+            best = np.argpartition(-vector[candidates], top_k)[:top_k]
+            candidates = candidates[best]
+        order = candidates[np.argsort(-vector[candidates], kind="stable")]
+        return SteadyStateSolution(
+            {names[i]: self[names[i]] for i in order.tolist()},
+            self.method,
+            vector[order],
+            self.diagnostics,
+            self.residual,
+        )
+
+    def top_k(self, k: int) -> "SteadyStateSolution":
+        """
+        Select the k most likely states.
+        :param k: (int) the number of states.
+        :return: the solution restricted to the selected states, by
+        decreasing probability.
+        """
+        return self.query(top_k=k)
+
+    def above(self, min_prob: float) -> "SteadyStateSolution":
+        """
+        Select the states whose probability is at least min_prob.
+        :param min_prob: (float) the minimum probability.
+        :return: the solution restricted to the selected states, by
+        decreasing probability.
+        """
+        return self.query(min_prob=min_prob)
+
+
+class PassageTimeSolution(Dict[str, float]):
+    """
+    The mean first passage times to a set of target states, keyed by the
+    name of the starting state, along with their higher moments.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        targets: List[str],
+        moments: np.ndarray,
+        diagnostics: Optional[ConvergenceDiagnostics] = None,
+    ) -> None:
+        """
+        Creates a new solution.
+        :param names: (list(string)) the state names.
+        :param targets: (list(string)) the names of the target states.
+        :param moments: (numpy.ndarray) the n x k matrix of the moments of the
+        passage times, following the names: column j holds the (j+1)-th moment.
+        :param diagnostics: the convergence history of iterative solvers.
+        """
+        super().__init__(zip(names, moments[:, 0].tolist()))
+        self.names = names
+        self.targets = targets
+        self.moments = moments
+        self.diagnostics = diagnostics
+
+    def moment(self, k: int) -> Dict[str, float]:
+        """
+        Return the k-th moment of the passage times.
+        :param k: (int) the order of the moment, starting from 1.
+        :return: the moments, by state name.
+        """
+        return dict(zip(self.names, self.moments[:, k - 1].tolist()))
+
+    def variance(self) -> Dict[str, float]:
+        """
+        Return the variance of the passage times, if the second moment was
+        computed.
+        :return: the variances, by state name.
+        :raise ValueError: if the second moment was not computed.
+        """
+        if self.moments.shape[1] < 2:
+            raise ValueError("The variance requires the second moment")
+        with np.errstate(invalid="ignore"):
+            variances = self.moments[:, 1] - self.moments[:, 0] ** 2
+        return dict(zip(self.names, variances.tolist()))
+
+
+class PassageTimeDistribution(Dict[str, List[float]]):
+    """
+    The distribution function of the first passage time to a set of target
+    states, P(T <= t) at the given times, keyed by the name of the starting
+    state.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        targets: List[str],
+        times: List[float],
+        cdf: np.ndarray,
+    ) -> None:
+        """
+        Creates a new distribution.
+        :param names: (list(string)) the state names.
+        :param targets: (list(string)) the names of the target states.
+        :param times: (list(float)) the times.
+        :param cdf: (numpy.ndarray) the n x len(times) matrix of the
+        probabilities, following the names and the times.
+        """
+        super().__init__(zip(names, cdf.tolist()))
+        self.names = names
+        self.targets = targets
+        self.times = times
+        self.cdf = cdf
@@ -0,0 +1,183 @@
+"""
+Iterative aggregation-disaggregation (IAD) steady-state solver, for nearly
+completely decomposable chains.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse  # type: ignore
+
+from markov_solver.solver.numeric import (
+    ConvergenceDiagnostics,
+    Factorization,
+    SolverError,
+    factorize,
+    residual_norm,
+)
+
+IAD_TOLERANCE = 1e-10
+IAD_MAX_ITERATIONS = 1000
+
+
+def partition_labels(blocks: Sequence[Any]) -> np.ndarray:
+    """
+    Number the blocks of a partition, given the block of every state.
+    :param blocks: the block key of each state, in any hashable form.
+    :return: (numpy.ndarray) the block index of each state, from 0, in order
+    of first appearance.
+    """
+    numbers: Dict[Any, int] = {}
+    return np.fromiter(
+        (numbers.setdefault(block, len(numbers)) for block in blocks),
+        dtype=np.int64,
+        count=len(blocks),
+    )
+
+
+class AggregationSolver:
+    """
+    Iterative aggregation-disaggregation solver, in the variant of Koury,
+    McAllister and Stewart. Every iteration aggregates the chain into the
+    coupling chain of the blocks, weighting each state by its probability
+    within its block, solves it, scales the block distributions by the
+    coupling probabilities, and then improves them with a block Gauss-Seidel
+    sweep, solving each diagonal block with its sparse LU factorization.
+    It converges in few iterations on nearly completely decomposable chains,
+    whose blocks are strongly connected inside and weakly coupled, where
+    point iterative methods stall.
+    """
+
+    def __init__(
+        self,
+        tolerance: float = IAD_TOLERANCE,
+        max_iterations: int = IAD_MAX_ITERATIONS,
+    ) -> None:
+        """
+        Creates a new solver.
+        :param tolerance: (float) the scaled residual norm to reach, and the
+        relative change of the iterate below which it has settled.
+        :param max_iterations: (int) the maximum number of iterations.
+        """
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.diagnostics: Optional[ConvergenceDiagnostics] = None
+
+    def solve(self, generator: Any, labels: np.ndarray) -> np.ndarray:
+        """
+        Solve the steady-state distribution. The convergence history is left
+        in the diagnostics attribute, also when the solver does not converge.
+        :param generator: (sparse matrix) the n x n generator matrix Q.
+        :param labels: (numpy.ndarray) the block index of each state, from 0.
+        :return: (numpy.ndarray) the steady-state probabilities.
+        :raise ValueError: if the partition does not match the chain.
+        :raise SolverError: if the chain has no unique steady-state
+        distribution or the solver does not converge.
+        """
+        n = generator.shape[0]
+        labels = np.asarray(labels, dtype=np.int64)
+        if labels.shape != (n,):
+            raise ValueError("Expected a block for each of the {} states".format(n))
+        if n == 0:
+            self.diagnostics = ConvergenceDiagnostics(0, [], [], True)
+            return np.zeros(0)
+        count = int(labels.max()) + 1
+        if labels.min() < 0 or len(np.unique(labels)) != count:
+            raise ValueError("Blocks must be numbered from 0 without gaps")
+        if count < 2:
+            raise ValueError("The partition must have at least two blocks")
+
+        start = time.perf_counter()
+        # Make the blocks contiguous.
+        order = np.argsort(labels, kind="stable")
+        q = sparse.csr_matrix(generator)[order][:, order]
+        bounds = np.searchsorted(labels[order], np.arange(count + 1))
+        blocks = [slice(bounds[i], bounds[i + 1]) for i in range(count)]
+        transposed = sparse.csr_matrix(q.T)
+        indicator = sparse.csr_matrix(
+            (np.ones(n), (np.arange(n), labels[order])), shape=(n, count)
+        )
+        outflows = sparse.csr_matrix(q @ indicator)
+        factors = [self.__factorize(transposed, block) for block in blocks]
+
+        setup_time = time.perf_counter() - start
+        x = np.full(n, 1.0 / n)
+        residuals: List[float] = []
+        changes: List[float] = []
+        converged = False
+        for _ in range(self.max_iterations):
+            previous = x
+            x = self.__disaggregate(x, indicator, outflows)
+            for block, (diagonal, lu) in zip(blocks, factors):
+                inflow = transposed[block] @ x - diagonal @ x[block]
+                x[block] = np.maximum(lu.solve(inflow), 0.0)
+            total = x.sum()
+            if not np.isfinite(total) or total <= 0.0:
+                raise SolverError("The chain has no unique steady-state distribution")
+            x /= total
+            residuals.append(residual_norm(q, x))
+            # On nearly decomposable chains a small residual does not imply a
+            # small error, so the iterates must also have settled: either
+            # below the tolerance, or at the rounding noise of the coupling
+            # solve, which grows as the coupling weakens, once the change
+            # stops decreasing.
+            changes.append(float(np.abs(x - previous).max() / x.max()))
+            settled = changes[-1] <= self.tolerance or (
+                len(changes) > 1 and changes[-1] >= changes[-2]
+            )
+            if residuals[-1] <= self.tolerance and settled:
+                converged = True
+                break
+
+        self.diagnostics = ConvergenceDiagnostics(
+            len(residuals),
+            residuals,
+            changes,
+            converged,
+            setup_time,
+            time.perf_counter() - start - setup_time,
+        )
+        if not converged:
+            raise SolverError(
+                "Aggregation-disaggregation did not converge in {} iterations "
+                "(residual {:.3e}, change {:.3e})".format(
+                    len(residuals), residuals[-1], changes[-1]
+                )
+            )
+        solution = np.empty(n)
+        solution[order] = x
+        return solution
+
+    @staticmethod
+    def __factorize(transposed: Any, block: slice) -> Tuple[Any, Factorization]:
+        diagonal = sparse.csr_matrix(transposed[block][:, block])
+        try:
+            lu = factorize(-diagonal)
+        except RuntimeError as e:
+            raise SolverError(
+                "The chain has no unique steady-state distribution: "
+                "a block has no transitions out of it"
+            ) from e
+        return diagonal, lu
+
+    @staticmethod
+    def __disaggregate(x: np.ndarray, indicator: Any, outflows: Any) -> np.ndarray:
+        # Coupling generator: C[I, J] = sum over i in I of phi_i Q[i, J], with
+        # phi the distribution of x within each block.
+        labels = indicator.indices
+        masses = indicator.T @ x
+        phi = np.divide(x, masses[labels], out=np.zeros_like(x), where=x > 0)
+        coupling = (indicator.T @ sparse.diags(phi) @ outflows).toarray()
+        # Solve xi C = 0 with the last equation replaced by sum(xi) = 1.
+        system = coupling.T
+        system[-1, :] = 1.0
+        rhs = np.zeros(len(system))
+        rhs[-1] = 1.0
+        try:
+            xi = np.maximum(np.linalg.solve(system, rhs), 0.0)
+        except np.linalg.LinAlgError as e:
+            raise SolverError(
+                "The chain has no unique steady-state distribution"
+            ) from e
+        return np.asarray(phi * xi[labels], dtype=float)
@@ -0,0 +1,387 @@
+"""
+Preconditioned Krylov (GMRES, BiCGSTAB) solvers for the sparse and
+matrix-free systems of the steady-state and passage-time solvers.
+"""
+
+import time
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+from scipy import sparse  # type: ignore
+from scipy.sparse import csgraph  # type: ignore
+from scipy.sparse.linalg import LinearOperator, bicgstab, gmres, spilu  # type: ignore
+
+from markov_solver.solver.numeric import (
+    ConvergenceDiagnostics,
+    Factorization,
+    SolverError,
+    dominant_state,
+    factorize,
+    precision_dtype,
+    reference_state,
+    refine,
+    steady_state_system,
+)
+
+KRYLOV_METHODS = ("gmres", "bicgstab")
+PRECONDITIONERS = ("none", "jacobi", "ilu0", "ilut", "block-jacobi")
+# The preconditioners that only need the diagonal of the system, and so
+# work on matrix-free systems.
+MATRIX_FREE_PRECONDITIONERS = ("none", "jacobi")
+KRYLOV_TOLERANCE = 1e-10
+KRYLOV_MAX_ITERATIONS = 1000
+GMRES_RESTART = 50
+ILUT_DROP_TOLERANCE = 1e-4
+ILUT_FILL_FACTOR = 10.0
+
+
+def strong_components(system: Any) -> np.ndarray:
+    """
+    Label the strongly connected components of the graph of a system.
+    :param system: (sparse matrix) the n x n system.
+    :return: (numpy.ndarray) the component index of each row, from 0.
+    """
+    _, labels = csgraph.connected_components(
+        sparse.csr_matrix(system), directed=True, connection="strong"
+    )
+    return np.asarray(labels, dtype=np.int64)
+
+
+class BlockJacobi:
+    """
+    Block-Jacobi preconditioner: the inverse of the block diagonal of the
+    system, applied with the sparse LU factorization of each block.
+    """
+
+    def __init__(self, system: Any, labels: np.ndarray) -> None:
+        """
+        Factorize the diagonal blocks.
+        :param system: (sparse matrix) the n x n system.
+        :param labels: (numpy.ndarray) the block index of each row.
+        :raise SolverError: if a diagonal block is singular.
+        """
+        system = sparse.csr_matrix(system)
+        self.blocks: List[np.ndarray] = []
+        self.factors: List[Factorization] = []
+        for label in np.unique(labels):
+            rows = np.flatnonzero(labels == label)
+            try:
+                lu = factorize(system[rows][:, rows])
+            except RuntimeError as e:
+                raise SolverError("A diagonal block of the system is singular") from e
+            self.blocks.append(rows)
+            self.factors.append(lu)
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """
+        Apply the preconditioner.
+        :param rhs: (numpy.ndarray) the vector.
+        :return: (numpy.ndarray) the block diagonal solve of the vector.
+        """
+        result = np.empty(len(rhs))
+        for rows, lu in zip(self.blocks, self.factors):
+            result[rows] = lu.solve(rhs[rows])
+        return result
+
+
+class PreconditionedSystem:
+    """
+    A system with its preconditioner, solved by the Krylov method of the
+    solver for any number of right-hand sides, like a Factorization.
+    """
+
+    def __init__(self, system: Any, solver: "KrylovSolver", operator: Any) -> None:
+        self.system = system
+        self.solver = solver
+        self.operator = operator
+
+    def solve(self, rhs: np.ndarray, guess: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Solve the system. The diagnostics of the solver accumulate the
+        iterations and the time of every solve.
+        :param rhs: (numpy.ndarray) the right-hand side.
+        :param guess: (numpy.ndarray) the initial guess of BiCGSTAB, which
+        breaks down on some systems starting from zero; GMRES always starts
+        from zero.
+        :return: (numpy.ndarray) the solution.
+        :raise SolverError: if the solver does not converge.
+        """
+        solver = self.solver
+        residuals: List[float] = []
+        start = time.perf_counter()
+        if solver.method == "gmres":
+            x, info = gmres(
+                self.system,
+                rhs,
+                rtol=solver.tolerance,
+                atol=0.0,
+                restart=solver.restart,
+                maxiter=solver.max_iterations,
+                M=self.operator,
+                callback=residuals.append,
+                callback_type="pr_norm",
+            )
+        else:
+            # BiCGSTAB does not report the residuals of its iterations: only
+            # the last one is computed, at the cost of a product.
+            x, info = bicgstab(
+                self.system,
+                rhs,
+                rtol=solver.tolerance,
+                atol=0.0,
+                maxiter=solver.max_iterations * solver.restart,
+                x0=guess,
+                M=self.operator,
+                callback=lambda _: residuals.append(np.nan),
+            )
+            if residuals:
+                residuals[-1] = float(
+                    np.linalg.norm(rhs - self.system @ x) / np.linalg.norm(rhs)
+                )
+        elapsed = time.perf_counter() - start
+        previous = solver.diagnostics or ConvergenceDiagnostics(0, [], [], False)
+        solver.diagnostics = previous._replace(
+            iterations=previous.iterations + len(residuals),
+            residuals=previous.residuals + residuals,
+            converged=info == 0,
+            solve_time=previous.solve_time + elapsed,
+        )
+        if info != 0:
+            raise SolverError(
+                "{} with {} preconditioner did not converge in {} "
+                "iterations".format(
+                    "GMRES" if solver.method == "gmres" else "BiCGSTAB",
+                    solver.preconditioner,
+                    len(residuals),
+                )
+            )
+        return np.asarray(x, dtype=float)
+
+
+class KrylovSolver:
+    """
+    Restarted GMRES, or BiCGSTAB, with a configurable preconditioner:
+    - none: no preconditioner.
+    - jacobi: the inverse of the diagonal of the system.
+    - ilu0: incomplete LU whose fill is capped at the nonzeros of the system.
+    - ilut: incomplete LU with a drop tolerance (ILUT).
+    - block-jacobi: exact solves of the diagonal blocks of a partition of
+    the states, by default the strongly connected components of the system.
+    BiCGSTAB keeps a fixed number of vectors, instead of the restart + 1 of
+    GMRES, and converges on large nonsymmetric systems where restarted GMRES
+    stalls, e.g. matrix-free descriptors with the jacobi preconditioner.
+    """
+
+    def __init__(
+        self,
+        preconditioner: str = "ilu0",
+        tolerance: float = KRYLOV_TOLERANCE,
+        max_iterations: int = KRYLOV_MAX_ITERATIONS,
+        restart: int = GMRES_RESTART,
+        labels: Optional[np.ndarray] = None,
+        method: str = "gmres",
+    ) -> None:
+        """
+        Creates a new solver.
+        :param preconditioner: (string) one of PRECONDITIONERS.
+        :param tolerance: (float) the relative residual norm to reach.
+        :param max_iterations: (int) the maximum number of restart cycles;
+        BiCGSTAB, which does not restart, runs at most max_iterations times
+        restart iterations.
+        :param restart: (int) the number of iterations between restarts.
+        :param labels: (numpy.ndarray) the block index of each state, for the
+        block-jacobi preconditioner, if any.
+        :param method: (string) the Krylov method, one of KRYLOV_METHODS.
+        :raise ValueError: if the preconditioner or the method is unknown.
+        """
+        if preconditioner not in PRECONDITIONERS:
+            raise ValueError(
+                "Unknown preconditioner: {}. Supported: {}".format(
+                    preconditioner, ", ".join(PRECONDITIONERS)
+                )
+            )
+        if method not in KRYLOV_METHODS:
+            raise ValueError(
+                "Unknown Krylov method: {}. Supported: {}".format(
+                    method, ", ".join(KRYLOV_METHODS)
+                )
+            )
+        self.method = method
+        self.preconditioner = preconditioner
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.restart = restart
+        self.labels = labels
+        self.diagnostics: Optional[ConvergenceDiagnostics] = None
+
+    def factorize(
+        self,
+        system: Any,
+        rows: Optional[np.ndarray] = None,
+        diagonal: Optional[np.ndarray] = None,
+    ) -> PreconditionedSystem:
+        """
+        Build the preconditioner of a system, resetting the diagnostics.
+        :param system: (sparse matrix or scipy LinearOperator) the n x n
+        system; matrix-free systems support the MATRIX_FREE_PRECONDITIONERS.
+        :param rows: (numpy.ndarray) the states of the rows of the system, if
+        it is a subsystem, to select the block labels.
+        :param diagonal: (numpy.ndarray) the diagonal of the system, required
+        by the jacobi preconditioner on matrix-free systems.
+        :return: the preconditioned system.
+        :raise ValueError: if the preconditioner needs the entries of a
+        matrix-free system.
+        :raise SolverError: if the preconditioner cannot be built.
+        """
+        if sparse.issparse(system):
+            system = sparse.csc_matrix(system)
+        elif self.preconditioner not in MATRIX_FREE_PRECONDITIONERS:
+            raise ValueError(
+                "The {} preconditioner needs the matrix of the system".format(
+                    self.preconditioner
+                )
+            )
+        start = time.perf_counter()
+        operator = self.__preconditioner(system, rows, diagonal)
+        self.diagnostics = ConvergenceDiagnostics(
+            0,
+            [],
+            [],
+            False,
+            setup_time=time.perf_counter() - start,
+            preconditioner=self.preconditioner,
+        )
+        return PreconditionedSystem(system, self, operator)
+
+    def __preconditioner(
+        self, system: Any, rows: Optional[np.ndarray], diagonal: Optional[np.ndarray]
+    ) -> Any:
+        n = system.shape[0]
+        if self.preconditioner == "none":
+            return None
+        if self.preconditioner == "jacobi":
+            if diagonal is None:
+                if not sparse.issparse(system):
+                    raise ValueError("The jacobi preconditioner needs the diagonal")
+                diagonal = system.diagonal()
+            inverse = np.asarray(diagonal, dtype=float)
+            if np.any(inverse == 0.0):
+                raise SolverError("The diagonal of the system has zero entries")
+            inverse = 1.0 / inverse
+            return LinearOperator((n, n), lambda v: inverse * np.ravel(v))
+        if self.preconditioner == "block-jacobi":
+            if self.labels is None:
+                labels = strong_components(system)
+            else:
+                labels = self.labels if rows is None else self.labels[rows]
+            if len(labels) != n:
+                raise ValueError("Expected a block for each of the {} states".format(n))
+            return LinearOperator((n, n), BlockJacobi(system, labels).solve)
+        if self.preconditioner == "ilu0":
+            options = dict(drop_tol=0.0, fill_factor=1.0)
+        else:
+            options = dict(drop_tol=ILUT_DROP_TOLERANCE, fill_factor=ILUT_FILL_FACTOR)
+        try:
+            ilu = spilu(system, **options)
+        except RuntimeError as e:
+            raise SolverError("Incomplete LU factorization failed: {}".format(e)) from e
+        return LinearOperator((n, n), ilu.solve)
+
+
+def steady_state_guess(shift: float, n: int) -> np.ndarray:
+    """
+    Return the initial guess of the steady-state systems: the solution for
+    the uniform distribution, 1 / shift for every state. Starting from zero,
+    the residual is the unit vector of the reference state, on which
+    BiCGSTAB breaks down when no 2-cycle passes through the state.
+    :param shift: (float) the shift of the reference state.
+    :param n: (int) the number of states.
+    :return: (numpy.ndarray) the guess.
+    """
+    return np.full(n, 1.0 / shift)
+
+
+def solve_steady_state_krylov(
+    generator: Any,
+    solver: KrylovSolver,
+    refinement_steps: int = 0,
+    precision: str = "float64",
+) -> np.ndarray:
+    """
+    Solve the steady-state distribution with a preconditioned Krylov solver,
+    on the same nonsingular system as the direct solver. Every refinement
+    step solves for the correction with the Krylov method again.
+    :param generator: (sparse matrix) the n x n generator matrix Q.
+    :param solver: the Krylov solver.
+    :param refinement_steps: (int) the number of iterative refinement steps.
+    :param precision: (string) the precision of the solution, one of
+    PRECISIONS of the numeric solver.
+    :return: (numpy.ndarray) the steady-state probabilities.
+    :raise ValueError: if the precision is unknown.
+    :raise SolverError: if the chain has no unique steady-state distribution
+    or the solver does not converge.
+    """
+    dtype = precision_dtype(precision)
+    generator = sparse.csr_matrix(generator)
+    if generator.shape[0] == 0:
+        return np.zeros(0, dtype=dtype)
+    shift = float(np.max(-generator.diagonal(), initial=0.0)) or 1.0
+    system, rhs = steady_state_system(generator, reference_state(generator), shift)
+    preconditioned = solver.factorize(system)
+    guess = steady_state_guess(shift, generator.shape[0])
+    solution = preconditioned.solve(rhs, guess).astype(dtype)
+    if refinement_steps > 0:
+        solution = refine(system, rhs, solution, preconditioned.solve, refinement_steps)
+    total = solution.sum()
+    if not np.isfinite(total) or total <= 0.0:
+        raise SolverError("The chain has no unique steady-state distribution")
+    return np.asarray(solution / total, dtype=dtype)
+
+
+def solve_steady_state_operator(
+    product: Callable[[np.ndarray], np.ndarray],
+    diagonal: np.ndarray,
+    solver: KrylovSolver,
+) -> np.ndarray:
+    """
+    Solve the steady-state distribution of a chain whose generator is only
+    available through its vector products, e.g. a Kronecker descriptor, with
+    a preconditioned Krylov solver on the system of the direct solver, with
+    the normalization added to the row of the reference state.
+    :param product: the function returning the product x Q of a vector.
+    :param diagonal: (numpy.ndarray) the diagonal of the generator matrix Q.
+    :param solver: the Krylov solver, with a matrix-free preconditioner.
+    :return: (numpy.ndarray) the steady-state probabilities.
+    :raise ValueError: if the preconditioner needs the generator matrix.
+    :raise SolverError: if the chain has no unique steady-state distribution
+    or the solver does not converge.
+    """
+    n = len(diagonal)
+    if n == 0:
+        return np.zeros(0)
+    shift = float(np.max(-diagonal, initial=0.0)) or 1.0
+    # The closed class of the chain is not known without its graph, and
+    # pinning a transient state makes -Q^T + s e_r e_r^T singular: the mean
+    # of x is added to the row of the reference state instead,
+    # -Q^T + s e_r 1^T / n, which is nonsingular for any state of a chain
+    # with a single closed class.
+    reference = dominant_state(product, diagonal)
+
+    def matvec(v: np.ndarray) -> np.ndarray:
+        v = np.ravel(v)
+        result = -product(v)
+        result[reference] += shift * v.mean()
+        return result
+
+    system_diagonal = -np.asarray(diagonal, dtype=float)
+    system_diagonal[reference] += shift / n
+    rhs = np.zeros(n)
+    rhs[reference] = 1.0
+    system = LinearOperator((n, n), matvec=matvec, dtype=float)
+    solution = solver.factorize(system, diagonal=system_diagonal).solve(
+        rhs, steady_state_guess(shift, n)
+    )
+    total = solution.sum()
+    if not np.isfinite(total) or total <= 0.0:
+        raise SolverError("The chain has no unique steady-state distribution")
+    return np.asarray(solution / total, dtype=float)
@@ -0,0 +1,569 @@
+"""
+Numeric steady-state solvers working on sparse generator matrices.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+from scipy import sparse  # type: ignore
+from scipy.sparse import csgraph  # type: ignore
+from scipy.sparse.linalg import splu  # type: ignore
+
+from markov_solver.utils.shared_memory import (
+    ArrayHandle,
+    GeneratorHandle,
+    MatrixHandle,
+    attach_array,
+    attach_matrix,
+    detach,
+)
+
+MAX_UPDATE_RANK = 32
+REFERENCE_ITERATIONS = 20
+FACTORIZATION_CACHE_SIZE = 16
+# Floating point types of the solution vectors: longdouble is the extended
+# precision of the platform, e.g. 80-bit on x86.
+PRECISIONS = ("float64", "longdouble")
+LU_OPTIONS: Dict[str, Any] = dict(
+    permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0, options=dict(SymmetricMode=True)
+)
+
+
+class SolverError(Exception):
+    """Raised when a numeric solver cannot compute a solution."""
+
+
+class SymbolicAnalysis(NamedTuple):
+    """The reusable symbolic analysis of a sparse system."""
+
+    ordering: np.ndarray  # fill-reducing symmetric permutation
+    data_map: np.ndarray  # positions of the permuted entries in the system data
+    indices: np.ndarray  # row indices of the permuted CSC system
+    indptr: np.ndarray  # column pointers of the permuted CSC system
+
+
+class ConvergenceDiagnostics(NamedTuple):
+    """The convergence history and timings of an iterative solver."""
+
+    iterations: int
+    residuals: List[float]  # residual norm after each iteration
+    changes: List[float]  # relative change of the iterate at each iteration
+    converged: bool
+    setup_time: float = 0.0  # seconds spent before iterating
+    solve_time: float = 0.0  # seconds spent iterating
+    preconditioner: Optional[str] = None
+
+    @property
+    def residual(self) -> float:
+        return self.residuals[-1] if self.residuals else 0.0
+
+
+class FactorizationCacheInfo(NamedTuple):
+    """Usage statistics of a factorization cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class FactorizationCache:
+    """
+    LRU cache of the symbolic analysis of steady-state systems, keyed by the
+    hash of their sparsity structure: chains whose links connect the same
+    states share it, whatever the link values, so repeated solves and sweeps
+    skip the fill-reducing ordering.
+    """
+
+    def __init__(self, maxsize: int = FACTORIZATION_CACHE_SIZE) -> None:
+        """
+        Creates a new cache.
+        :param maxsize: (int) the maximum number of cached analyses.
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, SymbolicAnalysis] = OrderedDict()
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[SymbolicAnalysis]:
+        """
+        Retrieve the analysis of a structure, marking it as recently used.
+        :param key: (string) the structure hash.
+        :return: the analysis, if cached; None, otherwise.
+        """
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return analysis
+
+    def put(self, key: str, analysis: SymbolicAnalysis) -> None:
+        """
+        Store the analysis of a structure, evicting the least recently used.
+        :param key: (string) the structure hash.
+        :param analysis: the analysis.
+        :return: (void)
+        """
+        with self._lock:
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def info(self) -> FactorizationCacheInfo:
+        """
+        Return the cache statistics.
+        :return: the hits, misses, evictions, maximum and current size.
+        """
+        with self._lock:
+            return FactorizationCacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                len(self._entries),
+            )
+
+    def clear(self) -> None:
+        """
+        Drop all the cached analyses and reset the statistics.
+        :return: (void)
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+default_factorization_cache = FactorizationCache()
+
+
+class Factorization:
+    """
+    The LU factorization of a sparse system, possibly computed on a
+    symmetrically permuted copy of it.
+    """
+
+    def __init__(self, lu: Any, ordering: Optional[np.ndarray] = None) -> None:
+        self.lu = lu
+        self.ordering = ordering
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """
+        Solve the system for one (n) or more (n x k) right-hand sides.
+        :param rhs: (numpy.ndarray) the right-hand side.
+        :return: (numpy.ndarray) the solution.
+        """
+        if self.ordering is None:
+            return np.asarray(self.lu.solve(rhs), dtype=float)
+        solution = np.empty(rhs.shape)
+        solution[self.ordering] = self.lu.solve(rhs[self.ordering])
+        return solution
+
+
+def structure_hash(matrix: Any) -> str:
+    """
+    Hash the sparsity structure of a CSC/CSR matrix, ignoring its values.
+    :param matrix: (sparse matrix) the matrix, in canonical format.
+    :return: (string) the structure hash.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(matrix.shape, dtype=np.int64).tobytes())
+    digest.update(np.asarray(matrix.indptr, dtype=np.int64).tobytes())
+    digest.update(np.asarray(matrix.indices, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def factorize(system: Any, cache: Optional[FactorizationCache] = None) -> Factorization:
+    """
+    Compute the LU factorization of a steady-state system, reusing the
+    symbolic analysis cached for its structure, if any.
+    :param system: (sparse matrix) the CSC system.
+    :param cache: the cache of symbolic analyses, if any.
+    :return: the factorization.
+    :raise RuntimeError: if the system is singular.
+    """
+    system = sparse.csc_matrix(system)
+    system.sum_duplicates()
+    if cache is None:
+        return Factorization(splu(system, **LU_OPTIONS))
+
+    key = structure_hash(system)
+    analysis = cache.get(key)
+    if analysis is not None:
+        permuted = sparse.csc_matrix(
+            (system.data[analysis.data_map], analysis.indices, analysis.indptr),
+            shape=system.shape,
+        )
+        lu = splu(
+            permuted,
+            permc_spec="NATURAL",
+            diag_pivot_thresh=LU_OPTIONS["diag_pivot_thresh"],
+            options=LU_OPTIONS["options"],
+        )
+        return Factorization(lu, analysis.ordering)
+
+    lu = splu(system, **LU_OPTIONS)
+    ordering = np.argsort(lu.perm_c)
+    positions = sparse.csc_matrix(
+        (np.arange(1, system.nnz + 1, dtype=float), system.indices, system.indptr),
+        shape=system.shape,
+    )
+    positions = sparse.csc_matrix(positions[ordering][:, ordering])
+    positions.sort_indices()
+    cache.put(
+        key,
+        SymbolicAnalysis(
+            ordering,
+            positions.data.astype(np.int64) - 1,
+            positions.indices,
+            positions.indptr,
+        ),
+    )
+    return Factorization(lu)
+
+
+def precision_dtype(precision: str) -> Any:
+    """
+    Return the NumPy type of a precision.
+    :param precision: (string) one of PRECISIONS.
+    :return: (numpy.dtype) the floating point type.
+    :raise ValueError: if the precision is unknown.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(
+            "Unknown precision: {}. Supported: {}".format(
+                precision, ", ".join(PRECISIONS)
+            )
+        )
+    return np.dtype(np.float64 if precision == "float64" else np.longdouble)
+
+
+def residual_norm(generator: Any, x: np.ndarray) -> float:
+    """
+    Compute the residual of a probability vector, as the 1-norm of x Q scaled
+    by the largest exit rate, i.e. the residual of the uniformized chain. The
+    product is accumulated in the precision of x.
+    :param generator: (sparse matrix) the n x n generator matrix Q.
+    :param x: (numpy.ndarray) the probability vector.
+    :return: (float) the scaled residual.
+    """
+    scale = float(np.max(-generator.diagonal(), initial=0.0)) or 1.0
+    transposed = sparse.csr_matrix(generator.T, dtype=x.dtype)
+    return float(np.abs(transposed @ x).sum()) / scale
+
+
+def refine(
+    system: Any,
+    rhs: np.ndarray,
+    x: np.ndarray,
+    solve: Callable[[np.ndarray], np.ndarray],
+    steps: int,
+) -> np.ndarray:
+    """
+    Improve the solution of A x = b by iterative refinement: every step
+    computes the residual r = b - A x in the precision of x and adds the
+    correction solving A d = r with the given solver, in float64. With an
+    extended precision x, the refined solution is accurate beyond the
+    precision of the factorization.
+    :param system: (sparse matrix) the n x n system A.
+    :param rhs: (numpy.ndarray) the right-hand side b.
+    :param x: (numpy.ndarray) the solution to improve.
+    :param solve: the function solving the system for a right-hand side,
+    e.g. the solve method of a Factorization.
+    :param steps: (int) the number of refinement steps.
+    :return: (numpy.ndarray) the refined solution, in the precision of x.
+    """
+    system = sparse.csr_matrix(system, dtype=x.dtype)
+    rhs = rhs.astype(x.dtype)
+    for _ in range(steps):
+        residual = rhs - system @ x
+        x = x + solve(residual.astype(np.float64))
+    return x
+
+
+def closed_classes(graph: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the closed classes of a chain: the strongly connected components of
+    its graph that no edge leaves. A chain has a unique steady-state
+    distribution if it has a single closed class, and only the states of
+    this class have positive probability.
+    :param graph: (sparse matrix) the n x n matrix of the edges, e.g. the
+    positive rates.
+    :return: the component of each state, and the indices of the closed
+    components.
+    """
+    _, labels = csgraph.connected_components(graph, directed=True, connection="strong")
+    coo = sparse.coo_matrix(graph)
+    leaving = labels[coo.row] != labels[coo.col]
+    closed = np.ones(int(labels.max(initial=-1)) + 1, dtype=bool)
+    closed[labels[coo.row[leaving]]] = False
+    return labels, np.flatnonzero(closed)
+
+
+def dominant_state(
+    product: Callable[[np.ndarray], np.ndarray],
+    diagonal: np.ndarray,
+    candidates: Optional[np.ndarray] = None,
+    iterations: int = REFERENCE_ITERATIONS,
+) -> int:
+    """
+    Pick a state likely to have a large steady-state probability, by running
+    a few power iterations of the uniformized chain from the uniform
+    distribution, on the vector products alone.
+    :param product: the function returning the product x Q of a vector.
+    :param diagonal: (numpy.ndarray) the diagonal of the generator matrix Q.
+    :param candidates: (numpy.ndarray) the boolean mask of the states to
+    choose from; defaults to all of them.
+    :param iterations: (int) the number of power iterations.
+    :return: (int) the index of the state.
+    """
+    n = len(diagonal)
+    uniformization = float(np.max(-diagonal, initial=0.0)) or 1.0
+    x = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        x = x + product(x) / uniformization
+    if candidates is not None and candidates.any():
+        x = np.where(candidates, x, -np.inf)
+    return int(np.argmax(x))
+
+
+def reference_state(generator: Any, iterations: int = REFERENCE_ITERATIONS) -> int:
+    """
+    Pick the reference state of the steady-state system: among the states
+    of the closed class of the chain, which are the only ones with positive
+    probability, the one likely to have the largest probability.
+    :param generator: (sparse matrix) the n x n generator matrix Q.
+    :param iterations: (int) the number of power iterations.
+    :return: (int) the index of the reference state.
+    """
+    generator = sparse.csr_matrix(generator)
+    labels, classes = closed_classes(generator > 0)
+    # Without a single closed class the system is singular anyway.
+    candidates = labels == classes[0] if len(classes) == 1 else None
+    transposed = sparse.csr_matrix(generator.T)
+    return dominant_state(
+        lambda x: transposed @ x, generator.diagonal(), candidates, iterations
+    )
+
+
+def steady_state_system(
+    generator: Any, reference: int, shift: float
+) -> Tuple[Any, np.ndarray]:
+    """
+    Build the linear system A x = b whose solution is proportional to the
+    steady-state distribution. A is the M-matrix -Q^T with the diagonal entry
+    of the reference state r increased by shift, and b = e_r: since the columns
+    of Q^T sum to zero, the solution satisfies x Q = 0. Unlike replacing an
+    equation with the normalization, this keeps A as sparse as Q and lets the
+    LU factorization run without pivoting.
+    :param generator: (sparse matrix) the n x n generator matrix Q.
+    :param reference: (int) the index of the reference state.
+    :param shift: (float) the positive diagonal shift.
+    :return: the CSC matrix A and the right-hand side b.
+    """
+    n = generator.shape[0]
+    pin = sparse.csr_matrix(([shift], ([reference], [reference])), shape=(n, n))
+    system = sparse.csc_matrix(pin - generator.T)
+    rhs = np.zeros(n)
+    rhs[reference] = 1.0
+    return system, rhs
+
+
+def solve_steady_state(
+    generator: Any, refinement_steps: int = 0, precision: str = "float64"
+) -> np.ndarray:
+    """
+    Solve the steady-state distribution with a sparse direct solver.
+    :param generator: (sparse matrix) the n x n generator matrix Q.
+    :param refinement_steps: (int) the number of iterative refinement steps.
+    :param precision: (string) the precision of the solution, one of
+    PRECISIONS.
+    :return: (numpy.ndarray) the steady-state probabilities.
+    :raise ValueError: if the precision is unknown.
+    :raise SolverError: if the chain has no unique steady-state distribution.
+    """
+    return SteadyStateSolver().solve(generator, refinement_steps, precision)
+
+
+def solve_shared(
+    generator: Union[GeneratorHandle, MatrixHandle],
+    results: ArrayHandle,
+    row: int,
+    refinement_steps: int = 0,
+) -> float:
+    """
+    Solve the steady-state distribution of a generator in shared memory and
+    store it in a row of a shared results array: the task to submit to a
+    process pool, whose arguments and result have the same size for any
+    chain. The segments are detached at the end of the task.
+    :param generator: the handle of the n x n generator matrix Q, or of a
+    chain generator, e.g. from MarkovChain.share_generator.
+    :param results: the handle of the m x n results array, whose type is
+    the precision of the solution.
+    :param row: (int) the row of the results array to write.
+    :param refinement_steps: (int) the number of iterative refinement steps.
+    :return: (float) the scaled residual of the solution.
+    :raise FileNotFoundError: if a segment does not exist anymore.
+    :raise SolverError: if the chain has no unique steady-state distribution.
+    """
+    if isinstance(generator, GeneratorHandle):
+        generator = generator.matrix
+    try:
+        matrix = attach_matrix(generator)
+        dtype = np.dtype(results.dtype)
+        precision = "longdouble" if dtype == np.longdouble else "float64"
+        # A new solver, so that no factorization outlives the shared arrays.
+        solution = SteadyStateSolver().solve(matrix, refinement_steps, precision)
+        attach_array(results)[row] = solution
+        residual = residual_norm(matrix, solution)
+        del matrix
+    finally:
+        detach(generator, results)
+    return residual
+
+
+class SteadyStateSolver:
+    """
+    Sparse direct steady-state solver for repeated solves of an evolving chain.
+    The LU factorization of the last factorized system is kept: when the new
+    generator differs from it in at most max_update_rank rows, the system is
+    re-solved with a low-rank (Woodbury) update of that factorization instead
+    of being factorized again.
+    """
+
+    def __init__(
+        self,
+        max_update_rank: int = MAX_UPDATE_RANK,
+        cache: Optional[FactorizationCache] = default_factorization_cache,
+    ) -> None:
+        """
+        Creates a new solver.
+        :param max_update_rank: (int) the maximum number of changed generator
+        rows handled by a low-rank update before refactorizing.
+        :param cache: the cache of symbolic analyses shared with other solvers,
+        or None to disable it.
+        """
+        self.max_update_rank = max_update_rank
+        self.cache = cache
+        self.stats: Dict[str, int] = {"factorizations": 0, "updates": 0}
+        self._generator: Optional[Any] = None
+        self._pin: Tuple[int, float] = (0, 1.0)
+        self._rhs: Optional[np.ndarray] = None
+        self._lu: Optional[Factorization] = None
+        self._lock = threading.Lock()
+
+    def solve(
+        self, generator: Any, refinement_steps: int = 0, precision: str = "float64"
+    ) -> np.ndarray:
+        """
+        Solve the steady-state distribution. With refinement steps, the
+        solution of the factorized system is improved by iterative refinement,
+        computing the residuals in the given precision.
+        :param generator: (sparse matrix) the n x n generator matrix Q.
+        :param refinement_steps: (int) the number of iterative refinement steps.
+        :param precision: (string) the precision of the solution, one of
+        PRECISIONS.
+        :return: (numpy.ndarray) the steady-state probabilities.
+        :raise ValueError: if the precision is unknown.
+        :raise SolverError: if the chain has no unique steady-state distribution.
+        """
+        dtype = precision_dtype(precision)
+        if generator.shape[0] == 0:
+            return np.zeros(0, dtype=dtype)
+        generator = sparse.csr_matrix(generator)
+        with self._lock:
+            update = self.__solve_update(generator)
+            solution, solve = update or self.__solve_factorize(generator)
+            if refinement_steps > 0:
+                system, rhs = steady_state_system(generator, *self._pin)
+                solution = refine(
+                    system, rhs, solution.astype(dtype), solve, refinement_steps
+                )
+        solution = solution.astype(dtype)
+        total = solution.sum()
+        if not np.isfinite(total) or total <= 0.0:
+            raise SolverError("The chain has no unique steady-state distribution")
+        return np.asarray(solution / total, dtype=dtype)
+
+    def reset(self) -> None:
+        """
+        Drop the cached factorization.
+        :return: (void)
+        """
+        with self._lock:
+            self._generator = self._rhs = self._lu = None
+
+    def __solve_factorize(
+        self, generator: Any
+    ) -> Tuple[np.ndarray, Callable[[np.ndarray], np.ndarray]]:
+        shift = float(np.max(-generator.diagonal(), initial=0.0)) or 1.0
+        reference = reference_state(generator)
+        system, rhs = steady_state_system(generator, reference, shift)
+        try:
+            lu = factorize(system, self.cache)
+        except RuntimeError as e:
+            self._generator = self._rhs = self._lu = None
+            raise SolverError(
+                "The chain has no unique steady-state distribution"
+            ) from e
+        self.stats["factorizations"] += 1
+        self._generator, self._rhs, self._lu = generator, rhs, lu
+        self._pin = (reference, shift)
+        return lu.solve(rhs), lu.solve
+
+    def __solve_update(
+        self, generator: Any
+    ) -> Optional[Tuple[np.ndarray, Callable[[np.ndarray], np.ndarray]]]:
+        """
+        Solve the system of a generator close to the factorized one, returning
+        the solution and the function solving the updated system for any
+        right-hand side; None, if the update is not possible.
+        """
+        lu = self._lu
+        if lu is None or self._generator is None or self._rhs is None:
+            return None
+        if self._generator.shape != generator.shape:
+            return None
+        delta = sparse.csr_matrix(generator - self._generator)
+        delta.eliminate_zeros()
+        changed = np.flatnonzero(np.diff(delta.indptr))
+        if len(changed) > self.max_update_rank:
+            return None
+
+        if len(changed) == 0:
+            return lu.solve(self._rhs), lu.solve
+
+        # Each changed row k of Q changes column k of the system by the
+        # opposite amount: A' = A + D E^T, with E selecting the columns k.
+        columns = -delta[changed].toarray().T
+        z = lu.solve(columns)
+        capacitance = np.eye(len(changed)) + z[changed, :]
+
+        def solve(rhs: np.ndarray) -> np.ndarray:
+            base = lu.solve(rhs)
+            correction = np.linalg.solve(capacitance, base[changed])
+            return np.asarray(base - z @ correction, dtype=float)
+
+        try:
+            solution = solve(self._rhs)
+        except np.linalg.LinAlgError:
+            return None
+        self.stats["updates"] += 1
+        return solution, solve
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The factorization cannot be pickled: copies start without it.
+        return {"max_update_rank": self.max_update_rank, "stats": self.stats}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Copies use the default cache of the process that unpickles them.
+        self.__init__(state["max_update_rank"])  # type: ignore[misc]
+        self.stats.update(state["stats"])
@@ -0,0 +1,170 @@
+"""
+Passage-time solvers working on sparse generator matrices.
+"""
+
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+from scipy import sparse  # type: ignore
+from scipy import special, stats  # type: ignore
+from scipy.sparse import csgraph  # type: ignore
+
+from markov_solver.solver.krylov import KrylovSolver, PreconditionedSystem
+from markov_solver.solver.numeric import (
+    Factorization,
+    FactorizationCache,
+    SolverError,
+    default_factorization_cache,
+    factorize,
+)
+
+UNIFORMIZATION_EPSILON = 1e-10
+
+
+def reaching_states(graph: Any, sources: np.ndarray) -> np.ndarray:
+    """
+    Find the states that can reach any of the sources.
+    :param graph: (sparse matrix) the n x n adjacency matrix, with an entry
+    for every edge.
+    :param sources: (numpy.ndarray) the boolean mask of the sources.
+    :return: (numpy.ndarray) the boolean mask of the states reaching them,
+    sources included.
+    """
+    n = graph.shape[0]
+    if not sources.any():
+        return np.zeros(n, dtype=bool)
+    # Reverse search from a virtual state linked to all the sources.
+    edges = sparse.coo_matrix(graph)
+    rows = np.concatenate([edges.col, np.full(int(sources.sum()), n)])
+    cols = np.concatenate([edges.row, np.flatnonzero(sources)])
+    reverse = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(n + 1, n + 1)
+    )
+    order = csgraph.breadth_first_order(
+        reverse, n, directed=True, return_predecessors=False
+    )
+    mask = np.zeros(n + 1, dtype=bool)
+    mask[order] = True
+    return mask[:n]
+
+
+def first_passage_moments(
+    generator: Any,
+    targets: np.ndarray,
+    moments: int = 1,
+    cache: Optional[FactorizationCache] = default_factorization_cache,
+    solver: Optional[KrylovSolver] = None,
+) -> np.ndarray:
+    """
+    Compute the moments of the first passage time to a set of target states,
+    from every state. With N the non-target states, the k-th moments m_k
+    solve -Q_NN m_k = k m_(k-1), with m_0 = 1: all the moments share a single
+    sparse LU factorization of -Q_NN, or a single preconditioner of it.
+    States from which the targets may never be reached have infinite
+    moments, and are left out of the system.
+    :param generator: (sparse matrix) the n x n generator matrix Q.
+    :param targets: (numpy.ndarray) the boolean mask of the target states.
+    :param moments: (int) the number of moments.
+    :param cache: the cache of symbolic analyses, or None to disable it.
+    :param solver: the Krylov solver, or None to use the direct solver.
+    :return: (numpy.ndarray) the n x moments matrix of the moments, zero for
+    the target states.
+    :raise ValueError: if there are no targets or moments is not positive.
+    :raise SolverError: if the passage-time system is singular, or the
+    Krylov solver does not converge.
+    """
+    if moments < 1:
+        raise ValueError("The number of moments must be positive")
+    if not targets.any():
+        raise ValueError("At least one target state is required")
+    generator = sparse.csr_matrix(generator)
+    n = generator.shape[0]
+    rates = generator - sparse.diags(generator.diagonal())
+    rates.eliminate_zeros()
+
+    # States that cannot reach the targets, and the states that can get
+    # trapped with them before hitting the targets, never finish the passage.
+    trapped = ~reaching_states(rates, targets)
+    free = sparse.diags((~targets).astype(float)) @ rates
+    infinite = reaching_states(free, trapped) & ~targets
+
+    result = np.zeros((n, moments))
+    result[infinite] = np.inf
+    solved = np.flatnonzero(~targets & ~infinite)
+    if len(solved) == 0:
+        return result
+
+    system = -generator[solved][:, solved]
+    lu: Union[Factorization, PreconditionedSystem]
+    if solver is not None:
+        lu = solver.factorize(system, solved)
+    else:
+        try:
+            lu = factorize(system, cache)
+        except RuntimeError as e:
+            raise SolverError("The passage-time system is singular") from e
+    previous = np.ones(len(solved))
+    for k in range(1, moments + 1):
+        previous = lu.solve(k * previous)
+        result[solved, k - 1] = previous
+    return result
+
+
+def passage_time_cdf(
+    generator: Any,
+    targets: np.ndarray,
+    times: Sequence[float],
+    epsilon: float = UNIFORMIZATION_EPSILON,
+) -> np.ndarray:
+    """
+    Compute the distribution function P(T <= t) of the first passage time T
+    to a set of target states, from every state, by uniformization. The
+    targets are made absorbing and the uniformized chain P = I + Q / L,
+    with L the largest exit rate, is run backwards once from the indicator of
+    the targets: v_k = P v_(k-1) is the probability of being absorbed within
+    k jumps, and P(T <= t) = sum_k Poisson(k; L t) v_k for all the times in
+    the same pass.
+    :param generator: (sparse matrix) the n x n generator matrix Q.
+    :param targets: (numpy.ndarray) the boolean mask of the target states.
+    :param times: (list(float)) the non-negative times.
+    :param epsilon: (float) the truncation error of the Poisson sums.
+    :return: (numpy.ndarray) the n x len(times) matrix of the probabilities.
+    :raise ValueError: if there are no targets, or a time is negative.
+    """
+    if not targets.any():
+        raise ValueError("At least one target state is required")
+    points = np.asarray(times, dtype=float)
+    if np.any(points < 0) or not np.all(np.isfinite(points)):
+        raise ValueError("The times must be finite and non-negative")
+    generator = sparse.csr_matrix(generator)
+    n = generator.shape[0]
+
+    absorbing = sparse.csr_matrix(sparse.diags((~targets).astype(float)) @ generator)
+    rate = float(np.max(-absorbing.diagonal(), initial=0.0)) or 1.0
+    jumps = sparse.csr_matrix(sparse.identity(n) + absorbing / rate)
+
+    means = rate * points
+    steps = int(stats.poisson.ppf(1.0 - epsilon, np.max(means, initial=0.0))) + 1
+    # Poisson weights of each step for every time, computed in log space to
+    # avoid underflow when L t is large.
+    with np.errstate(divide="ignore"):
+        log_means = np.log(means)
+    weights = np.exp(-means)
+    cumulative = weights.copy()
+
+    v = targets.astype(float)
+    cdf = np.outer(v, weights)
+    for step in range(1, steps + 1):
+        v = jumps @ v
+        with np.errstate(invalid="ignore"):
+            logs = step * log_means - means - special.gammaln(step + 1)
+        weights = np.where(means > 0, np.exp(logs), 0.0)
+        cdf += np.outer(v, weights)
+        cumulative += weights
+        remaining = np.clip(1.0 - cumulative, 0.0, None)
+        # The later v_k lie between v and 1: counting them all as v misses
+        # at most (1 - v) times the remaining weight.
+        if np.max(1.0 - v, initial=0.0) * np.max(remaining, initial=0.0) < epsilon:
+            cdf += np.outer(v, remaining)
+            break
+    return np.asarray(np.clip(cdf, 0.0, 1.0), dtype=float)
@@ -0,0 +1,57 @@
+"""
+Utilities for running blocking work from asyncio code.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_default_executor: Optional[Executor] = None
+
+
+def set_default_executor(executor: Optional[Executor]) -> None:
+    """
+    Set the executor used to offload blocking work when none is given.
+    :param executor: the executor, or None to use the event loop default.
+    :return: (void)
+    """
+    global _default_executor
+    _default_executor = executor
+
+
+def get_default_executor() -> Optional[Executor]:
+    """
+    Get the executor used to offload blocking work when none is given.
+    :return: the executor, or None if the event loop default is used.
+    """
+    return _default_executor
+
+
+async def run_blocking(
+    func: Callable[..., T],
+    *args: Any,
+    executor: Optional[Executor] = None,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Run a blocking callable in an executor without blocking the event loop.
+    Cancelling the awaiting task (or hitting the timeout) cancels the pending
+    work if it has not started yet; work already running in a thread is left
+    to complete in the background, while its result is discarded.
+    :param func: the blocking callable.
+    :param args: the positional arguments for the callable.
+    :param executor: the executor to use; defaults to the configured one.
+    :param timeout: (float) the maximum number of seconds to wait, if any.
+    :param kwargs: the keyword arguments for the callable.
+    :return: the value returned by the callable.
+    :raise asyncio.TimeoutError: if the timeout expires.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        executor or _default_executor, functools.partial(func, *args, **kwargs)
+    )
+    return await asyncio.wait_for(future, timeout)
@@ -2,12 +2,95 @@
 Utilities for CSV file management.
 """
 
+import os
 from csv import DictReader
-from typing import Any, Dict, List, Tuple
+from types import TracebackType
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
 
-from markov_solver.utils.file_utils import create_dir_tree, empty_file, is_empty_file
+from markov_solver.utils.file_utils import create_dir_tree
 
 CHAR_TO_REPLACE = [" ", "/"]
+FLUSH_ROWS = 1000
+
+
+class CsvWriter(object):
+    """
+    A long-lived CSV writer, that keeps the file open across rows and writes
+    them in batches.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        names: List[str],
+        append: bool = False,
+        skip_header: bool = False,
+        empty: bool = False,
+        flush_rows: int = FLUSH_ROWS,
+    ) -> None:
+        """
+        Opens the CSV file, writing the header if the file is empty.
+        :param filename: (string) the filename.
+        :param names: (list(string)) the list of names in header.
+        :param append: (bool) if True, append to an existing file.
+        :param skip_header: (bool) if True, skip the CSV header.
+        :param empty: (bool) if True, the file is emptied.
+        :param flush_rows: (int) the number of rows buffered before writing.
+        """
+        create_dir_tree(filename)
+        self.flush_rows = flush_rows
+        self._buffer: List[str] = []
+        self._file = open(filename, "a" if append and not empty else "w")
+        if not skip_header and os.fstat(self._file.fileno()).st_size == 0:
+            self._file.write(",".join(map(str_csv, names)) + "\n")
+
+    def write_row(self, sample: Tuple[Any, ...]) -> None:
+        """
+        Write a row.
+        :param sample: (tuple) the row values.
+        :return: (void)
+        """
+        self._buffer.append(",".join(map(str, sample)) + "\n")
+        if len(self._buffer) >= self.flush_rows:
+            self.flush()
+
+    def write_rows(self, data: Iterable[Tuple[Any, ...]]) -> None:
+        """
+        Write rows.
+        :param data: (list(tuple)) the rows.
+        :return: (void)
+        """
+        for sample in data:
+            self.write_row(sample)
+
+    def flush(self) -> None:
+        """
+        Write the buffered rows to the file.
+        :return: (void)
+        """
+        self._file.write("".join(self._buffer))
+        self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Write the buffered rows and close the file.
+        :return: (void)
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "CsvWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
 
 
 def save_csv(
@@ -28,21 +111,8 @@ def save_csv(
     :param empty: (bool) if True, the file is emptied.
     :return: None
     """
-    create_dir_tree(filename)
-
-    if empty:
-        empty_file(filename)
-
-    mode = "a+" if append else "w+"
-
-    with open(filename, mode) as f:
-        if is_empty_file(filename) and not skip_header:
-            f.write(",".join(map(str_csv, names)))
-            f.write("\n")
-
-        for sample in data:
-            f.write(",".join(map(str, sample)))
-            f.write("\n")
+    with CsvWriter(filename, names, append, skip_header, empty) as writer:
+        writer.write_rows(data)
 
 
 def str_csv(s: str) -> str:
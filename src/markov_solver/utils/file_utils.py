@@ -22,11 +22,9 @@ def is_empty_file(filename: str) -> bool:
     """
     Check whether a file is empty or not.
     :param filename: (string) the filename.
-    :return: True, if the file exists; False, otherwise.
+    :return: True, if the file is empty; False, otherwise.
     """
-    with open(filename, "r") as f:
-        s = f.read()
-    return len(s) == 0
+    return os.stat(filename).st_size == 0
 
 
 def empty_file(filename: str) -> None:
@@ -127,10 +125,7 @@ def save_txt(
     """
     create_dir_tree(filename)
 
-    if empty:
-        empty_file(filename)
-
-    mode = "a+" if append else "w+"
+    mode = "a" if append and not empty else "w"
 
     with open(filename, mode) as f:
         f.write(str(content))
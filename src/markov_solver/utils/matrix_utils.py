@@ -0,0 +1,45 @@
+"""
+Utilities for the state names of chains stored as matrices.
+"""
+
+from pathlib import Path
+from typing import List, Optional, Union
+
+STATES_SUFFIX = ".states"
+
+
+def states_sidecar_path(path: Union[str, Path]) -> Path:
+    """
+    Return the path of the sidecar file with the state names of a matrix file.
+    :param path: (string) the matrix file path, e.g. chain.mtx.
+    :return: (Path) the sidecar file path, e.g. chain.states.
+    """
+    return Path(path).with_suffix(STATES_SUFFIX)
+
+
+def read_state_names(path: Union[str, Path]) -> Optional[List[str]]:
+    """
+    Read the state names, one per line, from a sidecar file.
+    :param path: (string) the sidecar file path.
+    :return: (list(string)) the state names, if the file exists; None, otherwise.
+    """
+    sidecar = Path(path)
+    if not sidecar.exists():
+        return None
+    with sidecar.open() as f:
+        return [line.rstrip("\r\n") for line in f]
+
+
+def write_state_names(path: Union[str, Path], names: List[str]) -> None:
+    """
+    Write the state names, one per line, to a sidecar file.
+    :param path: (string) the sidecar file path.
+    :param names: (list(string)) the state names.
+    :return: (void)
+    :raise ValueError: if a name contains a line break.
+    """
+    for name in names:
+        if "\n" in name or "\r" in name:
+            raise ValueError(f"State name {name!r} contains a line break")
+    with Path(path).open("w") as f:
+        f.writelines(f"{name}\n" for name in names)
@@ -0,0 +1,242 @@
+"""
+Utilities to exchange arrays and sparse matrices with worker processes
+through shared memory segments: tasks carry constant-size handles, and
+workers attach to the segments by name instead of unpickling copies.
+"""
+
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Type, Union
+
+import numpy as np
+from scipy import sparse  # type: ignore
+
+
+class ArrayHandle(NamedTuple):
+    """The picklable reference to an array in a shared memory segment."""
+
+    name: str  # name of the segment
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class MatrixHandle(NamedTuple):
+    """The picklable reference to a CSR matrix in shared memory segments."""
+
+    shape: Tuple[int, int]
+    data: ArrayHandle
+    indices: ArrayHandle
+    indptr: ArrayHandle
+
+
+class GeneratorHandle(NamedTuple):
+    """The picklable reference to the state names and generator of a chain."""
+
+    names: ArrayHandle
+    matrix: MatrixHandle
+
+
+Handle = Union[ArrayHandle, MatrixHandle, GeneratorHandle]
+
+# Segments attached by this process, by name, until they are detached:
+# repeated attachments of the same arrays within a task map them once.
+_attached: Dict[str, SharedMemory] = {}
+
+
+class SharedArrays(object):
+    """
+    The owner of shared memory segments, which are unlinked when it is
+    closed, e.g. at the end of a with block: the views of the segments must
+    not be used afterwards.
+    """
+
+    def __init__(self) -> None:
+        """
+        Creates a new owner without segments.
+        """
+        self._segments: List[SharedMemory] = []
+
+    def create_array(
+        self, shape: Tuple[int, ...], dtype: Any = float
+    ) -> Tuple[ArrayHandle, np.ndarray]:
+        """
+        Allocate a zeroed array in a new segment, e.g. for the results of
+        the workers.
+        :param shape: (tuple(int)) the shape of the array.
+        :param dtype: the NumPy type of the array.
+        :return: the handle of the array and its view in this process.
+        """
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        # Segments cannot be empty.
+        segment = SharedMemory(create=True, size=max(nbytes, 1))
+        self._segments.append(segment)
+        array: np.ndarray = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+        array.fill(0)
+        return ArrayHandle(segment.name, tuple(shape), dtype.str), array
+
+    def share_array(self, array: np.ndarray) -> ArrayHandle:
+        """
+        Copy an array to a new segment.
+        :param array: (numpy.ndarray) the array.
+        :return: the handle of the array.
+        """
+        array = np.asarray(array)
+        handle, view = self.create_array(array.shape, array.dtype)
+        view[...] = array
+        return handle
+
+    def share_matrix(self, matrix: Any) -> MatrixHandle:
+        """
+        Copy the arrays of a sparse matrix, in CSR form, to new segments.
+        :param matrix: (sparse matrix) the matrix.
+        :return: the handle of the matrix.
+        """
+        csr = sparse.csr_matrix(matrix)
+        return MatrixHandle(
+            (int(csr.shape[0]), int(csr.shape[1])),
+            self.share_array(csr.data),
+            self.share_array(csr.indices),
+            self.share_array(csr.indptr),
+        )
+
+    def share_generator(self, names: List[str], generator: Any) -> GeneratorHandle:
+        """
+        Copy the state names and the generator matrix of a chain to new
+        segments.
+        :param names: (list(string)) the state names, following the rows.
+        :param generator: (sparse matrix) the generator matrix.
+        :return: the handle of the generator.
+        """
+        return GeneratorHandle(
+            self.share_array(np.array(names, dtype=str)),
+            self.share_matrix(generator),
+        )
+
+    def close(self) -> None:
+        """
+        Release and unlink all the segments.
+        :return: (void)
+        """
+        for segment in self._segments:
+            try:
+                segment.close()
+            except BufferError:
+                # Views still alive: the memory is released with them.
+                pass
+            segment.unlink()
+        self._segments = []
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def _attach(name: str) -> SharedMemory:
+    segment = _attached.get(name)
+    if segment is None:
+        if sys.version_info >= (3, 13):
+            segment = SharedMemory(name, track=False)
+        else:
+            # The owner unlinks the segment: the tracker of a worker must not.
+            segment = SharedMemory(name)
+            resource_tracker.unregister(
+                segment._name, "shared_memory"  # type: ignore[attr-defined]
+            )
+        _attached[name] = segment
+    return segment
+
+
+def attach_array(handle: ArrayHandle) -> np.ndarray:
+    """
+    Attach to an array in shared memory, without copying it. Writes to the
+    array are visible to all the processes.
+    :param handle: the handle of the array.
+    :return: (numpy.ndarray) the view of the array.
+    :raise FileNotFoundError: if the segment does not exist anymore.
+    """
+    segment = _attach(handle.name)
+    return np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=segment.buf)
+
+
+def attach_matrix(handle: MatrixHandle) -> Any:
+    """
+    Attach to a CSR matrix in shared memory, without copying its arrays.
+    :param handle: the handle of the matrix.
+    :return: (scipy.sparse.csr_matrix) the matrix.
+    :raise FileNotFoundError: if a segment does not exist anymore.
+    """
+    return sparse.csr_matrix(
+        (
+            attach_array(handle.data),
+            attach_array(handle.indices),
+            attach_array(handle.indptr),
+        ),
+        shape=handle.shape,
+        copy=False,
+    )
+
+
+def attach_generator(handle: GeneratorHandle) -> Tuple[np.ndarray, Any]:
+    """
+    Attach to the state names and the generator matrix of a chain.
+    :param handle: the handle of the generator.
+    :return: the array of the state names and the generator matrix.
+    :raise FileNotFoundError: if a segment does not exist anymore.
+    """
+    return attach_array(handle.names), attach_matrix(handle.matrix)
+
+
+def detach(*handles: Handle) -> None:
+    """
+    Release the segments of arrays attached by this process, e.g. at the end
+    of a task, so that a long-lived worker does not keep them mapped after
+    their owner unlinks them; the arrays attached before must not be used
+    afterwards.
+    :param handles: the handles of the arrays, matrices or generators.
+    :return: (void)
+    """
+    for handle in handles:
+        for name in _segment_names(handle):
+            segment = _attached.get(name)
+            if segment is None:
+                continue
+            try:
+                segment.close()
+            except BufferError:
+                continue
+            del _attached[name]
+
+
+def _segment_names(handle: Handle) -> Iterator[str]:
+    if isinstance(handle, ArrayHandle):
+        yield handle.name
+    elif isinstance(handle, MatrixHandle):
+        for array in (handle.data, handle.indices, handle.indptr):
+            yield array.name
+    else:
+        yield handle.names.name
+        yield from _segment_names(handle.matrix)
+
+
+def detach_all() -> None:
+    """
+    Release the segments attached by this process, e.g. at the end of a
+    worker; the arrays attached before must not be used afterwards.
+    :return: (void)
+    """
+    for segment in _attached.values():
+        try:
+            segment.close()
+        except BufferError:
+            pass
+    _attached.clear()
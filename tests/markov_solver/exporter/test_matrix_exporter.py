@@ -0,0 +1,141 @@
+import io
+
+import pytest
+from assertpy import assert_that
+from scipy import io as scipy_io
+from scipy import sparse
+
+from markov_solver.exporter.matrix_exporter import (
+    export_chain,
+    export_matrix,
+    export_matrix_market,
+    export_numpy,
+    write_csr,
+    write_dense_csv,
+    write_triplets,
+)
+from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.model.markov_link import MarkovLink
+from markov_solver.parser.csv_parser import CsvAdjacencyMatrixParser
+from markov_solver.parser.markov_chain_parser import create_chain_from_file
+
+
+def _chain() -> MarkovChain:
+    chain = MarkovChain()
+    sunny = chain.add_state("Sunny")
+    rainy = chain.add_state("Rainy")
+    chain.add_symbols(p=0.1)
+    chain.add_link(MarkovLink(sunny, sunny, "0.9"))
+    chain.add_link(MarkovLink(sunny, rainy, "p"))
+    chain.add_link(MarkovLink(rainy, sunny, "0.5"))
+    return chain
+
+
+class TestMatrixExporter:
+    def test_export_matrix_market(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        path = tmp_path / "out" / "chain.mtx"
+        export_matrix_market(_chain(), path)
+
+        matrix = scipy_io.mmread(path).toarray()
+        assert_that(matrix.tolist()).is_equal_to([[-0.5, 0.5], [0.1, -0.1]])
+        assert_that((tmp_path / "out" / "chain.states").read_text()).is_equal_to(
+            "Rainy\nSunny\n"
+        )
+
+    def test_export_matrix_market_states_path(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        export_matrix_market(_chain(), tmp_path / "chain.mtx", tmp_path / "names.txt")
+        assert_that((tmp_path / "names.txt").read_text()).is_equal_to("Rainy\nSunny\n")
+
+    def test_export_numpy(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        path = tmp_path / "chain.npz"
+        export_numpy(_chain(), path)
+
+        matrix = sparse.load_npz(path).toarray()
+        assert_that(matrix.tolist()).is_equal_to([[-0.5, 0.5], [0.1, -0.1]])
+
+    @pytest.mark.parametrize("extension", [".mtx", ".npz"])
+    def test_round_trip(self, tmp_path, extension) -> None:  # type: ignore[no-untyped-def]
+        chain = _chain()
+        path = tmp_path / f"chain{extension}"
+        export_chain(chain, path)
+
+        copy = create_chain_from_file(path)
+        assert_that(copy.solve(method="numeric")).is_equal_to(
+            chain.solve(method="numeric")
+        )
+
+    def test_export_chain_unsupported(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        with pytest.raises(ValueError, match="Unsupported export file extension"):
+            export_chain(_chain(), tmp_path / "chain.csv")
+
+    def test_write_triplets(self) -> None:
+        stream = io.StringIO()
+        write_triplets(_chain(), stream, chunk_rows=1)
+        assert_that(stream.getvalue()).is_equal_to(
+            "from,to,value\n"
+            "Rainy,Rainy,-0.5\n"
+            "Rainy,Sunny,0.5\n"
+            "Sunny,Rainy,0.1\n"
+            "Sunny,Sunny,-0.1\n"
+        )
+
+    def test_write_triplets_transition(self) -> None:
+        stream = io.StringIO()
+        write_triplets(_chain(), stream, kind="transition")
+        assert_that(stream.getvalue().splitlines()).contains(
+            "Sunny,Sunny,0.9", "Rainy,Sunny,1.0"
+        )
+
+    def test_write_triplets_quotes_names(self) -> None:
+        chain = MarkovChain()
+        chain.add_link(MarkovLink(chain.add_state("A,1"), chain.add_state("B"), "2"))
+        stream = io.StringIO()
+        write_triplets(chain, stream)
+        assert_that(stream.getvalue()).contains('"A,1",B,2.0\n')
+
+    def test_write_csr(self) -> None:
+        stream = io.StringIO()
+        write_csr(_chain(), stream, chunk_values=1)
+        assert_that(stream.getvalue()).is_equal_to(
+            "states,Rainy,Sunny\n"
+            "indptr,0,2,4\n"
+            "indices,0,1,0,1\n"
+            "data,-0.5,0.5,0.1,-0.1\n"
+        )
+
+    def test_write_dense_csv(self) -> None:
+        stream = io.StringIO()
+        write_dense_csv(_chain(), stream, chunk_values=1)
+        assert_that(stream.getvalue()).is_equal_to(
+            ",Rainy,Sunny\nRainy,-0.5,0.5\nSunny,0.1,-0.1\n"
+        )
+        whole = io.StringIO()
+        write_dense_csv(_chain(), whole, chunk_values=3)
+        assert_that(whole.getvalue()).is_equal_to(stream.getvalue())
+
+    def test_write_dense_csv_transition_round_trip(self) -> None:
+        chain = CsvAdjacencyMatrixParser().parse(
+            ",Sunny,Rainy\nSunny,0.9,0.1\nRainy,0.5,0.5\n"
+        )
+        stream = io.StringIO()
+        write_dense_csv(chain, stream, kind="transition")
+
+        copy = CsvAdjacencyMatrixParser().parse(stream.getvalue())
+        assert_that(copy.solve(method="numeric")).is_equal_to(
+            chain.solve(method="numeric")
+        )
+
+    def test_write_unknown_kind(self) -> None:
+        with pytest.raises(ValueError, match="Unknown matrix kind"):
+            write_triplets(_chain(), io.StringIO(), kind="rates")
+
+    def test_export_matrix(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        path = tmp_path / "out" / "chain.csv"
+        export_matrix(_chain(), path, form="dense", kind="transition")
+        assert_that(path.read_text()).is_equal_to(
+            ",Rainy,Sunny\nRainy,0.0,1.0\nSunny,0.1,0.9\n"
+        )
+
+    def test_export_matrix_unknown_form(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        with pytest.raises(ValueError, match="Unknown matrix form"):
+            export_matrix(_chain(), tmp_path / "chain.txt", form="coo")
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+
+from markov_solver.model.descriptor import Descriptor
+from markov_solver.solver.numeric import solve_steady_state
+
+
+def random_descriptor() -> Descriptor:
+    rng = np.random.default_rng(7)
+    descriptor = Descriptor([3, 4, 2])
+    descriptor.add_local(0, rng.random((3, 3)))
+    descriptor.add_local(2, rng.random((2, 2)))
+    descriptor.add_event({0: rng.random((3, 3)), 1: rng.random((4, 4))}, 0.5)
+    descriptor.add_event({1: rng.random((4, 4)), 2: rng.random((2, 2))}, 2.0)
+    return descriptor
+
+
+def queue_descriptor(capacity: int = 3) -> Descriptor:
+    # Two independent M/M/1/K queues, with a blocking-free joint service.
+    descriptor = Descriptor([capacity + 1, capacity + 1])
+    arrivals = np.eye(capacity + 1, k=1)
+    services = np.eye(capacity + 1, k=-1)
+    descriptor.add_local(0, arrivals + 2.0 * services)
+    descriptor.add_local(1, 0.5 * arrivals + services)
+    return descriptor
+
+
+def network_descriptor(queues: int, capacity: int) -> Descriptor:
+    # Cyclic network of queues, as in benchmarks/bench_descriptor.py.
+    size = capacity + 1
+    arrival = np.eye(size, k=1)
+    departure = np.eye(size, k=-1)
+    lost = np.zeros((size, size))
+    lost[capacity, capacity] = 1.0
+    descriptor = Descriptor([size] * queues)
+    descriptor.add_local(0, arrival)
+    for k in range(queues - 1):
+        descriptor.add_event({k: departure, k + 1: arrival + lost}, 1.5 + 0.1 * k)
+    descriptor.add_local(queues - 1, (1.4 + 0.1 * queues) * departure)
+    return descriptor
+
+
+class TestDescriptor:
+    def test_size(self) -> None:
+        descriptor = random_descriptor()
+        assert_that(descriptor.size).is_equal_to(24)
+        assert_that(descriptor.state(23)).is_equal_to((2, 3, 1))
+        assert_that(descriptor.state(1)).is_equal_to((0, 0, 1))
+
+    def test_to_sparse(self) -> None:
+        generator = random_descriptor().to_sparse()
+        assert_that(generator.shape).is_equal_to((24, 24))
+        assert_that(np.abs(generator.sum(axis=1)).max()).is_less_than(1e-12)
+
+    def test_to_sparse_kronecker_sum(self) -> None:
+        generator = queue_descriptor(1).to_sparse().toarray()
+        assert_that(generator[0].tolist()).is_equal_to([-1.5, 0.5, 1.0, 0.0])
+        assert_that(generator[3].tolist()).is_equal_to([0.0, 2.0, 1.0, -3.0])
+
+    def test_vector_product(self) -> None:
+        descriptor = random_descriptor()
+        x = np.random.default_rng(1).random(descriptor.size)
+        expected = descriptor.to_sparse().T @ x
+        assert_that(np.allclose(descriptor.vector_product(x), expected)).is_true()
+
+    def test_diagonal(self) -> None:
+        descriptor = random_descriptor()
+        expected = descriptor.to_sparse().diagonal()
+        assert_that(np.allclose(descriptor.diagonal(), expected)).is_true()
+
+    @pytest.mark.parametrize("method", ["bicgstab", "gmres"])
+    @pytest.mark.parametrize("preconditioner", ["none", "jacobi"])
+    def test_solve(self, preconditioner: str, method: str) -> None:
+        descriptor = random_descriptor()
+        probabilities, solver = descriptor.solve(preconditioner, method=method)
+        expected = solve_steady_state(descriptor.to_sparse())
+        assert_that(np.allclose(probabilities, expected)).is_true()
+        assert_that(solver.diagnostics.preconditioner).is_equal_to(preconditioner)
+        assert_that(solver.method).is_equal_to(method)
+
+    def test_solve_network(self) -> None:
+        descriptor = network_descriptor(4, 9)
+        probabilities, solver = descriptor.solve()
+        expected = solve_steady_state(descriptor.to_sparse())
+        assert_that(np.allclose(probabilities, expected, atol=1e-9)).is_true()
+        assert_that(solver.diagnostics.converged).is_true()
+        assert_that(solver.diagnostics.iterations).is_less_than(1000)
+        assert_that(solver.diagnostics.residual).is_less_than(1e-10)
+
+    def test_solve_needs_matrix_free_preconditioner(self) -> None:
+        with pytest.raises(ValueError, match="needs the matrix"):
+            random_descriptor().solve("ilu0")
+
+    def test_marginals(self) -> None:
+        # Independent queues: the marginals are truncated geometric.
+        descriptor = queue_descriptor()
+        probabilities, _ = descriptor.solve()
+        first, second = descriptor.marginals(probabilities)
+        expected = 0.5 ** np.arange(4) / (0.5 ** np.arange(4)).sum()
+        assert_that(np.allclose(first, expected)).is_true()
+        assert_that(np.allclose(second, expected)).is_true()
+
+    def test_to_chain(self) -> None:
+        chain = queue_descriptor(1).to_chain()
+        solution = chain.solve(method="numeric")
+        assert_that(solution["A0B0"]).is_close_to(4 / 9, 1e-12)
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError, match="at least one local state"):
+            Descriptor([])
+        descriptor = Descriptor([2, 3])
+        with pytest.raises(ValueError, match="Expected a 3x3 matrix"):
+            descriptor.add_local(1, np.zeros((2, 2)))
+        with pytest.raises(ValueError, match="Unknown component"):
+            descriptor.add_event({2: np.zeros((2, 2))})
+        with pytest.raises(ValueError, match="at least one component"):
+            descriptor.add_event({})
@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+
+from markov_solver.model.expression import (
+    ExpressionError,
+    ExpressionTable,
+    UndefinedSymbolError,
+    compile_expression,
+    evaluate,
+    mangle,
+)
+
+
+class TestExpression:
+    @pytest.mark.parametrize(
+        "source, variables, expected",
+        [
+            ("0.5", {}, 0.5),
+            ("1e-13", {}, 1e-13),
+            ("2*mu + mu2", {"mu": 1.5, "mu2": 4.0}, 7.0),
+            ("(lambda + 1) / 2", {"lambda": 3.0}, 2.0),
+            ("-x ** 2 % 5", {"x": 3.0}, 1.0),
+            ("7 // 2", {}, 3.0),
+            ("maximum(x - 1, 0)", {"x": 0.5}, 0.0),
+            ("where(x > 0, 1, 2)", {"x": -1.0}, 2.0),
+            ("exp(log(4))", {}, 4.0),
+        ],
+    )
+    def test_evaluate(self, source: str, variables: dict, expected: float) -> None:  # type: ignore[type-arg]
+        assert_that(float(evaluate(source, variables))).is_close_to(expected, 1e-12)
+
+    def test_evaluate_number(self) -> None:
+        assert_that(evaluate(2, {})).is_equal_to(2.0)
+
+    def test_evaluate_literal_not_compiled(self) -> None:
+        compile_expression.cache_clear()
+        assert_that(evaluate(" 0.125 ", {})).is_equal_to(0.125)
+        assert_that(compile_expression.cache_info().currsize).is_equal_to(0)
+        # Non-finite numbers are symbols.
+        with pytest.raises(UndefinedSymbolError, match="Symbol inf"):
+            evaluate("inf", {})
+        assert_that(evaluate("nan", {"nan": 2.0})).is_equal_to(2.0)
+
+    def test_evaluate_arrays(self) -> None:
+        result = evaluate("minimum(x, 2) * c", {"x": np.array([1, 3]), "c": 2.0})
+        assert_that(result.tolist()).is_equal_to([2.0, 4.0])
+
+    def test_symbols(self) -> None:
+        compiled = compile_expression("exp(-lambda * t) + abs(x)")
+        assert_that(compiled.symbols).is_equal_to(frozenset({"lambda", "t", "x"}))
+
+    def test_compile_is_cached(self) -> None:
+        assert_that(compile_expression("mu*3")).is_same_as(compile_expression("mu*3"))
+
+    def test_mangle(self) -> None:
+        assert_that(mangle("lambda")).is_equal_to("_lambda")
+        assert_that(mangle("mu")).is_equal_to("mu")
+
+    def test_undefined_symbol(self) -> None:
+        with pytest.raises(UndefinedSymbolError, match="Symbol nu is not defined") as e:
+            evaluate("mu + nu", {"mu": 1.0})
+        assert_that(e.value.name).is_equal_to("nu")
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "__import__('os').system('true')",
+            "open('f')",
+            "x.real",
+            "x[0]",
+            "(lambda: 1)()",
+            "[1, 2]",
+            "'a' * 3",
+            "_x + 1",
+            "1 < x < 2",
+            "maximum(*x)",
+            "1 +",
+            "(1",
+            "1" * 10001,
+        ],
+    )
+    def test_rejected(self, source: str) -> None:
+        with pytest.raises(ExpressionError):
+            compile_expression(source)
+
+    @pytest.mark.parametrize("source", ["1/0", "9**9**9**9"])
+    def test_evaluation_error(self, source: str) -> None:
+        with pytest.raises(ExpressionError, match="Cannot evaluate"):
+            evaluate(source, {})
+
+
+class TestExpressionTable:
+    def test_intern(self) -> None:
+        table = ExpressionTable()
+        assert_that(table.intern("mu*2")).is_equal_to(0)
+        assert_that(table.intern(0.5)).is_equal_to(1)
+        assert_that(table.intern("".join(["mu", "*2"]))).is_equal_to(0)
+        assert_that(table.ids(["mu*2", "lambda", 0.5]).tolist()).is_equal_to([0, 2, 1])
+        assert_that(table).is_length(3)
+        assert_that(table[2]).is_equal_to("lambda")
+
+    def test_gather(self) -> None:
+        table = ExpressionTable()
+        ids = table.ids(["mu*2", "mu", "mu*2", "1"])
+        values = table.gather(ids, {"mu": 1.5})
+        assert_that(values.tolist()).is_equal_to([3.0, 1.5, 3.0, 1.0])
+        values = table.gather(ids, {"mu": 2.0})
+        assert_that(values.tolist()).is_equal_to([4.0, 2.0, 4.0, 1.0])
+
+    def test_gather_evaluates_once(self) -> None:
+        table = ExpressionTable()
+        ids = table.ids(["mu", "mu"])
+        table.gather(ids, {"mu": 1.0})
+        # Values of the same symbols are reused, also after the table grows.
+        table.expressions[0] = "mu*10"
+        ids = np.append(ids, table.intern("mu*3"))
+        assert_that(table.gather(ids, {"mu": 1.0}).tolist()).is_equal_to(
+            [1.0, 1.0, 3.0]
+        )
+
+    def test_compact(self) -> None:
+        table = ExpressionTable()
+        ids = table.ids(["mu", "nu", "mu*2", "nu*2"])
+        table.gather(ids[:3], {"mu": 1.0, "nu": 2.0})
+        table.expressions[2] = "mu*10"
+        new_ids = table.compact(np.array([3, 2, 3]))
+        assert_that(new_ids.tolist()).is_equal_to([1, 0, 1])
+        assert_that(table.expressions).is_equal_to(["mu*10", "nu*2"])
+        assert_that(table.intern("nu*2")).is_equal_to(1)
+        # The values already evaluated are kept.
+        assert_that(table.gather(new_ids, {"mu": 1.0, "nu": 2.0}).tolist()).is_equal_to(
+            [4.0, 2.0, 4.0]
+        )
+
+    def test_gather_errors(self) -> None:
+        table = ExpressionTable()
+        ids = table.ids(["mu", "nu", "1/0"])
+        with pytest.raises(UndefinedSymbolError):
+            table.gather(ids, {"mu": 1.0})
+        errors: dict = {}  # type: ignore[type-arg]
+        values = table.gather(ids, {"mu": 1.0}, errors)
+        assert_that(values[0]).is_equal_to(1.0)
+        assert_that(np.isnan(values[1:]).all()).is_true()
+        assert_that(sorted(errors)).is_equal_to([1, 2])
+        # Expressions not gathered are not evaluated.
+        assert_that(table.gather(ids[:1], {"mu": 3.0}).tolist()).is_equal_to([3.0])
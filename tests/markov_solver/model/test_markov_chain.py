@@ -1,8 +1,25 @@
+import asyncio
+import math
+import pickle
+
+import numpy as np
+import pytest
 from assertpy import assert_that
 
-from markov_solver.model.markov_chain import MarkovChain
+from markov_solver.model.markov_chain import (
+    EXPRESSION_SLACK,
+    MarkovChain,
+    SymbolicTimeoutError,
+)
 from markov_solver.model.markov_link import MarkovLink
+from markov_solver.model.markov_reward import MarkovReward
 from markov_solver.model.markov_state import MarkovState
+from markov_solver.results.solution import SteadyStateSolution
+from markov_solver.utils.shared_memory import (
+    SharedArrays,
+    attach_generator,
+    detach_all,
+)
 
 
 class TestMarkovChain:
@@ -178,3 +195,545 @@ class TestMarkovChain:
         chain.add_link(MarkovLink(s2, s2, 0.5))
         solutions = chain.solve()
         assert_that(solutions).is_not_empty()
+
+    def test_async_solve(self) -> None:
+        chain = MarkovChain()
+        sunny = chain.add_state("Sunny")
+        rainy = chain.add_state("Rainy")
+        chain.add_link(MarkovLink(sunny, sunny, 0.9))
+        chain.add_link(MarkovLink(sunny, rainy, 0.1))
+        chain.add_link(MarkovLink(rainy, sunny, 0.5))
+        chain.add_link(MarkovLink(rainy, rainy, 0.5))
+
+        async def solve_many() -> list:  # type: ignore[type-arg]
+            return await asyncio.gather(*(chain.async_solve() for _ in range(4)))
+
+        for solutions in asyncio.run(solve_many()):
+            assert_that(solutions).is_equal_to(chain.solve())
+
+    def test_generator_matrix(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        chain.add_symbols(mu=2.0)
+        chain.add_link(MarkovLink(s1, s1, "0.5"))
+        chain.add_link(MarkovLink(s1, s2, "1.5"))
+        chain.add_link(MarkovLink(s2, s1, "mu"))
+        states, generator = chain.generator_matrix()
+        assert_that(states).is_equal_to([s1, s2])
+        assert_that(generator.toarray().tolist()).is_equal_to(
+            [[-1.5, 1.5], [2.0, -2.0]]
+        )
+
+    def test_share_generator(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        chain.add_link(MarkovLink(s1, s2, "1.5"))
+        chain.add_link(MarkovLink(s2, s1, "2"))
+        with SharedArrays() as arrays:
+            names, generator = attach_generator(chain.share_generator(arrays))
+            assert_that(names.tolist()).is_equal_to(["A", "B"])
+            assert_that(generator.toarray().tolist()).is_equal_to(
+                [[-1.5, 1.5], [2.0, -2.0]]
+            )
+            del names, generator
+            detach_all()
+
+    def test_validate(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        s3 = chain.add_state("C")
+        chain.add_symbols(mu=2.0)
+        chain.add_link(MarkovLink(s1, s2, "mu"))
+        chain.add_link(MarkovLink(s2, s1, "1"))
+        chain.add_link(MarkovLink(s2, s3, "-1"))
+        chain.add_link(MarkovLink(s3, s1, "nu"))
+        chain.add_link(MarkovLink(s3, s2, "1/0"))
+        chain.add_link(MarkovLink(s3, s2, "3"))
+        chain.add_link(MarkovLink(s1, MarkovState("D"), "1"))
+        report = chain.validate()
+        assert_that(report.valid).is_false()
+        assert_that(report.counts).is_equal_to(
+            {
+                "dangling-state": 1,
+                "undefined-symbol": 1,
+                "invalid-value": 1,
+                "negative-rate": 1,
+                "unreachable-state": 1,
+            }
+        )
+        assert_that(str(report)).contains("Symbol nu is not defined")
+
+    def test_links_share_expressions(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        s3 = chain.add_state("C")
+        chain.add_link(MarkovLink(s1, s2, "".join(["mu", "*2"])))
+        chain.add_link(MarkovLink(s2, s3, "".join(["mu", "*2"])))
+        chain.add_link(MarkovLink(s3, s1, "mu"))
+        values = [link.value for link in sorted(chain.links)]
+        assert_that(chain.expressions).is_length(2)
+        assert_that(values[0]).is_same_as(values[1])
+
+    def test_expressions_compacted(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        chain.add_link(MarkovLink(s1, s2, "mu"))
+        chain.add_link(MarkovLink(s2, s1, "mu"))
+        chain.add_symbols(mu=1.0)
+        for i in range(10_000):
+            chain.update_link(s1, s2, "mu*{}".format(i + 1))
+        assert_that(len(chain.expressions)).is_less_than_or_equal_to(
+            2 * len(chain.links) + EXPRESSION_SLACK
+        )
+        _, generator = chain.generator_matrix()
+        assert_that(generator.toarray()[0].tolist()).is_equal_to([-10000.0, 10000.0])
+        assert_that(chain.expressions.expressions).is_equal_to(["mu", "mu*10000"])
+
+    def test_generator_matrix_after_symbols_change(self) -> None:
+        chain = self._birth_death_chain()
+        chain.generator_matrix()
+        chain.add_symbols(lambda_=3.0)
+        _, generator = chain.generator_matrix()
+        assert_that(generator.toarray()[0].tolist()).is_equal_to([-3.0, 3.0, 0.0, 0.0])
+
+    def test_generator_matrix_after_removing_invalid_link(self) -> None:
+        chain = self._birth_death_chain()
+        s0, s2 = MarkovState("0"), MarkovState("2")
+        chain.add_link(MarkovLink(s0, s2, "1/0"))
+        with pytest.raises(ValueError, match="Cannot evaluate"):
+            chain.generator_matrix()
+        chain.remove_link(MarkovLink(s0, s2, "1/0"))
+        _, generator = chain.generator_matrix()
+        assert_that(generator[0, 2]).is_equal_to(0.0)
+
+    def test_keyword_symbols(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        chain.add_symbols(**{"lambda": 1.0, "lambda_2": 2.0})
+        chain.add_link(MarkovLink(s1, s2, "lambda"))
+        chain.add_link(MarkovLink(s2, s1, "lambda_2 * lambda"))
+        _, generator = chain.generator_matrix()
+        assert_that(generator.toarray().tolist()).is_equal_to(
+            [[-1.0, 1.0], [2.0, -2.0]]
+        )
+
+    def test_unsafe_link_value(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        chain.add_link(MarkovLink(s1, s2, "__import__('os').getpid()"))
+        chain.add_link(MarkovLink(s2, s1, "1"))
+        with pytest.raises(ValueError, match="Invalid function call"):
+            chain.generator_matrix()
+        assert_that(chain.validate().counts).contains_entry({"invalid-value": 1})
+
+    def test_validate_stochastic(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        chain.add_link(MarkovLink(s1, s1, "0.25"))
+        chain.add_link(MarkovLink(s1, s2, "0.75"))
+        chain.add_link(MarkovLink(s2, s1, "0.5"))
+        assert_that(chain.validate().valid).is_true()
+        report = chain.validate(stochastic=True)
+        assert_that([v.message for v in report.violations]).is_equal_to(
+            ["Probabilities out of B sum to 0.5"]
+        )
+        assert_that(chain.validate(stochastic=True, tolerance=0.5).valid).is_true()
+
+    def test_sparse_transition_matrix(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        chain.add_state("C")
+        chain.add_link(MarkovLink(s1, s1, "0.7"))
+        chain.add_link(MarkovLink(s1, s2, "0.3"))
+        chain.add_link(MarkovLink(s2, s1, "2"))
+        chain.add_link(MarkovLink(s2, s2, "2"))
+        states, matrix = chain.sparse_transition_matrix()
+        assert_that([state.value for state in states]).is_equal_to(["A", "B", "C"])
+        assert_that(matrix.toarray().tolist()).is_equal_to(
+            [[0.7, 0.3, 0.0], [0.5, 0.5, 0.0], [0.0, 0.0, 0.0]]
+        )
+
+    def _queue_chain(self) -> MarkovChain:
+        chain = MarkovChain()
+        states = [chain.add_state(str(i)) for i in range(3)]
+        chain.add_symbols(mu=2.0)
+        for i in range(2):
+            chain.add_link(MarkovLink(states[i], states[i + 1], "1.0"))
+            chain.add_link(MarkovLink(states[i + 1], states[i], "mu"))
+        chain.add_reward(MarkovReward("queue_length", state="value"))
+        chain.add_reward(MarkovReward("utilization", state="value > 0"))
+        throughput = chain.add_reward(MarkovReward("throughput"))
+        throughput.add_transition(states[1], states[0], 1)
+        throughput.add_transition(states[2], states[1], 1)
+        return chain
+
+    @pytest.mark.parametrize("method", ["symbolic", "numeric"])
+    def test_measures(self, method) -> None:  # type: ignore[no-untyped-def]
+        chain = self._queue_chain()
+        measures = chain.measures(chain.solve(method=method))
+        assert_that(measures["queue_length"]).is_close_to(4 / 7, 1e-9)
+        assert_that(measures["utilization"]).is_close_to(3 / 7, 1e-9)
+        assert_that(measures["throughput"]).is_close_to(6 / 7, 1e-9)
+
+    def test_measures_without_rewards(self) -> None:
+        chain = self._birth_death_chain()
+        assert_that(chain.measures(chain.solve(method="numeric"))).is_empty()
+
+    def test_batch_measures(self) -> None:
+        chain = self._queue_chain()
+        solutions = [
+            SteadyStateSolution({"0": 1.0, "1": 0.0, "2": 0.0}, "numeric"),
+            SteadyStateSolution({"2": 0.5, "1": 0.5, "0": 0.0}, "numeric"),
+        ]
+        measures = chain.batch_measures(solutions)
+        assert_that(measures["queue_length"].tolist()).is_equal_to([0.0, 1.5])
+        assert_that(measures["throughput"].tolist()).is_equal_to([0.0, 2.0])
+
+    def test_measures_missing_state(self) -> None:
+        chain = self._queue_chain()
+        with pytest.raises(ValueError, match="misses state"):
+            chain.measures(SteadyStateSolution({"0": 1.0}, "numeric"))
+
+    def test_measures_undefined_variable(self) -> None:
+        chain = MarkovChain()
+        states = [chain.add_state(name) for name in ["A0B0", "A1B0", "C"]]
+        for tail, head in zip(states, states[1:] + states[:1]):
+            chain.add_link(MarkovLink(tail, head, "1.0"))
+        chain.add_reward(MarkovReward("jobs", state="A"))
+        with pytest.raises(ValueError, match="undefined in states C"):
+            chain.measures(chain.solve(method="numeric"))
+
+    def test_measures_symbol_precedence(self) -> None:
+        chain = MarkovChain()
+        idle, busy = chain.add_state("idle"), chain.add_state("busy")
+        chain.add_link(MarkovLink(idle, busy, "1.0"))
+        chain.add_link(MarkovLink(busy, idle, "2.0"))
+        chain.add_symbols(value=3.0)
+        chain.add_reward(MarkovReward("cost", state="value"))
+        measures = chain.measures(chain.solve(method="numeric"))
+        assert_that(measures["cost"]).is_close_to(3.0, 1e-12)
+
+    def test_pickle_rewards(self) -> None:
+        chain = self._queue_chain()
+        copy = pickle.loads(pickle.dumps(chain))
+        assert_that(copy.measures(copy.solve(method="numeric"))).is_equal_to(
+            chain.measures(chain.solve(method="numeric"))
+        )
+
+    def _ncd_chain(self) -> MarkovChain:
+        chain = MarkovChain()
+        states = {
+            (block, i): chain.add_state((block, i))
+            for block in range(2)
+            for i in range(2)
+        }
+        for block in range(2):
+            chain.add_link(MarkovLink(states[block, 0], states[block, 1], "5"))
+            chain.add_link(MarkovLink(states[block, 1], states[block, 0], "2"))
+        chain.add_link(MarkovLink(states[0, 1], states[1, 0], "0.001"))
+        chain.add_link(MarkovLink(states[1, 1], states[0, 0], "0.003"))
+        return chain
+
+    def test_solve_iad(self) -> None:
+        chain = self._ncd_chain()
+        solution = chain.solve(method="iad")
+        expected = chain.solve(method="numeric")
+        assert_that(solution.method).is_equal_to("iad")
+        for name, probability in expected.items():
+            assert_that(solution[name]).is_close_to(probability, 1e-9)
+        assert_that(solution.diagnostics.converged).is_true()
+
+    @pytest.mark.parametrize("preconditioner", ["none", "ilu0", "block-jacobi"])
+    def test_solve_krylov(self, preconditioner: str) -> None:
+        chain = self._ncd_chain()
+        solution = chain.solve(method="krylov", preconditioner=preconditioner)
+        expected = chain.solve(method="numeric")
+        assert_that(solution.method).is_equal_to("krylov")
+        for name, probability in expected.items():
+            assert_that(solution[name]).is_close_to(probability, 1e-8)
+        assert_that(solution.diagnostics.preconditioner).is_equal_to(preconditioner)
+
+    def test_solve_krylov_partition(self) -> None:
+        chain = self._ncd_chain()
+        solution = chain.solve(
+            method="krylov",
+            preconditioner="block-jacobi",
+            partition=lambda state: state.value[0],
+        )
+        assert_that(solution["A0B0"]).is_close_to(
+            chain.solve(method="numeric")["A0B0"], 1e-8
+        )
+
+    def test_solve_iad_partition(self) -> None:
+        chain = self._ncd_chain()
+        by_function = chain.solve(method="iad", partition=lambda state: state.value[0])
+        by_mapping = chain.solve(
+            method="iad", partition={"A0B0": "x", "A0B1": "x", "A1B0": "y", "A1B1": "y"}
+        )
+        assert_that(by_function["A0B0"]).is_close_to(by_mapping["A0B0"], 1e-9)
+
+    def test_solve_iad_invalid_partition(self) -> None:
+        with pytest.raises(ValueError, match="Cannot detect a partition"):
+            self._queue_chain().solve(method="iad")
+        with pytest.raises(ValueError, match="No block for state"):
+            self._ncd_chain().solve(method="iad", partition={"A0B0": 0})
+
+    def test_first_passage(self) -> None:
+        chain = self._queue_chain()
+        passage = chain.first_passage(["0"], moments=2)
+        # m1 = 1/3 + m2/3 and m2 = 1/2 + m1.
+        assert_that(passage["1"]).is_close_to(0.75, 1e-9)
+        assert_that(passage["2"]).is_close_to(1.25, 1e-9)
+        assert_that(passage["0"]).is_equal_to(0.0)
+        assert_that(passage.targets).is_equal_to(["0"])
+        assert_that(passage.moments.shape).is_equal_to((3, 2))
+
+    def test_first_passage_krylov(self) -> None:
+        chain = self._queue_chain()
+        passage = chain.first_passage(["0"], moments=2, preconditioner="ilut")
+        assert_that(passage["1"]).is_close_to(0.75, 1e-8)
+        assert_that(passage["2"]).is_close_to(1.25, 1e-8)
+        assert_that(passage.diagnostics.preconditioner).is_equal_to("ilut")
+
+    def test_first_passage_states(self) -> None:
+        chain = self._queue_chain()
+        passage = chain.first_passage([MarkovState("0"), "2"])
+        assert_that(passage["1"]).is_close_to(1 / 3, 1e-9)
+
+    def test_first_passage_unknown_target(self) -> None:
+        chain = self._queue_chain()
+        with pytest.raises(ValueError, match="Unknown target state"):
+            chain.first_passage(["9"])
+
+    def test_passage_time_distribution(self) -> None:
+        chain = self._queue_chain()
+        distribution = chain.passage_time_distribution(["0", "2"], [0.5, 1])
+        # From 1 the first jump, with rate 3, always hits a target.
+        assert_that(distribution["1"][0]).is_close_to(1 - math.exp(-1.5), 1e-9)
+        assert_that(distribution["1"][1]).is_close_to(1 - math.exp(-3), 1e-9)
+        assert_that(distribution["0"]).is_equal_to([1.0, 1.0])
+        assert_that(distribution.times).is_equal_to([0.5, 1.0])
+        assert_that(distribution.cdf.shape).is_equal_to((3, 2))
+
+    def test_passage_time_distribution_unknown_target(self) -> None:
+        chain = self._queue_chain()
+        with pytest.raises(ValueError, match="Unknown target state"):
+            chain.passage_time_distribution(["9"], [1.0])
+
+    def test_from_matrix(self) -> None:
+        generator = np.array([[-1.5, 1.5, 0.0], [2.0, -2.0, 0.0], [0.0, 1.0, 0.5]])
+        chain = MarkovChain.from_matrix(generator, ["A", "B", "C"])
+        links = {(link.tail.value, link.head.value, link.value) for link in chain.links}
+        assert_that(links).is_equal_to(
+            {("A", "B", 1.5), ("B", "A", 2.0), ("C", "B", 1.0), ("C", "C", 0.5)}
+        )
+        assert_that(chain.states).is_length(3)
+
+    def test_from_matrix_default_names(self) -> None:
+        chain = MarkovChain.from_matrix(np.array([[0.0, 1.0], [0.0, 0.0]]))
+        assert_that(sorted(state.value for state in chain.states)).is_equal_to(
+            ["0", "1"]
+        )
+
+    def test_from_matrix_round_trip(self) -> None:
+        chain = self._birth_death_chain()
+        states, generator = chain.generator_matrix()
+        copy = MarkovChain.from_matrix(generator, [s.value for s in states])
+        assert_that(copy.solve(method="numeric")).is_equal_to(
+            chain.solve(method="numeric")
+        )
+
+    def test_from_matrix_invalid(self) -> None:
+        with pytest.raises(ValueError, match="square"):
+            MarkovChain.from_matrix(np.zeros((2, 3)))
+        with pytest.raises(ValueError, match="Expected 2 state names"):
+            MarkovChain.from_matrix(np.zeros((2, 2)), ["A"])
+        with pytest.raises(ValueError, match="finite"):
+            MarkovChain.from_matrix(np.array([[0.0, np.nan], [1.0, 0.0]]))
+
+    @pytest.mark.parametrize("method", ["auto", "symbolic", "numeric"])
+    def test_solve_method(self, method: str) -> None:
+        chain = self._birth_death_chain()
+        solutions = chain.solve(method=method)
+        assert_that(solutions.method).is_equal_to(
+            "numeric" if method == "numeric" else "symbolic"
+        )
+        assert_that(float(solutions["0"])).is_close_to(128 / 269, 1e-12)
+        assert_that(float(solutions["3"])).is_close_to(9 / 269, 1e-12)
+
+    @pytest.mark.parametrize("method", ["symbolic", "numeric", "krylov"])
+    def test_solve_transient_states(self, method: str) -> None:
+        # A2 holds most of the mass for a long time, but is transient.
+        chain = MarkovChain()
+        a1, a2, b, c = (chain.add_state(name) for name in ("A1", "A2", "B", "C"))
+        chain.add_link(MarkovLink(a1, a2, 1000))
+        chain.add_link(MarkovLink(a2, b, 0.001))
+        chain.add_link(MarkovLink(b, c, 1000))
+        chain.add_link(MarkovLink(c, b, 1000))
+        solution = chain.solve(method=method)
+        assert_that(float(solution["A1"])).is_close_to(0.0, 1e-12)
+        assert_that(float(solution["A2"])).is_close_to(0.0, 1e-12)
+        assert_that(float(solution["B"])).is_close_to(0.5, 1e-12)
+        assert_that(float(solution["C"])).is_close_to(0.5, 1e-12)
+
+    def test_solve_unknown_method(self) -> None:
+        with pytest.raises(ValueError, match="Unknown solve method"):
+            MarkovChain().solve(method="unknown")
+
+    def test_solve_rare_states(self) -> None:
+        # Rates are not rounded: 1e-13 must not vanish.
+        chain = MarkovChain()
+        states = [chain.add_state(str(i)) for i in range(3)]
+        for tail, head in zip(states, states[1:]):
+            chain.add_link(MarkovLink(tail, head, "1e-13"))
+            chain.add_link(MarkovLink(head, tail, "1"))
+        solution = chain.solve(method="numeric")
+        total = 1.0 + 1e-13 + 1e-26
+        assert_that(solution["1"]).is_close_to(1e-13 / total, 1e-25)
+        assert_that(solution["2"]).is_close_to(1e-26 / total, 1e-38)
+        assert_that(solution.residual).is_less_than(1e-15)
+
+    @pytest.mark.parametrize("method", ["numeric", "krylov"])
+    def test_solve_refinement_precision(self, method: str) -> None:
+        chain = self._birth_death_chain()
+        solution = chain.solve(
+            method=method, refinement_steps=2, precision="longdouble"
+        )
+        _, vector = solution.as_arrays()
+        assert_that(solution.precision).is_equal_to("longdouble")
+        assert_that(vector.dtype).is_equal_to(np.longdouble)
+        assert_that(solution["3"]).is_close_to(9 / 269, 1e-15)
+        assert_that(solution.residual).is_less_than(1e-15)
+
+    def test_solve_unknown_precision(self) -> None:
+        with pytest.raises(ValueError, match="Unknown precision"):
+            self._birth_death_chain().solve(method="numeric", precision="half")
+
+    def test_solve_auto_falls_back_on_size(self) -> None:
+        chain = self._birth_death_chain()
+        solutions = chain.solve(max_symbolic_states=3)
+        assert_that(solutions.method).is_equal_to("numeric")
+        assert_that(solutions["1"]).is_close_to(96 / 269, 1e-12)
+
+    def test_solve_auto_falls_back_on_timeout(self) -> None:
+        chain = self._birth_death_chain()
+        solutions = chain.solve(symbolic_timeout=1e-9)
+        assert_that(solutions.method).is_equal_to("numeric")
+        assert_that(solutions["2"]).is_close_to(36 / 269, 1e-12)
+
+    def test_solve_symbolic_with_timeout(self) -> None:
+        chain = self._birth_death_chain()
+        solutions = chain.solve(method="symbolic", symbolic_timeout=60)
+        assert_that(solutions.method).is_equal_to("symbolic")
+        assert_that(float(solutions["0"])).is_close_to(128 / 269, 1e-12)
+
+    def test_solve_symbolic_timeout(self) -> None:
+        chain = self._birth_death_chain()
+        with pytest.raises(SymbolicTimeoutError):
+            chain.solve(method="symbolic", symbolic_timeout=1e-9)
+
+    def test_update_link(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        chain.add_link(MarkovLink(s1, s2, "0.5"))
+        updated = chain.update_link(s1, s2, "0.7")
+        assert_that(updated).is_equal_to(MarkovLink(s1, s2, "0.7"))
+        assert_that(chain.links).is_equal_to({MarkovLink(s1, s2, "0.7")})
+
+    def test_update_link_not_exists(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        assert_that(chain.update_link(s1, s2, "0.7")).is_none()
+        assert_that(chain.links).is_empty()
+
+    def test_remove_link(self) -> None:
+        chain = MarkovChain()
+        s1 = chain.add_state("A")
+        s2 = chain.add_state("B")
+        link = MarkovLink(s1, s2, 0.5)
+        chain.add_link(link)
+        assert_that(chain.remove_link(link)).is_true()
+        assert_that(chain.remove_link(link)).is_false()
+        assert_that(chain.links).is_empty()
+
+    def test_remove_state(self) -> None:
+        chain = self._birth_death_chain()
+        state = MarkovState("3")
+        assert_that(chain.remove_state(state)).is_true()
+        assert_that(chain.remove_state(state)).is_false()
+        assert_that(chain.states).does_not_contain(state)
+        assert_that(len(chain.links)).is_equal_to(4)
+        assert_that(chain.solve(method="numeric")["2"]).is_close_to(36 / 260, 1e-12)
+
+    def test_generator_matrix_after_edits(self) -> None:
+        chain = self._birth_death_chain()
+        chain.generator_matrix()
+        s0, s1, s2 = MarkovState("0"), MarkovState("1"), MarkovState("2")
+        chain.update_link(s1, s2, "2*lambda_")
+        chain.remove_link(MarkovLink(s2, s1, "2*mu"))
+        chain.add_link(MarkovLink(s2, s0, "mu"))
+
+        _, generator = chain.generator_matrix()
+        copy = MarkovChain()
+        copy.states, copy.links, copy.symbols = chain.states, chain.links, chain.symbols
+        _, expected = copy.generator_matrix()
+
+        assert_that(generator.toarray().tolist()).is_equal_to(
+            expected.toarray().tolist()
+        )
+
+    def test_generator_matrix_after_add_symbols(self) -> None:
+        chain = self._birth_death_chain()
+        chain.generator_matrix()
+        chain.add_symbols(mu=4.0)
+        _, generator = chain.generator_matrix()
+        assert_that(generator[1, 0]).is_equal_to(4.0)
+
+    def test_solve_numeric_after_update_link(self) -> None:
+        chain = self._birth_death_chain()
+        chain.solve(method="numeric")
+        chain.update_link(MarkovState("2"), MarkovState("3"), "3*lambda_")
+        solutions = chain.solve(method="numeric")
+        expected = np.array([128, 96, 36, 27]) / 287
+        assert_that(solutions["3"]).is_close_to(expected[3], 1e-12)
+        assert_that(chain._steady_state_solver.stats).is_equal_to(
+            {"factorizations": 1, "updates": 1}
+        )
+
+    def test_invalidate(self) -> None:
+        chain = self._birth_death_chain()
+        chain.generator_matrix()
+        chain.symbols["mu"] = 4.0
+        chain.invalidate()
+        _, generator = chain.generator_matrix()
+        assert_that(generator[1, 0]).is_equal_to(4.0)
+
+    def test_pickle(self) -> None:
+        chain = self._birth_death_chain()
+        chain.solve(method="numeric")
+        copy = pickle.loads(pickle.dumps(chain))
+        assert_that(copy.links).is_equal_to(chain.links)
+        assert_that(copy.solve(method="numeric")).is_equal_to(
+            chain.solve(method="numeric")
+        )
+
+    @staticmethod
+    def _birth_death_chain() -> MarkovChain:
+        chain = MarkovChain()
+        states = [chain.add_state(str(i)) for i in range(4)]
+        chain.add_symbols(lambda_=1.5, mu=2.0)
+        for i in range(3):
+            chain.add_link(MarkovLink(states[i], states[i + 1], "lambda_"))
+            chain.add_link(MarkovLink(states[i + 1], states[i], "{}*mu".format(i + 1)))
+        return chain
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+from scipy import sparse
+
+from markov_solver.model.markov_reward import (
+    MarkovReward,
+    evaluate_expression,
+    state_variables,
+)
+from markov_solver.model.markov_state import MarkovState
+
+
+class TestMarkovReward:
+    def test_state_variables_numeric(self) -> None:
+        variables = state_variables([MarkovState("0"), MarkovState("2.5")])
+        assert_that(variables["value"].tolist()).is_equal_to([0.0, 2.5])
+
+    def test_state_variables_tuple(self) -> None:
+        variables = state_variables([MarkovState((1, 2)), MarkovState("A3B4")])
+        assert_that(variables["A"].tolist()).is_equal_to([1.0, 3.0])
+        assert_that(variables["B"].tolist()).is_equal_to([2.0, 4.0])
+        assert_that(np.isnan(variables["value"]).all()).is_true()
+
+    def test_state_variables_missing(self) -> None:
+        variables = state_variables([MarkovState("Sunny"), MarkovState("A1")])
+        assert_that(np.isnan(variables["A"][0])).is_true()
+        assert_that(variables["A"][1]).is_equal_to(1.0)
+
+    def test_evaluate_expression(self) -> None:
+        result = evaluate_expression("maximum(x - 1, 0)", {"x": np.array([0, 3])})
+        assert_that(result.tolist()).is_equal_to([0, 2])
+        assert_that(evaluate_expression(2, {})).is_equal_to(2.0)
+
+    def test_evaluate_expression_invalid(self) -> None:
+        with pytest.raises(ValueError, match="Invalid reward expression"):
+            evaluate_expression("y + 1", {"x": 1})
+        with pytest.raises(ValueError, match="Invalid reward expression"):
+            evaluate_expression("open('f')", {})
+
+    def test_rewards(self) -> None:
+        s0, s1 = MarkovState("0"), MarkovState("1")
+        index = {s0: 0, s1: 1}
+        rates = sparse.csr_matrix(np.array([[0.0, 1.5], [2.0, 0.0]]))
+        reward = MarkovReward("cost", state="value * c")
+        reward.add_transition(s1, s0, "c")
+        variables = {**state_variables([s0, s1]), "c": 10.0}
+        result = reward.rewards(index, rates, variables, {"c": 10.0})
+        assert_that(result.tolist()).is_equal_to([0.0, 10.0 + 2.0 * 10.0])
+
+    def test_rewards_unknown_state(self) -> None:
+        s0 = MarkovState("0")
+        reward = MarkovReward("cost", transitions={(s0, MarkovState("9")): 1})
+        with pytest.raises(ValueError, match="unknown state"):
+            reward.rewards({s0: 0}, sparse.csr_matrix((1, 1)), {}, {})
+
+    def test_rewards_undefined_variable(self) -> None:
+        states = [MarkovState("A0B0"), MarkovState("A1B0"), MarkovState("C")]
+        index = {state: i for i, state in enumerate(states)}
+        reward = MarkovReward("jobs", state="A + B > 0")
+        with pytest.raises(ValueError, match="uses A, B, undefined in states C$"):
+            reward.rewards(
+                index, sparse.csr_matrix((3, 3)), state_variables(states), {}
+            )
+
+    def test_rewards_symbol_precedence(self) -> None:
+        states = [MarkovState("idle"), MarkovState("busy")]
+        index = {state: i for i, state in enumerate(states)}
+        variables = {**state_variables(states), "value": 3.0}
+        reward = MarkovReward("cost", state="value")
+        result = reward.rewards(
+            index, sparse.csr_matrix((2, 2)), variables, {"value": 3.0}
+        )
+        assert_that(result.tolist()).is_equal_to([3.0, 3.0])
@@ -0,0 +1,107 @@
+from typing import Tuple
+
+import numpy as np
+import pytest
+from assertpy import assert_that
+
+from markov_solver.model.operator_chain import OperatorChain, Transitions
+from markov_solver.solver.numeric import SolverError, solve_steady_state
+
+Arrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def birth_death(size: int, arrival: float = 1.0, service: float = 2.0) -> Transitions:
+    def transitions(states: np.ndarray) -> Arrays:
+        up = states[states < size - 1]
+        down = states[states > 0]
+        return (
+            np.concatenate([up, down]),
+            np.concatenate([up + 1, down - 1]),
+            np.concatenate([np.full(len(up), arrival), np.full(len(down), service)]),
+        )
+
+    return transitions
+
+
+class TestOperatorChain:
+    def test_rates_matrix(self) -> None:
+        chain = OperatorChain(3, birth_death(3), batch_size=2)
+        assert_that(chain.rates_matrix().toarray().tolist()).is_equal_to(
+            [[0.0, 1.0, 0.0], [2.0, 0.0, 1.0], [0.0, 2.0, 0.0]]
+        )
+        assert_that(chain.diagonal().tolist()).is_equal_to([-1.0, -3.0, -2.0])
+
+    def test_vector_product(self) -> None:
+        chain = OperatorChain(50, birth_death(50), batch_size=7)
+        rates = chain.rates_matrix()
+        generator = rates.toarray() - np.diag(rates.sum(axis=1).A1)
+        x = np.random.default_rng(3).random(50)
+        assert_that(np.allclose(chain.vector_product(x), x @ generator)).is_true()
+        assert_that(np.allclose(chain.operator() @ x, x @ generator)).is_true()
+
+    def test_ignores_self_loops_and_sums_duplicates(self) -> None:
+        def transitions(states: np.ndarray) -> Arrays:
+            return (
+                np.array([0, 0, 0, 1]),
+                np.array([0, 1, 1, 0]),
+                np.array([5.0, 1.0, 2.0, 4.0]),
+            )
+
+        chain = OperatorChain(2, transitions)
+        assert_that(chain.rates_matrix().toarray().tolist()).is_equal_to(
+            [[0.0, 3.0], [4.0, 0.0]]
+        )
+
+    @pytest.mark.parametrize("preconditioner", ["none", "jacobi"])
+    def test_solve(self, preconditioner: str) -> None:
+        chain = OperatorChain(20, birth_death(20), batch_size=8)
+        solution = chain.solve(preconditioner=preconditioner)
+        rates = chain.rates_matrix()
+        generator = rates - np.diag(rates.sum(axis=1).A1)
+        expected = solve_steady_state(generator)
+        assert_that(solution.method).is_equal_to("krylov")
+        assert_that(solution["0"]).is_close_to(expected[0], 1e-9)
+        assert_that(solution.residual).is_less_than(1e-9)
+        assert_that(solution.diagnostics.preconditioner).is_equal_to(preconditioner)
+
+    def test_solve_names(self) -> None:
+        chain = OperatorChain(2, birth_death(2), names=["idle", "busy"])
+        solution = chain.solve(method="krylov")
+        assert_that(solution["idle"]).is_close_to(2 / 3, 1e-9)
+
+    def test_solve_invalid(self) -> None:
+        chain = OperatorChain(3, birth_death(3))
+        with pytest.raises(ValueError, match="Unknown solve method"):
+            chain.solve(method="numeric")
+        with pytest.raises(ValueError, match="needs the matrix"):
+            chain.solve(preconditioner="ilu0")
+
+    def test_solve_reducible(self) -> None:
+        chain = OperatorChain(3, lambda states: (states[:0], states[:0], states[:0]))
+        with pytest.raises(SolverError):
+            chain.solve()
+
+    def test_to_chain(self) -> None:
+        chain = OperatorChain(3, birth_death(3)).to_chain()
+        assert_that(chain.solve(method="numeric")["0"]).is_close_to(4 / 7, 1e-12)
+
+    def test_invalid_transitions(self) -> None:
+        with pytest.raises(ValueError, match="out of the states"):
+            OperatorChain(2, birth_death(3)).diagonal()
+        # Transitions of state 0 returned for every batch.
+        foreign = OperatorChain(
+            3,
+            lambda batch: (np.array([0]), np.array([1]), np.array([1.0])),
+            batch_size=1,
+        )
+        with pytest.raises(ValueError, match="outside the batch 1..1"):
+            foreign.vector_product(np.ones(3))
+        negative = OperatorChain(3, birth_death(3, arrival=-1.0))
+        with pytest.raises(ValueError, match="non-negative"):
+            negative.diagonal()
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError, match="Expected 2 state names"):
+            OperatorChain(2, birth_death(2), names=["A"])
+        with pytest.raises(ValueError, match="batch size"):
+            OperatorChain(2, birth_death(2), batch_size=0)
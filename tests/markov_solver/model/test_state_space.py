@@ -0,0 +1,94 @@
+from typing import Iterator, Tuple
+
+import pytest
+from assertpy import assert_that
+
+from markov_solver.model.markov_state import MarkovState
+from markov_solver.model.state_space import (
+    ExplorationError,
+    explore,
+    partition_of,
+)
+
+CAPACITY = 6
+
+
+def tandem(state: Tuple[int, int]) -> Iterator[Tuple[Tuple[int, int], float]]:
+    i, j = state
+    if i < CAPACITY:
+        yield (i + 1, j), 1.0
+    if i > 0 and j < CAPACITY:
+        yield (i - 1, j + 1), 2.0
+    if j > 0:
+        yield (i, j - 1), 3.0
+
+
+def birth_death(state: int) -> Iterator[Tuple[int, float]]:
+    if state < 3:
+        yield state + 1, 1.0
+    if state > 0:
+        yield state - 1, 2.0
+
+
+def failing(state: int) -> Iterator[Tuple[int, float]]:
+    if state == 2:
+        raise RuntimeError("Boom")
+    yield state + 1, 1.0
+
+
+def transitions(space) -> dict:  # type: ignore[no-untyped-def,type-arg]
+    coo = space.rates.tocoo()
+    return {
+        (space.states[row], space.states[col]): value
+        for row, col, value in zip(coo.row.tolist(), coo.col.tolist(), coo.data)
+    }
+
+
+class TestStateSpace:
+    def test_explore(self) -> None:
+        space = explore([0], birth_death)
+        assert_that(space.states).is_equal_to([0, 1, 2, 3])
+        assert_that(space.rates.toarray().tolist()).is_equal_to(
+            [[0, 1, 0, 0], [2, 0, 1, 0], [0, 2, 0, 1], [0, 0, 2, 0]]
+        )
+        assert_that(space.throughput).is_positive()
+
+    @pytest.mark.parametrize("workers", [1, 4, 16])
+    def test_explore_workers(self, workers: int) -> None:
+        space = explore([(0, 0)], tandem, workers=workers, batch_size=3)
+        assert_that(len(space)).is_equal_to((CAPACITY + 1) ** 2)
+        assert_that(transitions(space)).is_equal_to(
+            transitions(explore([(0, 0)], tandem))
+        )
+
+    def test_explore_duplicates(self) -> None:
+        space = explore(
+            [0, 0], lambda state: [(1, 1.0), (1, 2.0)] if state == 0 else []
+        )
+        assert_that(transitions(space)).is_equal_to({(0, 1): 3.0})
+
+    def test_to_chain(self) -> None:
+        chain = explore([0], birth_death).to_chain()
+        solution = chain.solve(method="numeric")
+        # Birth-death chain with ratio 1/2.
+        assert_that(solution["0"]).is_close_to(8 / 15, 1e-9)
+        assert_that(solution["3"]).is_close_to(1 / 15, 1e-9)
+
+    def test_to_chain_tuples(self) -> None:
+        chain = explore([(0, 0)], tandem).to_chain()
+        assert_that(chain.states).contains(MarkovState((1, 0)))
+        assert_that(chain.solve(method="numeric")).contains_key("A1B0")
+
+    def test_explore_failure(self) -> None:
+        with pytest.raises(ExplorationError, match="Boom"):
+            explore([0], failing, workers=2)
+
+    def test_explore_invalid(self) -> None:
+        with pytest.raises(ValueError, match="workers"):
+            explore([0], birth_death, workers=0)
+        with pytest.raises(ValueError, match="batch size"):
+            explore([0], birth_death, batch_size=0)
+
+    def test_partition_of(self) -> None:
+        assert_that(partition_of((1, 2), 4)).is_equal_to(partition_of((1, 2), 4))
+        assert_that(partition_of((1, 2), 4)).is_between(0, 3)
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+
+from markov_solver.model.validation import (
+    ChainValidationError,
+    ValidationReport,
+    check_reachability,
+    check_row_sums,
+    check_values,
+)
+
+NAMES = ["A", "B", "C"]
+
+
+class TestValidation:
+    def test_empty_report(self) -> None:
+        report = ValidationReport()
+        assert_that(report.valid).is_true()
+        assert_that(str(report)).is_equal_to("No violations")
+        report.raise_if_invalid()
+
+    def test_report_limits_described_violations(self) -> None:
+        report = ValidationReport(max_reported=2)
+        report.add("negative-rate", ("link {}".format(i) for i in range(1000)), 1000)
+        assert_that(report.counts).is_equal_to({"negative-rate": 1000})
+        assert_that(report.errors).is_length(2)
+        assert_that(str(report)).contains("1000 negative-rate (error)")
+        assert_that(str(report)).contains("... and 998 more")
+
+    def test_report_warnings_are_valid(self) -> None:
+        report = ValidationReport()
+        report.add("unreachable-state", ["State C"], 1)
+        assert_that(report.valid).is_true()
+        assert_that(report.warnings).is_length(1)
+
+    def test_raise_if_invalid(self) -> None:
+        report = ValidationReport()
+        report.add("row-sum", ["Probabilities out of A sum to 0.5"], 1)
+        with pytest.raises(ChainValidationError, match="sum to 0.5") as e:
+            report.raise_if_invalid()
+        assert_that(e.value.report).is_same_as(report)
+
+    def test_check_values(self) -> None:
+        report = ValidationReport()
+        check_values(
+            report,
+            NAMES,
+            np.array([0, 1, 2]),
+            np.array([1, 2, 0]),
+            np.array([1.0, -2.0, np.nan]),
+        )
+        assert_that(report.violations).is_length(1)
+        assert_that(report.violations[0].message).is_equal_to(
+            "Link B -> C has value -2.0"
+        )
+
+    def test_check_row_sums(self) -> None:
+        report = ValidationReport()
+        check_row_sums(
+            report,
+            NAMES,
+            np.array([0, 0, 1, 2]),
+            np.array([0.5, 0.5 + 1e-12, 0.7, np.nan]),
+        )
+        # C has an unevaluated link.
+        assert_that([v.message for v in report.violations]).is_equal_to(
+            ["Probabilities out of B sum to 0.7"]
+        )
+
+    def test_check_reachability_transient(self) -> None:
+        report = ValidationReport()
+        check_reachability(
+            report,
+            NAMES,
+            np.array([0, 1, 2]),
+            np.array([1, 0, 0]),
+            np.array([1.0, 1.0, 1.0]),
+        )
+        assert_that(report.counts).is_equal_to({"unreachable-state": 1})
+        assert_that(report.violations[0].message).contains("State C")
+
+    def test_check_reachability_reducible(self) -> None:
+        report = ValidationReport()
+        # The zero link does not connect A to B.
+        check_reachability(
+            report,
+            NAMES,
+            np.array([0, 2, 2]),
+            np.array([1, 0, 1]),
+            np.array([0.0, 1.0, 1.0]),
+        )
+        assert_that(report.counts).is_equal_to({"reducible": 1})
+        assert_that(report.violations[0].message).starts_with("2 closed classes")
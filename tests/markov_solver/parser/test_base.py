@@ -0,0 +1,59 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Tests for parser base helpers."""
+
+import gc
+from unittest import mock
+
+import pytest
+
+from markov_solver.parser.base import ParserError, gc_paused, load_document
+
+
+class TestLoadDocument:
+    """Tests for load_document."""
+
+    def test_load_json_uses_json_parser(self) -> None:
+        """Test JSON documents do not go through the YAML loader."""
+        with mock.patch("markov_solver.parser.base.yaml.load") as yaml_load:
+            data = load_document('  {"chain": [{"from": "A"}]}')
+
+        assert data == {"chain": [{"from": "A"}]}
+        yaml_load.assert_not_called()
+
+    def test_load_yaml(self) -> None:
+        """Test YAML documents are loaded."""
+        assert load_document("chain:\n  - from: A\n") == {"chain": [{"from": "A"}]}
+
+    def test_load_yaml_flow_style(self) -> None:
+        """Test YAML flow style that is not valid JSON falls back to YAML."""
+        assert load_document("{chain: [{from: A}]}") == {"chain": [{"from": "A"}]}
+
+    def test_load_invalid(self) -> None:
+        """Test invalid documents raise ParserError."""
+        with pytest.raises(ParserError, match="Invalid YAML/JSON"):
+            load_document("{chain: [")
+
+
+class TestGcPaused:
+    """Tests for gc_paused."""
+
+    def test_gc_paused(self) -> None:
+        """Test the collector is paused and restored, even on errors."""
+        with pytest.raises(ValueError):
+            with gc_paused():
+                assert not gc.isenabled()
+                raise ValueError()
+
+        assert gc.isenabled()
+
+    def test_gc_paused_keeps_disabled(self) -> None:
+        """Test a collector disabled by the caller stays disabled."""
+        gc.disable()
+        try:
+            with gc_paused():
+                pass
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
@@ -111,6 +111,106 @@ chain:
         with pytest.raises(ParserError, match="Invalid chain definition"):
             self.parser.parse(content)
 
+    def test_parse_json_with_symbols(self) -> None:
+        """Test parsing JSON format with symbols."""
+        content = (
+            '{"symbols": {"mu": 2}, '
+            '"chain": [{"from": "A", "to": "B", "value": "mu"}]}'
+        )
+        mc = self.parser.parse(content)
+
+        assert mc.symbols == {"mu": 2.0}
+        assert {link.value for link in mc.links} == {"mu"}
+
+    def test_parse_json_invalid_value_type(self) -> None:
+        """Test non-string link values are rejected by validation."""
+        content = '{"chain": [{"from": "A", "to": "B", "value": 0.5}]}'
+        with pytest.raises(ParserError, match="chain.0.value"):
+            self.parser.parse(content)
+
+    def test_parse_shares_states(self) -> None:
+        """Test links referencing the same state share one MarkovState."""
+        content = """
+chain:
+  - from: "A"
+    to: "B"
+    value: "1.0"
+  - from: "B"
+    to: "A"
+    value: "1.0"
+"""
+        mc = self.parser.parse(content)
+
+        links = sorted(mc.links)
+        assert links[0].tail is links[1].head
+
+    def test_parse_rewards(self) -> None:
+        """Test parsing reward structures."""
+        content = """
+chain:
+  - from: "0"
+    to: "1"
+    value: "1.0"
+  - from: "1"
+    to: "0"
+    value: "2.0"
+rewards:
+  queue_length:
+    state: "value"
+  throughput:
+    transitions:
+      - from: "1"
+        to: "0"
+        value: 1
+"""
+        mc = self.parser.parse(content)
+
+        assert set(mc.rewards) == {"queue_length", "throughput"}
+        assert mc.rewards["queue_length"].state == "value"
+        assert list(mc.rewards["throughput"].transitions.values()) == [1]
+        measures = mc.measures(mc.solve(method="numeric"))
+        assert measures["queue_length"] == pytest.approx(1 / 3)
+        assert measures["throughput"] == pytest.approx(2 / 3)
+
+    def test_parse_invalid_rewards(self) -> None:
+        """Test invalid reward structures raise ParserError."""
+        content = """
+chain:
+  - from: "0"
+    to: "1"
+    value: "1.0"
+rewards:
+  throughput:
+    transitions:
+      - from: "1"
+        value: 1
+"""
+        with pytest.raises(ParserError, match="rewards.throughput.transitions.0.to"):
+            self.parser.parse(content)
+
+    def test_parse_trusted_rewards(self) -> None:
+        """Test trusted mode also reads reward structures."""
+        content = (
+            '{"chain": [{"from": "A", "to": "B", "value": "1"}],'
+            ' "rewards": {"cost": {"state": 2}}}'
+        )
+        mc = ChainFormatParser(trusted=True).parse(content)
+
+        assert mc.rewards["cost"].state == 2
+
+    def test_parse_trusted(self) -> None:
+        """Test parsing in trusted mode skips validation."""
+        content = '{"chain": [{"from": "A", "to": "B", "value": 0.5}]}'
+        mc = ChainFormatParser(trusted=True).parse(content)
+
+        assert len(mc.states) == 2
+        assert {link.value for link in mc.links} == {"0.5"}
+
+    def test_parse_trusted_missing_chain_field(self) -> None:
+        """Test trusted mode still reports a missing chain field."""
+        with pytest.raises(ParserError, match="Invalid chain definition"):
+            ChainFormatParser(trusted=True).parse("symbols:\n  x: 1.0")
+
     def test_supports_extension_yaml(self) -> None:
         """Test supports_extension for .yaml."""
         assert self.parser.supports_extension(".yaml") is True
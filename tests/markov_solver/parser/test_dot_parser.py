@@ -3,9 +3,21 @@
 
 """Tests for DotParser."""
 
+import io
+
 import pytest
 
-from markov_solver.parser.dot_parser import DotParser, ParserError
+from markov_solver.parser.dot_parser import (
+    DotParser,
+    DotTokenizer,
+    ParserError,
+    _DotReader,
+)
+
+
+def _links(content: str) -> set[tuple[str, str, str]]:
+    mc = DotParser().parse(content)
+    return {(link.tail.value, link.head.value, link.value) for link in mc.links}
 
 
 class TestDotParser:
@@ -167,3 +179,112 @@ class TestDotParser:
 
         assert len(mc.states) == 3
         assert len(mc.links) == 2
+
+    def test_parse_edge_chain(self) -> None:
+        """Test edge chains add one link per hop, with the shared label."""
+        assert _links("digraph { a -> b -> c [label=0.5] }") == {
+            ("a", "b", "0.5"),
+            ("b", "c", "0.5"),
+        }
+
+    def test_parse_attribute_list(self) -> None:
+        """Test attribute lists with several keys and separators."""
+        content = 'digraph { a -> b [color=red, label="mu"; weight=2] [style=bold] }'
+        assert _links(content) == {("a", "b", "mu")}
+
+    def test_parse_quoted_names_with_spaces(self) -> None:
+        """Test quoted names with spaces, escapes and concatenation."""
+        content = r'digraph { "state one" -> "say \"hi\"" [label="2*" + "mu"] }'
+        assert _links(content) == {("state one", 'say "hi"', "2*mu")}
+
+    def test_parse_subgraphs(self) -> None:
+        """Test subgraphs as edge endpoints expand to all their nodes."""
+        content = """digraph {
+    subgraph cluster_0 { a; b -> c }
+    { a b } -> d [label=lambda]
+}"""
+        assert _links(content) == {
+            ("b", "c", "1.0"),
+            ("a", "d", "lambda"),
+            ("b", "d", "lambda"),
+        }
+
+    def test_parse_edge_defaults(self) -> None:
+        """Test edge attribute defaults, scoped by subgraph."""
+        content = """digraph {
+    edge [label=mu]
+    a -> b
+    subgraph { edge [label=lambda] b -> c }
+    c -> a
+    c -> b [label=2]
+}"""
+        assert _links(content) == {
+            ("a", "b", "mu"),
+            ("b", "c", "lambda"),
+            ("c", "a", "mu"),
+            ("c", "b", "2"),
+        }
+
+    def test_parse_undirected_graph(self) -> None:
+        """Test undirected edges add a link in both directions."""
+        assert _links("strict graph g { a -- b [label=0.5] }") == {
+            ("a", "b", "0.5"),
+            ("b", "a", "0.5"),
+        }
+
+    def test_parse_comments_ports_and_graph_attributes(self) -> None:
+        """Test comments, ports, HTML labels and graph attributes are handled."""
+        content = """# generated
+digraph G {
+    rankdir=LR; /* block
+    comment */ node [shape=circle]
+    a:n -> b:port:s [label=<0.<b>5</b>>] // trailing
+}"""
+        assert _links(content) == {("a", "b", "0.<b>5</b>")}
+
+    def test_parse_node_statements(self) -> None:
+        """Test node statements add states, even without edges."""
+        mc = DotParser().parse("digraph { c [label=C]; a -> b }")
+
+        assert {state.value for state in mc.states} == {"a", "b", "c"}
+
+    def test_parse_syntax_error(self) -> None:
+        """Test syntax errors report the line number."""
+        with pytest.raises(ParserError, match="line 3: expected an identifier"):
+            self.parser.parse("digraph {\n  a -> b\n  b -> ]\n}")
+        with pytest.raises(ParserError, match="line 2: .*found end of file"):
+            self.parser.parse("digraph {\n  a -> b")
+
+    def test_parse_unterminated_string(self) -> None:
+        """Test unterminated strings raise ParserError."""
+        with pytest.raises(ParserError, match="Invalid DOT syntax at line 1"):
+            self.parser.parse('digraph { a -> "b }')
+
+    def test_parse_stream_chunks(self) -> None:
+        """Test tokens cut at chunk boundaries are reassembled."""
+        content = (
+            'digraph {\n  "long\nname" -> b /* a\n comment */ [label=<<b>1</b>>]\n}'
+        )
+        expected = list(DotTokenizer(io.StringIO(content)))
+
+        for chunk_size in range(1, 8):
+            stream = io.StringIO(content)
+            assert list(DotTokenizer(stream, chunk_size=chunk_size)) == expected
+
+        mc = DotParser().parse(content)
+        assert {link.tail.value for link in mc.links} == {"long\nname"}
+
+    def test_parse_chunk_boundaries(self) -> None:
+        """Test statements cut at chunk boundaries parse as a whole."""
+        content = (
+            "digraph {\n"
+            + "\n".join(
+                f"S{i} -> S{(i + 1) % 50} [label={i}]; S{i} -> S{i}" for i in range(50)
+            )
+            + "\n}"
+        )
+        expected = DotParser().parse(content).links
+
+        for chunk_size in (1, 7, 64):
+            tokenizer = DotTokenizer(io.StringIO(content), chunk_size=chunk_size)
+            assert _DotReader(tokenizer).read().links == expected
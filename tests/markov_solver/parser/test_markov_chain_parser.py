@@ -3,6 +3,8 @@
 
 """Tests for MarkovChainParser and helper functions."""
 
+import asyncio
+import io
 import tempfile
 from pathlib import Path
 
@@ -12,7 +14,9 @@ from markov_solver.parser.markov_chain_parser import (
     FormatParser,
     ParserError,
     MarkovChainParser,
+    async_create_chain_from_file,
     create_chain_from_file,
+    create_chain_from_stream,
     create_chain_from_string,
     get_parser,
 )
@@ -28,7 +32,7 @@ class TestMarkovChainParser:
 
     def test_init_registers_default_parsers(self) -> None:
         """Test that default parsers are registered on init."""
-        assert len(self.parser._format_parsers) == 3
+        assert len(self.parser._format_parsers) == 6
 
     def test_register_parser(self) -> None:
         """Test registering a custom parser."""
@@ -129,6 +133,70 @@ chain:
         assert len(mc.states) == 2
         Path(f.name).unlink()
 
+    def test_create_chain_from_ndjson_file(self, tmp_path: Path) -> None:
+        """Test creating chain from a JSON-lines file."""
+        path = tmp_path / "chain.ndjson"
+        path.write_text('{"from": "A", "to": "B", "value": "1.0"}\n')
+
+        mc = create_chain_from_file(path)
+
+        assert len(mc.states) == 2
+
+
+class TestCreateChainFromStream:
+    """Tests for create_chain_from_stream function."""
+
+    def test_create_chain_from_stream(self) -> None:
+        """Test creating chain from a JSON-lines stream."""
+        stream = io.StringIO('{"from": "A", "to": "B", "value": "1.0"}\n')
+
+        mc = create_chain_from_stream(stream)
+
+        assert len(mc.states) == 2
+
+    def test_create_chain_from_stream_format(self) -> None:
+        """Test creating chain from a stream in another format."""
+        stream = io.StringIO("A -> B [label=0.5]")
+
+        mc = create_chain_from_stream(stream, format_type="dot")
+
+        assert len(mc.states) == 2
+
+
+class TestAsyncCreateChainFromFile:
+    """Tests for async_create_chain_from_file function."""
+
+    def test_async_create_chain_from_file(self, tmp_path: Path) -> None:
+        """Test creating chains concurrently from YAML files."""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"chain{i}.yaml"
+            path.write_text(f"""
+chain:
+  - from: "A{i}"
+    to: "B{i}"
+    value: "1.0"
+""")
+            paths.append(path)
+
+        async def load_all() -> list[MarkovChain]:
+            return await asyncio.gather(
+                *(async_create_chain_from_file(p) for p in paths)
+            )
+
+        chains = asyncio.run(load_all())
+
+        assert [sorted(s.value for s in mc.states) for mc in chains] == [
+            ["A0", "B0"],
+            ["A1", "B1"],
+            ["A2", "B2"],
+        ]
+
+    def test_async_create_chain_from_file_not_found(self) -> None:
+        """Test parser errors are propagated to the awaiting task."""
+        with pytest.raises(ParserError, match="File not found"):
+            asyncio.run(async_create_chain_from_file("/nonexistent/file.yaml"))
+
 
 class TestCreateChainFromString:
     """Tests for create_chain_from_string function."""
@@ -171,6 +239,12 @@ B,0.5,0"""
         mc = create_chain_from_string(content, format_type="csv")
         assert len(mc.states) == 2
 
+    def test_create_ndjson_format(self) -> None:
+        """Test creating chain with JSON-lines format."""
+        content = '{"from": "A", "to": "B", "value": "0.5"}\n'
+        mc = create_chain_from_string(content, format_type="ndjson")
+        assert len(mc.states) == 2
+
     def test_create_unknown_format(self) -> None:
         """Test creating chain with unknown format raises ParserError."""
         with pytest.raises(ParserError, match="Unknown format type"):
@@ -0,0 +1,98 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Tests for NdjsonParser."""
+
+import io
+
+import pytest
+
+from markov_solver.parser.ndjson_parser import NdjsonParser, ParserError
+
+CONTENT = """{"symbols": {"lambda": 1.5, "mu": "2.0"}}
+{"from": "S0", "to": "S1", "value": "lambda"}
+
+{"from": "S1", "to": "S0", "value": "mu"}
+"""
+
+
+class TestNdjsonParser:
+    """Tests for NdjsonParser."""
+
+    def setup_method(self) -> None:
+        """Set up test fixtures."""
+        self.parser = NdjsonParser()
+
+    def test_parse(self) -> None:
+        """Test parsing links and the symbols header."""
+        mc = self.parser.parse(CONTENT)
+
+        assert len(mc.states) == 2
+        assert len(mc.links) == 2
+        assert mc.symbols == {"lambda": 1.5, "mu": 2.0}
+
+    def test_parse_stream_reads_incrementally(self) -> None:
+        """Test the stream is consumed line by line, not read at once."""
+
+        class LineStream(io.StringIO):
+            def read(self, size: int | None = -1) -> str:
+                raise AssertionError("read() should not be called")
+
+        mc = self.parser.parse_stream(LineStream(CONTENT))
+
+        assert len(mc.links) == 2
+
+    def test_parse_shares_states(self) -> None:
+        """Test links reuse the same state objects."""
+        mc = self.parser.parse(CONTENT)
+
+        assert len({id(s) for link in mc.links for s in (link.tail, link.head)}) == 2
+
+    def test_parse_solve(self) -> None:
+        """Test the parsed chain can be solved."""
+        solution = self.parser.parse(CONTENT).solve(method="numeric")
+
+        assert solution["S0"] == pytest.approx(2.0 / 3.5)
+
+    def test_parse_empty(self) -> None:
+        """Test content without links raises ParserError."""
+        with pytest.raises(ParserError, match="Empty definition file"):
+            self.parser.parse('\n{"symbols": {"a": 1}}\n')
+
+    def test_parse_invalid_json(self) -> None:
+        """Test invalid JSON reports the line number."""
+        with pytest.raises(ParserError, match="Invalid JSON at line 2"):
+            self.parser.parse('{"from": "A", "to": "B", "value": "1"}\n{"from"\n')
+
+    def test_parse_invalid_link(self) -> None:
+        """Test invalid links report the line number and field."""
+        with pytest.raises(ParserError, match="Invalid link at line 1: to"):
+            self.parser.parse('{"from": "A", "value": "1"}\n')
+
+    def test_parse_invalid_symbols(self) -> None:
+        """Test invalid symbols raise ParserError."""
+        with pytest.raises(ParserError, match="Invalid symbols at line 1"):
+            self.parser.parse('{"symbols": ["a"]}\n')
+
+    def test_parse_late_symbols(self) -> None:
+        """Test a symbols header after links raises ParserError."""
+        content = '{"from": "A", "to": "B", "value": "1"}\n{"symbols": {"a": 1}}\n'
+        with pytest.raises(ParserError, match="must be the first record"):
+            self.parser.parse(content)
+
+    def test_parse_trusted(self) -> None:
+        """Test trusted mode skips validation but still builds the chain."""
+        mc = NdjsonParser(trusted=True).parse(CONTENT)
+
+        assert len(mc.links) == 2
+
+    def test_parse_trusted_missing_field(self) -> None:
+        """Test trusted mode reports malformed links as ParserError."""
+        with pytest.raises(ParserError, match="Invalid link at line 1"):
+            NdjsonParser(trusted=True).parse('{"from": "A"}\n')
+
+    def test_supports_extension(self) -> None:
+        """Test extension support."""
+        assert self.parser.supports_extension(".ndjson")
+        assert self.parser.supports_extension(".JSONL")
+        assert not self.parser.supports_extension(".json")
@@ -0,0 +1,156 @@
+# Copyright (c) 2026, Giacomo Marciani
+# Licensed under the MIT License
+
+"""Tests for MatrixMarketParser and NumpyParser."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from markov_solver.parser.sparse_parser import (
+    MatrixMarketParser,
+    NumpyParser,
+    ParserError,
+)
+
+MTX_CONTENT = """%%MatrixMarket matrix coordinate real general
+% a generator matrix
+3 3 5
+1 1 -1.5
+1 2 1.5
+2 1 2
+2 2 -2
+3 2 0.5
+"""
+
+GENERATOR = np.array([[-1.5, 1.5, 0.0], [2.0, -2.0, 0.0], [0.0, 0.5, -0.5]])
+
+
+def _links(mc) -> set[tuple[str, str, str]]:  # type: ignore[no-untyped-def]
+    return {(link.tail.value, link.head.value, link.value) for link in mc.links}
+
+
+class TestMatrixMarketParser:
+    """Tests for MatrixMarketParser."""
+
+    def setup_method(self) -> None:
+        """Set up test fixtures."""
+        self.parser = MatrixMarketParser()
+
+    def test_parse(self) -> None:
+        """Test parsing content names states after the row indices."""
+        mc = self.parser.parse(MTX_CONTENT)
+
+        assert _links(mc) == {("0", "1", 1.5), ("1", "0", 2.0), ("2", "1", 0.5)}
+
+    def test_parse_path_with_sidecar(self, tmp_path: Path) -> None:
+        """Test state names are read from the sidecar file."""
+        path = tmp_path / "chain.mtx"
+        path.write_text(MTX_CONTENT)
+        (tmp_path / "chain.states").write_text("A\nB\nC\n")
+
+        mc = self.parser.parse_path(path)
+
+        assert _links(mc) == {("A", "B", 1.5), ("B", "A", 2.0), ("C", "B", 0.5)}
+
+    def test_parse_path_sidecar_mismatch(self, tmp_path: Path) -> None:
+        """Test a sidecar with the wrong number of names raises ParserError."""
+        path = tmp_path / "chain.mtx"
+        path.write_text(MTX_CONTENT)
+        (tmp_path / "chain.states").write_text("A\nB\n")
+
+        with pytest.raises(ParserError, match="Expected 3 state names"):
+            self.parser.parse_path(path)
+
+    def test_parse_invalid(self) -> None:
+        """Test invalid content raises ParserError."""
+        with pytest.raises(ParserError, match="Invalid Matrix Market file"):
+            self.parser.parse("not a matrix")
+
+    def test_supports_extension(self) -> None:
+        """Test extension support."""
+        assert self.parser.supports_extension(".mtx")
+        assert self.parser.supports_extension(".MTX")
+        assert not self.parser.supports_extension(".npz")
+
+
+class TestNumpyParser:
+    """Tests for NumpyParser."""
+
+    def setup_method(self) -> None:
+        """Set up test fixtures."""
+        self.parser = NumpyParser()
+
+    def test_parse_sparse_npz(self, tmp_path: Path) -> None:
+        """Test parsing a matrix saved with scipy.sparse.save_npz."""
+        path = tmp_path / "chain.npz"
+        sparse.save_npz(path, sparse.csr_matrix(GENERATOR))
+
+        mc = self.parser.parse_path(path)
+
+        assert _links(mc) == {("0", "1", 1.5), ("1", "0", 2.0), ("2", "1", 0.5)}
+
+    def test_parse_sparse_npz_with_sidecar(self, tmp_path: Path) -> None:
+        """Test state names are read from the sidecar file."""
+        path = tmp_path / "chain.npz"
+        sparse.save_npz(path, sparse.coo_matrix(GENERATOR))
+        (tmp_path / "chain.states").write_text("A\nB\nC\n")
+
+        mc = self.parser.parse_path(path)
+
+        assert ("C", "B", 0.5) in _links(mc)
+
+    def test_parse_dense_npz_with_states(self, tmp_path: Path) -> None:
+        """Test parsing a dense array archive with a states array."""
+        path = tmp_path / "chain.npz"
+        np.savez(path, generator=GENERATOR, states=np.array(["A", "B", "C"]))
+
+        mc = self.parser.parse_path(path)
+
+        assert ("C", "B", 0.5) in _links(mc)
+
+    def test_parse_npy(self, tmp_path: Path) -> None:
+        """Test parsing a dense array saved with numpy.save."""
+        path = tmp_path / "chain.npy"
+        np.save(path, GENERATOR)
+
+        mc = self.parser.parse_path(path)
+
+        assert len(mc.links) == 3
+
+    def test_parse_npz_several_arrays(self, tmp_path: Path) -> None:
+        """Test archives with several dense arrays raise ParserError."""
+        path = tmp_path / "chain.npz"
+        np.savez(path, a=GENERATOR, b=GENERATOR)
+
+        with pytest.raises(ParserError, match="single dense array"):
+            self.parser.parse_path(path)
+
+    def test_parse_not_square(self, tmp_path: Path) -> None:
+        """Test non-square matrices raise ParserError."""
+        path = tmp_path / "chain.npy"
+        np.save(path, np.zeros((2, 3)))
+
+        with pytest.raises(ParserError, match="Invalid matrix"):
+            self.parser.parse_path(path)
+
+    def test_parse_corrupted(self, tmp_path: Path) -> None:
+        """Test corrupted files raise ParserError."""
+        path = tmp_path / "chain.npz"
+        path.write_bytes(b"not an archive")
+
+        with pytest.raises(ParserError, match="Invalid NumPy file"):
+            self.parser.parse_path(path)
+
+    def test_parse_content(self) -> None:
+        """Test parsing content raises ParserError."""
+        with pytest.raises(ParserError, match="binary"):
+            self.parser.parse("content")
+
+    def test_supports_extension(self) -> None:
+        """Test extension support."""
+        assert self.parser.supports_extension(".npz")
+        assert self.parser.supports_extension(".npy")
+        assert not self.parser.supports_extension(".mtx")
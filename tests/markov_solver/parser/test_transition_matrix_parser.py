@@ -53,6 +53,29 @@ transitions:
         assert len(mc.states) == 2
         assert len(mc.links) == 3
 
+    def test_parse_rewards(self) -> None:
+        """Test parsing reward structures."""
+        content = """
+states: ["A1", "A0"]
+transitions:
+  A0:
+    A1: 0.5
+  A1:
+    A0: 0.5
+rewards:
+  busy:
+    state: "A"
+  completions:
+    transitions:
+      - from: A1
+        to: A0
+        value: "2"
+"""
+        mc = self.parser.parse(content)
+
+        measures = mc.measures(mc.solve(method="numeric"))
+        assert measures == pytest.approx({"busy": 0.5, "completions": 0.5})
+
     def test_parse_with_symbols(self) -> None:
         """Test parsing with symbols."""
         content = """
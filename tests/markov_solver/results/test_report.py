@@ -1,6 +1,19 @@
+import numpy as np
+import pytest
 from assertpy import assert_that
 
-from markov_solver.results.report import SimpleReport
+from markov_solver.results.report import (
+    PassageReport,
+    ReportWriter,
+    SimpleReport,
+    SolutionReport,
+)
+from markov_solver.results.solution import (
+    PassageTimeDistribution,
+    PassageTimeSolution,
+    SteadyStateSolution,
+)
+from markov_solver.solver.numeric import ConvergenceDiagnostics
 
 
 class TestSimpleReport:
@@ -101,6 +114,29 @@ class TestSimpleReport:
         assert_that(content).contains("name")
         assert_that(content).contains("Test Report")
 
+    def test_save_txt_append_empty(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "report.txt"
+        test_file.write_text("Old content")
+        report = SimpleReport("Test Report")
+        report.save_txt(str(test_file), append=True, empty=True)
+        content = test_file.read_text()
+        assert_that(content).does_not_contain("Old content")
+        assert_that(content).contains("Test Report")
+
+    def test_csv_row(self) -> None:
+        report = SimpleReport("Test Report")
+        report.add("section1", "param1", "value1")
+        report.add("section1", "param2", 3.14)
+        header, row = report.csv_row()
+        assert_that(header).is_equal_to(["name", "section1_param1", "section1_param2"])
+        assert_that(row).is_equal_to(("Test Report", "value1", "3.14"))
+
+    def test_csv_row_keeps_small_values(self) -> None:
+        report = SimpleReport("Test Report")
+        report.add("section1", "param1", 1.2345678901234e-15)
+        _, row = report.csv_row()
+        assert_that(row).is_equal_to(("Test Report", "1.23456789e-15"))
+
     def test_str(self) -> None:
         report = SimpleReport("Test Report")
         report.add("section1", "param1", "value1")
@@ -109,3 +145,171 @@ class TestSimpleReport:
         assert_that(result).contains("Test Report")
         assert_that(result).contains("section1")
         assert_that(result).contains("param1")
+
+
+class TestReportWriter:
+    def _report(self, value: float) -> SimpleReport:
+        report = SimpleReport("Sweep")
+        report.add("states probability", "A", value)
+        return report
+
+    def test_write(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "out" / "sweep.csv"
+        with ReportWriter(str(test_file), flush_rows=2) as writer:
+            for value in (0.1, 0.2, 0.3):
+                writer.write(self._report(value))
+        assert_that(test_file.read_text()).is_equal_to(
+            "name,states_probability_a\nSweep,0.1\nSweep,0.2\nSweep,0.3\n"
+        )
+
+    def test_write_buffers_rows(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "sweep.csv"
+        writer = ReportWriter(str(test_file), flush_rows=10)
+        writer.write(self._report(0.1))
+        assert_that(test_file.read_text()).is_empty()
+        writer.flush()
+        assert_that(test_file.read_text()).contains("Sweep,0.1")
+        writer.close()
+
+    def test_write_append(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "sweep.csv"
+        for value in (0.1, 0.2):
+            with ReportWriter(str(test_file), append=True) as writer:
+                writer.write(self._report(value))
+        assert_that(test_file.read_text()).is_equal_to(
+            "name,states_probability_a\nSweep,0.1\nSweep,0.2\n"
+        )
+
+    def test_close_without_reports(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "sweep.csv"
+        ReportWriter(str(test_file)).close()
+        assert_that(test_file.exists()).is_false()
+
+
+class TestSolutionReport:
+    def _report(self) -> SolutionReport:
+        solution = SteadyStateSolution({"A": 0.2, "B": 0.5, "C": 0.3}, "numeric")
+        return SolutionReport("Solution", solution)
+
+    def test_summary(self) -> None:
+        summary = self._report().summary(top_k=2)
+        assert_that(summary.get("solver", "method")).is_equal_to("numeric")
+        assert_that(summary.get("solver", "states")).is_equal_to(3)
+        assert_that(summary.params["states probability"]).is_equal_to(
+            [("B", 0.5), ("C", 0.3)]
+        )
+
+    def test_summary_measures(self) -> None:
+        solution = SteadyStateSolution({"A": 0.2, "B": 0.8}, "numeric")
+        report = SolutionReport("Solution", solution, {"throughput": 1.5})
+        assert_that(report.summary().get("measures", "throughput")).is_equal_to(1.5)
+
+    def test_summary_diagnostics(self) -> None:
+        diagnostics = ConvergenceDiagnostics(
+            3, [1e-2, 1e-6, 1e-12], [1, 1, 1e-11], True
+        )
+        solution = SteadyStateSolution({"A": 0.2, "B": 0.8}, "iad", None, diagnostics)
+        summary = SolutionReport("Solution", solution).summary()
+        assert_that(summary.get("solver", "iterations")).is_equal_to(3)
+        assert_that(summary.get("solver", "residual")).is_equal_to(1e-12)
+        assert_that(summary.get("solver", "preconditioner")).is_none()
+
+    def test_summary_timings(self) -> None:
+        diagnostics = ConvergenceDiagnostics(
+            5, [1e-11], [], True, 0.25, 1.5, preconditioner="ilut"
+        )
+        solution = SteadyStateSolution({"A": 1.0}, "krylov", None, diagnostics)
+        summary = SolutionReport("Solution", solution).summary()
+        assert_that(summary.get("solver", "preconditioner")).is_equal_to("ilut")
+        assert_that(summary.get("solver", "setup time (s)")).is_equal_to(0.25)
+        assert_that(summary.get("solver", "iteration time (s)")).is_equal_to(1.5)
+
+    def test_summary_residual(self) -> None:
+        vector = np.array([0.25, 0.75], dtype=np.longdouble)
+        solution = SteadyStateSolution(
+            {"A": 0.25, "B": 0.75}, "numeric", vector, None, 1e-17
+        )
+        summary = SolutionReport("Solution", solution).summary()
+        assert_that(summary.get("solver", "precision")).is_equal_to("longdouble")
+        assert_that(summary.get("solver", "balance residual")).is_equal_to(1e-17)
+
+    def test_summary_min_prob(self) -> None:
+        summary = self._report().summary(top_k=None, min_prob=0.3)
+        assert_that(summary.params["states probability"]).is_equal_to(
+            [("B", 0.5), ("C", 0.3)]
+        )
+
+    def test_summary_all(self) -> None:
+        summary = self._report().summary(top_k=None)
+        assert_that(summary.params["states probability"]).is_length(3)
+
+    def test_str(self) -> None:
+        assert_that(str(self._report())).contains("Solution", "B")
+
+    def test_save_csv(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "out" / "solution.csv"
+        self._report().save_csv(str(test_file))
+        assert_that(test_file.read_text()).is_equal_to(
+            "index,state,probability\n0,A,0.2\n1,B,0.5\n2,C,0.3\n"
+        )
+
+    def test_save_npz(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "solution.npz"
+        self._report().save("{}".format(test_file), format="npz")
+        with np.load(test_file) as archive:
+            assert_that(archive["states"].tolist()).is_equal_to(["A", "B", "C"])
+            assert_that(archive["probabilities"].tolist()).is_equal_to([0.2, 0.5, 0.3])
+            assert_that(str(archive["method"])).is_equal_to("numeric")
+
+    def test_save_npy(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "solution.npy"
+        self._report().save(str(test_file), format="npy")
+        assert_that(np.load(test_file).tolist()).is_equal_to([0.2, 0.5, 0.3])
+        assert_that((tmp_path / "solution.states").read_text()).is_equal_to("A\nB\nC\n")
+
+    def test_save_unknown_format(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        with pytest.raises(ValueError, match="Unknown solution format"):
+            self._report().save(str(tmp_path / "solution.txt"), format="txt")
+
+
+class TestPassageReport:
+    def _report(self) -> PassageReport:
+        moments = np.array([[3.0, 16.0], [2.0, 10.0], [0.0, 0.0]])
+        solution = PassageTimeSolution(["A", "B", "C"], ["C"], moments)
+        distribution = PassageTimeDistribution(
+            ["A", "B", "C"], ["C"], [1.0], np.array([[0.2], [0.4], [1.0]])
+        )
+        return PassageReport("Passage", solution, distribution)
+
+    def test_summary(self) -> None:
+        summary = self._report().summary(top_k=2)
+        assert_that(summary.get("passage", "targets")).is_equal_to("C")
+        assert_that(summary.params["mean first passage time"]).is_equal_to(
+            [("A", 3.0), ("B", 2.0)]
+        )
+
+    def test_save_csv(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "passage.csv"
+        self._report().save_csv(str(test_file))
+        assert_that(test_file.read_text()).is_equal_to(
+            "index,state,moment_1,moment_2\n"
+            "0,A,3.0,16.0\n1,B,2.0,10.0\n2,C,0.0,0.0\n"
+        )
+
+    def test_summary_cdf(self) -> None:
+        summary = self._report().summary(top_k=1)
+        assert_that(summary.params["passage time cdf"]).is_equal_to([("A t=1.0", 0.2)])
+
+    def test_save_cdf_csv(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "passage_cdf.csv"
+        self._report().save_cdf_csv(str(test_file))
+        assert_that(test_file.read_text()).is_equal_to(
+            "index,state,time,probability\n" "0,A,1.0,0.2\n1,B,1.0,0.4\n2,C,1.0,1.0\n"
+        )
+
+    def test_save_cdf_csv_without_distribution(
+        self, tmp_path
+    ) -> None:  # type: ignore[no-untyped-def]
+        report = PassageReport("Passage", self._report().solution)
+        with pytest.raises(ValueError, match="no passage time distribution"):
+            report.save_cdf_csv(str(tmp_path / "passage_cdf.csv"))
@@ -0,0 +1,94 @@
+import numpy as np
+from assertpy import assert_that
+
+import pytest
+
+from markov_solver.results.solution import (
+    PassageTimeDistribution,
+    PassageTimeSolution,
+    SteadyStateSolution,
+)
+from markov_solver.solver.numeric import ConvergenceDiagnostics
+
+
+class TestSteadyStateSolution:
+    def test_init(self) -> None:
+        solution = SteadyStateSolution({"A": 0.25, "B": 0.75}, "numeric")
+        assert_that(solution).is_equal_to({"A": 0.25, "B": 0.75})
+        assert_that(solution.method).is_equal_to("numeric")
+
+    def test_as_arrays(self) -> None:
+        solution = SteadyStateSolution({"A": 0.25, "B": 0.75}, "numeric")
+        names, probabilities = solution.as_arrays()
+        assert_that(names).is_equal_to(["A", "B"])
+        assert_that(probabilities.tolist()).is_equal_to([0.25, 0.75])
+
+    def test_as_arrays_vector(self) -> None:
+        vector = np.array([0.25, 0.75])
+        solution = SteadyStateSolution({"A": 0.25, "B": 0.75}, "numeric", vector)
+        assert_that(solution.as_arrays()[1]).is_same_as(vector)
+
+    def test_query_top_k(self) -> None:
+        solution = SteadyStateSolution({"A": 0.2, "B": 0.5, "C": 0.3}, "numeric")
+        top = solution.top_k(2)
+        assert_that(list(top.items())).is_equal_to([("B", 0.5), ("C", 0.3)])
+        assert_that(top.method).is_equal_to("numeric")
+        assert_that(top.as_arrays()[1].tolist()).is_equal_to([0.5, 0.3])
+
+    def test_query_top_k_larger_than_solution(self) -> None:
+        solution = SteadyStateSolution({"A": 0.2, "B": 0.5, "C": 0.3}, "numeric")
+        assert_that(list(solution.top_k(5))).is_equal_to(["B", "C", "A"])
+        assert_that(list(solution.top_k(0))).is_empty()
+
+    def test_query_above(self) -> None:
+        solution = SteadyStateSolution({"A": 0.2, "B": 0.5, "C": 0.3}, "numeric")
+        assert_that(list(solution.above(0.25))).is_equal_to(["B", "C"])
+        assert_that(list(solution.above(0.9))).is_empty()
+
+    def test_query_top_k_and_min_prob(self) -> None:
+        solution = SteadyStateSolution(
+            {"A": 0.1, "B": 0.4, "C": 0.3, "D": 0.2}, "numeric"
+        )
+        assert_that(list(solution.query(top_k=3, min_prob=0.25))).is_equal_to(
+            ["B", "C"]
+        )
+
+    def test_query_keeps_diagnostics(self) -> None:
+        diagnostics = ConvergenceDiagnostics(2, [1e-3, 1e-12], [1.0, 1e-11], True)
+        solution = SteadyStateSolution({"A": 0.25, "B": 0.75}, "iad", None, diagnostics)
+        assert_that(solution.top_k(1).diagnostics).is_equal_to(diagnostics)
+
+    def test_query_keeps_residual_and_precision(self) -> None:
+        vector = np.array([0.25, 0.75], dtype=np.longdouble)
+        solution = SteadyStateSolution(
+            {"A": 0.25, "B": 0.75}, "numeric", vector, None, 1e-16
+        )
+        top = solution.top_k(1)
+        assert_that(top.residual).is_equal_to(1e-16)
+        assert_that(top.precision).is_equal_to("longdouble")
+        assert_that(SteadyStateSolution({"A": 1.0}, "numeric").precision).is_equal_to(
+            "float64"
+        )
+
+
+class TestPassageTimeSolution:
+    def test_init(self) -> None:
+        moments = np.array([[3.0, 16.0], [0.0, 0.0]])
+        solution = PassageTimeSolution(["A", "B"], ["B"], moments)
+        assert_that(solution).is_equal_to({"A": 3.0, "B": 0.0})
+        assert_that(solution.targets).is_equal_to(["B"])
+        assert_that(solution.moment(2)).is_equal_to({"A": 16.0, "B": 0.0})
+        assert_that(solution.variance()).is_equal_to({"A": 7.0, "B": 0.0})
+
+    def test_variance_without_second_moment(self) -> None:
+        solution = PassageTimeSolution(["A"], ["A"], np.zeros((1, 1)))
+        with pytest.raises(ValueError, match="second moment"):
+            solution.variance()
+
+
+class TestPassageTimeDistribution:
+    def test_init(self) -> None:
+        cdf = np.array([[0.25, 0.5], [1.0, 1.0]])
+        distribution = PassageTimeDistribution(["A", "B"], ["B"], [1.0, 2.0], cdf)
+        assert_that(distribution).is_equal_to({"A": [0.25, 0.5], "B": [1.0, 1.0]})
+        assert_that(distribution.times).is_equal_to([1.0, 2.0])
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+from scipy import sparse
+
+from markov_solver.solver.aggregation import AggregationSolver, partition_labels
+from markov_solver.solver.numeric import (
+    SolverError,
+    residual_norm,
+    solve_steady_state,
+)
+
+
+def ncd_generator(epsilon: float = 1e-4) -> sparse.csr_matrix:
+    # Two blocks of three states, fast inside and coupled by epsilon.
+    fast = np.array([[0, 5, 1], [2, 0, 4], [3, 3, 0]], dtype=float)
+    rates = np.zeros((6, 6))
+    rates[:3, :3] = fast
+    rates[3:, 3:] = 2 * fast.T
+    rates[0, 4] = rates[2, 3] = epsilon
+    rates[5, 1] = 3 * epsilon
+    return sparse.csr_matrix(rates - np.diag(rates.sum(axis=1)))
+
+
+def ring_generator(blocks: int, size: int, coupling: float) -> sparse.csr_matrix:
+    # Dense random blocks in a ring, each coupled to the next by two links.
+    rng = np.random.default_rng(0)
+    n = blocks * size
+    rates = np.zeros((n, n))
+    for block in range(blocks):
+        start, head = block * size, (block + 1) % blocks * size
+        rates[start : start + size, start : start + size] = rng.random((size, size))
+        rates[start, head + 1] = coupling
+        rates[head + 2, start] = 2 * coupling
+    np.fill_diagonal(rates, 0.0)
+    return sparse.csr_matrix(rates - np.diag(rates.sum(axis=1)))
+
+
+class TestAggregation:
+    def test_partition_labels(self) -> None:
+        assert_that(partition_labels(["b", "a", "b", 3]).tolist()).is_equal_to(
+            [0, 1, 0, 2]
+        )
+
+    def test_solve(self) -> None:
+        generator = ncd_generator()
+        solver = AggregationSolver()
+        solution = solver.solve(generator, np.array([0, 0, 0, 1, 1, 1]))
+        assert_that(
+            np.allclose(solution, solve_steady_state(generator), atol=1e-9)
+        ).is_true()
+        diagnostics = solver.diagnostics
+        assert_that(diagnostics.converged).is_true()
+        assert_that(diagnostics.iterations).is_less_than(10)
+        assert_that(diagnostics.residuals).is_length(diagnostics.iterations)
+        assert_that(diagnostics.residual).is_less_than_or_equal_to(1e-10)
+
+    def test_solve_weak_coupling(self) -> None:
+        # The change of the iterates stalls at the rounding noise of the
+        # coupling solve, far above the tolerance.
+        generator = ring_generator(10, 10, 1e-8)
+        solver = AggregationSolver()
+        solution = solver.solve(generator, np.repeat(np.arange(10), 10))
+        assert_that(solver.diagnostics.converged).is_true()
+        assert_that(solver.diagnostics.iterations).is_less_than(20)
+        assert_that(residual_norm(generator, solution)).is_less_than(1e-10)
+        expected = solve_steady_state(generator)
+        assert_that(np.abs(solution - expected).max() / expected.max()).is_less_than(
+            1e-6
+        )
+
+    def test_solve_interleaved_blocks(self) -> None:
+        generator = ncd_generator()
+        order = [3, 0, 4, 1, 5, 2]
+        permuted = sparse.csr_matrix(generator[order][:, order])
+        solution = AggregationSolver().solve(permuted, np.array([1, 0, 1, 0, 1, 0]))
+        assert_that(
+            np.allclose(solution, solve_steady_state(permuted), atol=1e-9)
+        ).is_true()
+
+    def test_solve_not_converged(self) -> None:
+        solver = AggregationSolver(max_iterations=1)
+        with pytest.raises(SolverError, match="did not converge in 1 iterations"):
+            solver.solve(ncd_generator(), np.array([0, 1, 0, 1, 0, 1]))
+        assert_that(solver.diagnostics.converged).is_false()
+
+    def test_solve_closed_block(self) -> None:
+        generator = sparse.csr_matrix(np.array([[-1.0, 1.0], [0.0, 0.0]]))
+        with pytest.raises(SolverError, match="no transitions out"):
+            AggregationSolver().solve(generator, np.array([0, 1]))
+
+    def test_solve_invalid_partition(self) -> None:
+        generator = ncd_generator()
+        with pytest.raises(ValueError, match="two blocks"):
+            AggregationSolver().solve(generator, np.zeros(6))
+        with pytest.raises(ValueError, match="without gaps"):
+            AggregationSolver().solve(generator, np.array([0, 0, 0, 2, 2, 2]))
+        with pytest.raises(ValueError, match="each of the 6 states"):
+            AggregationSolver().solve(generator, np.array([0, 1]))
+
+    def test_residual_norm(self) -> None:
+        generator = ncd_generator()
+        assert_that(
+            residual_norm(generator, solve_steady_state(generator))
+        ).is_less_than(1e-12)
+        assert_that(residual_norm(generator, np.full(6, 1 / 6))).is_greater_than(0.1)
@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+from scipy import sparse
+
+from markov_solver.solver.krylov import (
+    PRECONDITIONERS,
+    BlockJacobi,
+    KrylovSolver,
+    solve_steady_state_krylov,
+    solve_steady_state_operator,
+    strong_components,
+)
+from markov_solver.solver.numeric import SolverError, solve_steady_state
+
+
+def stiff_generator(size: int = 12) -> sparse.csr_matrix:
+    # Tandem queue whose transfers are much faster than arrivals and services.
+    def index(i: int, j: int) -> int:
+        return i * (size + 1) + j
+
+    n = (size + 1) ** 2
+    rates = sparse.lil_matrix((n, n))
+    for i in range(size + 1):
+        for j in range(size + 1):
+            if i < size:
+                rates[index(i, j), index(i + 1, j)] = 1.0
+            if i > 0 and j < size:
+                rates[index(i, j), index(i - 1, j + 1)] = 1000.0
+            if j > 0:
+                rates[index(i, j), index(i, j - 1)] = 1.2
+    rates = sparse.csr_matrix(rates)
+    return sparse.csr_matrix(
+        rates - sparse.diags(np.asarray(rates.sum(axis=1)).ravel())
+    )
+
+
+def transient_generator() -> sparse.csr_matrix:
+    # A1 -> A2 -> B are transient, and B <-> C is the closed class.
+    rates = np.zeros((4, 4))
+    rates[0, 1] = 1000.0
+    rates[1, 2] = 0.001
+    rates[2, 3] = rates[3, 2] = 1000.0
+    return sparse.csr_matrix(rates - np.diag(rates.sum(axis=1)))
+
+
+class TestKrylov:
+    def test_strong_components(self) -> None:
+        graph = sparse.csr_matrix(
+            np.array([[0, 1, 0, 0], [1, 0, 1, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
+        )
+        labels = strong_components(graph)
+        assert_that(labels[0]).is_equal_to(labels[1])
+        assert_that(labels[2]).is_equal_to(labels[3])
+        assert_that(labels[0]).is_not_equal_to(labels[2])
+
+    def test_block_jacobi(self) -> None:
+        system = sparse.csr_matrix(
+            np.array([[4.0, 1.0, 1.0], [1.0, 3.0, 0.0], [1.0, 0.0, 2.0]])
+        )
+        result = BlockJacobi(system, np.array([0, 0, 1])).solve(np.ones(3))
+        expected = np.concatenate(
+            [np.linalg.solve([[4.0, 1.0], [1.0, 3.0]], [1.0, 1.0]), [0.5]]
+        )
+        assert_that(np.allclose(result, expected)).is_true()
+
+    @pytest.mark.parametrize("preconditioner", PRECONDITIONERS)
+    def test_solve_steady_state(self, preconditioner: str) -> None:
+        generator = stiff_generator()
+        solver = KrylovSolver(preconditioner)
+        solution = solve_steady_state_krylov(generator, solver)
+        assert_that(
+            np.allclose(solution, solve_steady_state(generator), atol=1e-8)
+        ).is_true()
+        diagnostics = solver.diagnostics
+        assert_that(diagnostics.converged).is_true()
+        assert_that(diagnostics.preconditioner).is_equal_to(preconditioner)
+        assert_that(diagnostics.residuals).is_length(diagnostics.iterations)
+        assert_that(diagnostics.setup_time).is_greater_than_or_equal_to(0.0)
+        assert_that(diagnostics.solve_time).is_greater_than(0.0)
+
+    @pytest.mark.parametrize("preconditioner", PRECONDITIONERS)
+    def test_solve_steady_state_transient(self, preconditioner: str) -> None:
+        solution = solve_steady_state_krylov(
+            transient_generator(), KrylovSolver(preconditioner)
+        )
+        assert_that(np.allclose(solution, [0.0, 0.0, 0.5, 0.5])).is_true()
+
+    def test_preconditioners_reduce_iterations(self) -> None:
+        generator = stiff_generator()
+        iterations = {}
+        for preconditioner in ("none", "ilut"):
+            solver = KrylovSolver(preconditioner)
+            solve_steady_state_krylov(generator, solver)
+            iterations[preconditioner] = solver.diagnostics.iterations
+        assert_that(iterations["ilut"]).is_less_than(iterations["none"])
+
+    def test_block_jacobi_labels(self) -> None:
+        generator = stiff_generator(4)
+        solver = KrylovSolver("block-jacobi", labels=np.arange(25) // 5)
+        solution = solve_steady_state_krylov(generator, solver)
+        assert_that(
+            np.allclose(solution, solve_steady_state(generator), atol=1e-8)
+        ).is_true()
+
+    def test_not_converged(self) -> None:
+        solver = KrylovSolver("none", max_iterations=1, restart=2)
+        with pytest.raises(SolverError, match="did not converge"):
+            solve_steady_state_krylov(stiff_generator(), solver)
+        assert_that(solver.diagnostics.converged).is_false()
+
+    def test_unknown_preconditioner(self) -> None:
+        with pytest.raises(ValueError, match="Unknown preconditioner"):
+            KrylovSolver("sor")
+        with pytest.raises(ValueError, match="Unknown Krylov method"):
+            KrylovSolver(method="cg")
+
+    @pytest.mark.parametrize("preconditioner", ["jacobi", "ilu0"])
+    def test_solve_steady_state_bicgstab(self, preconditioner: str) -> None:
+        generator = stiff_generator()
+        solver = KrylovSolver(preconditioner, method="bicgstab")
+        solution = solve_steady_state_krylov(generator, solver)
+        assert_that(
+            np.allclose(solution, solve_steady_state(generator), atol=1e-8)
+        ).is_true()
+        diagnostics = solver.diagnostics
+        assert_that(diagnostics.converged).is_true()
+        assert_that(diagnostics.residuals).is_length(diagnostics.iterations)
+        assert_that(diagnostics.residual).is_less_than(1e-9)
+
+    def test_bicgstab_not_converged(self) -> None:
+        solver = KrylovSolver("none", max_iterations=1, restart=2, method="bicgstab")
+        with pytest.raises(SolverError, match="BiCGSTAB with none preconditioner"):
+            solve_steady_state_krylov(stiff_generator(), solver)
+
+    @pytest.mark.parametrize("preconditioner", ["none", "jacobi"])
+    def test_solve_steady_state_operator(self, preconditioner: str) -> None:
+        generator = stiff_generator()
+        transposed = sparse.csr_matrix(generator.T)
+        solution = solve_steady_state_operator(
+            lambda x: transposed @ x,
+            generator.diagonal(),
+            KrylovSolver(preconditioner),
+        )
+        assert_that(np.allclose(solution, solve_steady_state(generator))).is_true()
+
+    @pytest.mark.parametrize("preconditioner", ["none", "jacobi"])
+    def test_solve_steady_state_operator_transient(self, preconditioner: str) -> None:
+        generator = transient_generator()
+        transposed = sparse.csr_matrix(generator.T)
+        solution = solve_steady_state_operator(
+            lambda x: transposed @ x,
+            generator.diagonal(),
+            KrylovSolver(preconditioner),
+        )
+        assert_that(np.allclose(solution, [0.0, 0.0, 0.5, 0.5], atol=1e-9)).is_true()
+
+    def test_solve_steady_state_operator_needs_matrix(self) -> None:
+        generator = stiff_generator(2)
+        with pytest.raises(ValueError, match="needs the matrix"):
+            solve_steady_state_operator(
+                lambda x: generator.T @ x, generator.diagonal(), KrylovSolver("ilut")
+            )
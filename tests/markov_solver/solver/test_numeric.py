@@ -0,0 +1,299 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+from assertpy import assert_that
+from scipy import sparse
+
+from markov_solver.solver.numeric import (
+    FactorizationCache,
+    FactorizationCacheInfo,
+    SolverError,
+    SteadyStateSolver,
+    closed_classes,
+    dominant_state,
+    factorize,
+    precision_dtype,
+    reference_state,
+    refine,
+    residual_norm,
+    solve_shared,
+    solve_steady_state,
+    steady_state_system,
+    structure_hash,
+)
+from markov_solver.utils import shared_memory
+from markov_solver.utils.shared_memory import SharedArrays, detach_all
+
+
+def birth_death_generator() -> sparse.csr_matrix:
+    return sparse.csr_matrix(
+        np.array(
+            [
+                [-1.5, 1.5, 0.0, 0.0],
+                [2.0, -3.5, 1.5, 0.0],
+                [0.0, 4.0, -5.5, 1.5],
+                [0.0, 0.0, 6.0, -6.0],
+            ]
+        )
+    )
+
+
+def transient_generator() -> sparse.csr_matrix:
+    # A1 -> A2 -> B are transient, with most of the mass in A2 for a long
+    # time, and B <-> C is the closed class.
+    rates = np.zeros((4, 4))
+    rates[0, 1] = 1000.0
+    rates[1, 2] = 0.001
+    rates[2, 3] = rates[3, 2] = 1000.0
+    return sparse.csr_matrix(rates - np.diag(rates.sum(axis=1)))
+
+
+class TestNumeric:
+    def test_reference_state(self) -> None:
+        assert_that(reference_state(birth_death_generator())).is_equal_to(0)
+
+    def test_reference_state_closed_class(self) -> None:
+        assert_that(reference_state(transient_generator())).is_in(2, 3)
+
+    def test_closed_classes(self) -> None:
+        labels, classes = closed_classes(transient_generator() > 0)
+        assert_that(classes).is_length(1)
+        closed = labels == classes[0]
+        assert_that(closed.tolist()).is_equal_to([False, False, True, True])
+
+    def test_dominant_state(self) -> None:
+        generator = birth_death_generator()
+        transposed = sparse.csr_matrix(generator.T)
+        candidates = np.array([False, True, True, False])
+        state = dominant_state(
+            lambda x: transposed @ x, generator.diagonal(), candidates
+        )
+        assert_that(state).is_equal_to(1)
+
+    def test_steady_state_system(self) -> None:
+        system, rhs = steady_state_system(birth_death_generator(), 1, 10.0)
+        dense = system.toarray()
+        assert_that(dense[0].tolist()).is_equal_to([1.5, -2.0, 0.0, 0.0])
+        assert_that(dense[1].tolist()).is_equal_to([-1.5, 13.5, -4.0, 0.0])
+        assert_that(rhs.tolist()).is_equal_to([0.0, 1.0, 0.0, 0.0])
+
+    def test_solve_steady_state(self) -> None:
+        solution = solve_steady_state(birth_death_generator())
+        expected = np.array([128, 96, 36, 9]) / 269
+        assert_that(np.allclose(solution, expected)).is_true()
+
+    def test_solve_steady_state_transient(self) -> None:
+        solution = solve_steady_state(transient_generator())
+        assert_that(np.allclose(solution, [0.0, 0.0, 0.5, 0.5])).is_true()
+
+    def test_solve_steady_state_empty(self) -> None:
+        solution = solve_steady_state(sparse.csr_matrix((0, 0)))
+        assert_that(solution.tolist()).is_empty()
+
+    def test_solve_steady_state_reducible(self) -> None:
+        generator = sparse.csr_matrix(np.zeros((2, 2)))
+        with pytest.raises(SolverError, match="no unique steady-state"):
+            solve_steady_state(generator)
+
+    def test_precision_dtype(self) -> None:
+        assert_that(precision_dtype("float64")).is_equal_to(np.float64)
+        assert_that(precision_dtype("longdouble")).is_equal_to(np.longdouble)
+        with pytest.raises(ValueError, match="Unknown precision"):
+            precision_dtype("float16")
+
+    def test_refine(self) -> None:
+        generator = birth_death_generator()
+        system, rhs = steady_state_system(generator, 0, 6.0)
+        exact = factorize(system).solve(rhs)
+        rough = exact * (1.0 + 1e-3 * np.arange(4))
+        refined = refine(system, rhs, rough, factorize(system).solve, 2)
+        assert_that(np.abs(refined - exact).max()).is_less_than(1e-14)
+        assert_that(refine(system, rhs, rough, exact.__add__, 0)).is_same_as(rough)
+
+    @pytest.mark.parametrize("precision", ["float64", "longdouble"])
+    def test_solve_steady_state_refined(self, precision: str) -> None:
+        generator = birth_death_generator()
+        solution = solve_steady_state(generator, 2, precision)
+        expected = np.array([128, 96, 36, 9]) / 269
+        assert_that(solution.dtype).is_equal_to(precision_dtype(precision))
+        assert_that(np.allclose(solution, expected, rtol=1e-15)).is_true()
+        assert_that(residual_norm(generator, solution)).is_less_than(1e-15)
+
+
+class TestSteadyStateSolver:
+    def test_solve_shared(self) -> None:
+        generator = birth_death_generator()
+        with SharedArrays() as arrays:
+            matrix = arrays.share_matrix(generator)
+            results, view = arrays.create_array((2, 4), np.longdouble)
+            residual = solve_shared(matrix, results, 1, refinement_steps=1)
+            assert_that(view[0].tolist()).is_equal_to([0.0] * 4)
+            assert_that(np.allclose(view[1], solve_steady_state(generator))).is_true()
+            assert_that(residual).is_less_than(1e-15)
+            del view
+            detach_all()
+
+    def test_solve_shared_generator_handle_detaches(self) -> None:
+        with SharedArrays() as arrays:
+            handle = arrays.share_generator(list("ABCD"), birth_death_generator())
+            results, view = arrays.create_array((1, 4))
+            solve_shared(handle, results, 0)
+            expected = solve_steady_state(birth_death_generator())
+            assert_that(np.allclose(view[0], expected)).is_true()
+            # No segment stays mapped after the task.
+            assert_that(shared_memory._attached).is_empty()
+            del view
+
+    def test_solve_shared_process_pool(self) -> None:
+        generators = [birth_death_generator(), 2.0 * birth_death_generator()]
+        with SharedArrays() as arrays:
+            matrices = [arrays.share_matrix(generator) for generator in generators]
+            results, view = arrays.create_array((2, 4))
+            with ProcessPoolExecutor(2) as pool:
+                residuals = list(
+                    pool.map(solve_shared, matrices, [results] * 2, range(2))
+                )
+            expected = solve_steady_state(birth_death_generator())
+            assert_that(np.allclose(view, [expected, expected])).is_true()
+            assert_that(max(residuals)).is_less_than(1e-12)
+            del view
+
+    def test_solve_reuses_factorization(self) -> None:
+        solver = SteadyStateSolver()
+        generator = birth_death_generator()
+        solver.solve(generator)
+
+        updated = generator.tolil()
+        updated[1, 2] = 3.0
+        updated[1, 1] = -5.0
+        updated = sparse.csr_matrix(updated)
+        solution = solver.solve(updated)
+
+        assert_that(solver.stats).is_equal_to({"factorizations": 1, "updates": 1})
+        assert_that(np.allclose(solution, solve_steady_state(updated))).is_true()
+        assert_that(np.abs(updated.T @ solution).max()).is_less_than(1e-12)
+
+    def test_solve_refines_update(self) -> None:
+        solver = SteadyStateSolver()
+        generator = birth_death_generator()
+        solver.solve(generator)
+        solution = solver.solve(generator * 2, 1, "longdouble")
+        assert_that(solver.stats).is_equal_to({"factorizations": 1, "updates": 1})
+        assert_that(solution.dtype).is_equal_to(np.longdouble)
+        assert_that(np.allclose(solution, np.array([128, 96, 36, 9]) / 269)).is_true()
+
+    def test_solve_refactorizes_above_max_update_rank(self) -> None:
+        solver = SteadyStateSolver(max_update_rank=0)
+        generator = birth_death_generator()
+        solver.solve(generator)
+        solver.solve(generator * 2)
+        assert_that(solver.stats).is_equal_to({"factorizations": 2, "updates": 0})
+
+    def test_solve_refactorizes_on_shape_change(self) -> None:
+        solver = SteadyStateSolver()
+        solver.solve(birth_death_generator())
+        solution = solver.solve(sparse.csr_matrix([[-1.0, 1.0], [3.0, -3.0]]))
+        assert_that(solver.stats["factorizations"]).is_equal_to(2)
+        assert_that(np.allclose(solution, [0.75, 0.25])).is_true()
+
+    def test_reset(self) -> None:
+        solver = SteadyStateSolver()
+        solver.solve(birth_death_generator())
+        solver.reset()
+        solver.solve(birth_death_generator())
+        assert_that(solver.stats["factorizations"]).is_equal_to(2)
+
+    def test_pickle_drops_factorization(self) -> None:
+        solver = SteadyStateSolver(max_update_rank=4)
+        solver.solve(birth_death_generator())
+        copy = pickle.loads(pickle.dumps(solver))
+        assert_that(copy.max_update_rank).is_equal_to(4)
+        assert_that(copy.stats["factorizations"]).is_equal_to(1)
+        copy.solve(birth_death_generator())
+        assert_that(copy.stats["factorizations"]).is_equal_to(2)
+
+
+class TestFactorizationCache:
+    def test_get_put(self) -> None:
+        cache = FactorizationCache(maxsize=2)
+        analysis = self._analysis()
+        assert_that(cache.get("a")).is_none()
+        cache.put("a", analysis)
+        assert_that(cache.get("a")).is_same_as(analysis)
+        assert_that(cache.info()).is_equal_to(
+            FactorizationCacheInfo(hits=1, misses=1, evictions=0, maxsize=2, currsize=1)
+        )
+
+    def test_lru_eviction(self) -> None:
+        cache = FactorizationCache(maxsize=2)
+        analysis = self._analysis()
+        cache.put("a", analysis)
+        cache.put("b", analysis)
+        cache.get("a")
+        cache.put("c", analysis)
+        assert_that(cache.get("b")).is_none()
+        assert_that(cache.get("a")).is_not_none()
+        assert_that(cache.info().evictions).is_equal_to(1)
+        assert_that(cache.info().currsize).is_equal_to(2)
+
+    def test_clear(self) -> None:
+        cache = FactorizationCache()
+        cache.put("a", self._analysis())
+        cache.get("a")
+        cache.clear()
+        assert_that(cache.info()).is_equal_to(
+            FactorizationCacheInfo(
+                hits=0, misses=0, evictions=0, maxsize=16, currsize=0
+            )
+        )
+
+    @staticmethod
+    def _analysis():  # type: ignore[no-untyped-def]
+        system, _ = steady_state_system(birth_death_generator(), 0, 6.0)
+        cache = FactorizationCache()
+        factorize(system, cache)
+        return cache.get(structure_hash(sparse.csc_matrix(system)))
+
+
+class TestFactorize:
+    def test_structure_hash_ignores_values(self) -> None:
+        generator = birth_death_generator()
+        assert_that(structure_hash(generator)).is_equal_to(
+            structure_hash(generator * 3)
+        )
+        assert_that(structure_hash(generator)).is_not_equal_to(
+            structure_hash(sparse.csr_matrix(np.eye(4)))
+        )
+
+    def test_factorize_reuses_analysis(self) -> None:
+        cache = FactorizationCache()
+        generator = birth_death_generator()
+        rng = np.random.default_rng(0)
+        for _ in range(3):
+            scaled = sparse.csr_matrix(generator.multiply(rng.uniform(0.5, 2, (4, 1))))
+            system, rhs = steady_state_system(scaled, 0, 10.0)
+            solution = factorize(system, cache).solve(rhs)
+            expected = factorize(system).solve(rhs)
+            assert_that(np.allclose(solution, expected)).is_true()
+        assert_that(cache.info()).is_equal_to(
+            FactorizationCacheInfo(
+                hits=2, misses=1, evictions=0, maxsize=16, currsize=1
+            )
+        )
+
+    def test_factorize_multiple_rhs(self) -> None:
+        cache = FactorizationCache()
+        system, _ = steady_state_system(birth_death_generator(), 0, 10.0)
+        factorize(system, cache)
+        factorization = factorize(system, cache)
+        rhs = np.eye(4)
+        assert_that(np.allclose(system @ factorization.solve(rhs), rhs)).is_true()
+
+    def test_solver_shares_cache(self) -> None:
+        cache = FactorizationCache()
+        SteadyStateSolver(cache=cache).solve(birth_death_generator())
+        solution = SteadyStateSolver(cache=cache).solve(birth_death_generator() * 2)
+        assert_that(cache.info().hits).is_equal_to(1)
+        assert_that(np.allclose(solution, np.array([128, 96, 36, 9]) / 269)).is_true()
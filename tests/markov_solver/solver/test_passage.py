@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+from scipy import linalg, sparse
+
+from markov_solver.solver.krylov import KrylovSolver
+from markov_solver.solver.passage import (
+    first_passage_moments,
+    passage_time_cdf,
+    reaching_states,
+)
+
+
+def generator(rates: list) -> sparse.csr_matrix:  # type: ignore[type-arg]
+    matrix = np.array(rates, dtype=float)
+    return sparse.csr_matrix(matrix - np.diag(matrix.sum(axis=1)))
+
+
+def mask(n: int, *indices: int) -> np.ndarray:
+    result = np.zeros(n, dtype=bool)
+    result[list(indices)] = True
+    return result
+
+
+class TestPassage:
+    def test_reaching_states(self) -> None:
+        graph = sparse.csr_matrix(np.array([[0, 1, 0], [0, 0, 0], [0, 0, 0]]))
+        assert_that(reaching_states(graph, mask(3, 1)).tolist()).is_equal_to(
+            [True, True, False]
+        )
+        assert_that(reaching_states(graph, mask(3)).tolist()).is_equal_to(
+            [False, False, False]
+        )
+
+    def test_first_passage_moments(self) -> None:
+        q = generator([[0, 1, 0], [1, 0, 1], [0, 0, 0]])
+        result = first_passage_moments(q, mask(3, 2), moments=2)
+        assert_that(result[:, 0].tolist()).is_equal_to([3.0, 2.0, 0.0])
+        assert_that(result[:, 1].tolist()).is_equal_to([16.0, 10.0, 0.0])
+
+    def test_first_passage_moments_krylov(self) -> None:
+        q = generator([[0, 1, 0], [1, 0, 1], [0, 0, 0]])
+        solver = KrylovSolver("ilu0")
+        result = first_passage_moments(q, mask(3, 2), moments=2, solver=solver)
+        assert_that(np.allclose(result[:, 0], [3.0, 2.0, 0.0])).is_true()
+        assert_that(np.allclose(result[:, 1], [16.0, 10.0, 0.0])).is_true()
+        assert_that(solver.diagnostics.converged).is_true()
+
+    def test_first_passage_moments_exponential(self) -> None:
+        q = generator([[0, 4.0], [0, 0]])
+        result = first_passage_moments(q, mask(2, 1), moments=3, cache=None)
+        # Exponential with rate 4: E[T^k] = k! / 4^k.
+        assert_that(np.allclose(result[0], [0.25, 2 / 16, 6 / 64])).is_true()
+
+    def test_first_passage_moments_unreachable(self) -> None:
+        # 0 may jump to the absorbing state 3 and never reach the target 2.
+        q = generator([[0, 1, 0, 1], [1, 0, 1, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+        result = first_passage_moments(q, mask(4, 2))
+        assert_that(np.isinf(result[[0, 1, 3], 0]).all()).is_true()
+        assert_that(result[2, 0]).is_equal_to(0.0)
+
+    def test_first_passage_moments_invalid(self) -> None:
+        q = generator([[0, 1], [1, 0]])
+        with pytest.raises(ValueError, match="target"):
+            first_passage_moments(q, mask(2))
+        with pytest.raises(ValueError, match="moments"):
+            first_passage_moments(q, mask(2, 0), moments=0)
+
+    def test_passage_time_cdf_exponential(self) -> None:
+        q = generator([[0, 2.0], [0, 0]])
+        times = [0.0, 0.2, 1.0, 2.0]
+        result = passage_time_cdf(q, mask(2, 1), times)
+        assert_that(result.shape).is_equal_to((2, 4))
+        expected = 1 - np.exp(-2.0 * np.array(times))
+        assert_that(np.allclose(result[0], expected, atol=1e-9)).is_true()
+        assert_that(result[1].tolist()).is_equal_to([1.0] * 4)
+
+    def test_passage_time_cdf_erlang(self) -> None:
+        # Two phases with rate 2, then a faster state that must not matter.
+        q = generator([[0, 2.0, 0], [0, 0, 2.0], [50.0, 0, 0]])
+        times = np.array([0.5, 1.0, 3.0])
+        result = passage_time_cdf(q, mask(3, 2), times)
+        expected = 1 - np.exp(-2 * times) * (1 + 2 * times)
+        assert_that(np.allclose(result[0], expected, atol=1e-9)).is_true()
+
+    def test_passage_time_cdf_unreachable(self) -> None:
+        q = generator([[0, 1, 1], [0, 0, 0], [0, 0, 0]])
+        result = passage_time_cdf(q, mask(3, 1), [100.0])
+        assert_that(result[0, 0]).is_close_to(0.5, 1e-9)
+        assert_that(result[2, 0]).is_equal_to(0.0)
+
+    def test_passage_time_cdf_stiff(self) -> None:
+        # Fast exchanges between 0 and 1 make v change slowly at every jump,
+        # long before the absorption probabilities converge.
+        q = sparse.csr_matrix(
+            np.array([[-100.0, 100.0, 0], [100.0, -100.0 - 1e-9, 1e-9], [0, 0, 0]])
+        )
+        times = [10.0, 100.0]
+        result = passage_time_cdf(q, mask(3, 2), times)
+        for column, time in enumerate(times):
+            expected = linalg.expm(q.toarray() * time)[:, 2]
+            assert_that(
+                np.allclose(result[:, column], expected, rtol=1e-6, atol=0)
+            ).is_true()
+        assert_that(result[1, 1]).is_close_to(5.0e-8, 1e-10)
+
+    def test_passage_time_cdf_invalid(self) -> None:
+        q = generator([[0, 1], [1, 0]])
+        with pytest.raises(ValueError, match="target"):
+            passage_time_cdf(q, mask(2), [1.0])
+        with pytest.raises(ValueError, match="time"):
+            passage_time_cdf(q, mask(2, 0), [-1.0])
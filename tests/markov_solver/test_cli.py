@@ -29,15 +29,27 @@ def test_solve_command_no_args(runner):
 
 
 @pytest.mark.parametrize(
-    "definition_file, expected_exit_code, expected_probabilities",
+    "definition_file, options, expected_exit_code, expected_probabilities",
     [
         (
             "definitions/simple/simple.definition.yaml",
+            [],
             0,
-            [r"Rainy.+0\.166666666666667", r"Sunny.+0\.833333333333333"],
+            [
+                r"method.+symbolic",
+                r"Rainy.+0\.166666666666667",
+                r"Sunny.+0\.833333333333333",
+            ],
+        ),
+        (
+            "definitions/simple/simple.definition.yaml",
+            ["--method", "numeric"],
+            0,
+            [r"method.+numeric", r"Rainy.+0\.1666666667", r"Sunny.+0\.8333333333"],
         ),
         (
             "definitions/symbolic/symbolic.definition.yaml",
+            [],
             0,
             [
                 r"0.+0\.475836431226766",
@@ -53,6 +65,7 @@ def test_solve_command_with_args(
     resource_path_root,
     tmp_path,
     definition_file,
+    options,
     expected_exit_code,
     expected_probabilities,
 ):
@@ -61,7 +74,8 @@ def test_solve_command_with_args(
 
     result = runner.invoke(
         main,
-        ["solve", "--definition", str(definition_file_path), "--outdir", str(outdir)],
+        ["solve", "--definition", str(definition_file_path), "--outdir", str(outdir)]
+        + options,
     )
 
     assert_that(result.exit_code).is_equal_to(expected_exit_code)
@@ -69,5 +83,333 @@ def test_solve_command_with_args(
         assert_that(result.output).matches(expected_probability)
 
 
+def test_solve_command_from_stdin(runner, tmp_path):
+    definition = "\n".join(
+        [
+            '{"from": "Sunny", "to": "Sunny", "value": "0.9"}',
+            '{"from": "Sunny", "to": "Rainy", "value": "0.1"}',
+            '{"from": "Rainy", "to": "Rainy", "value": "0.5"}',
+            '{"from": "Rainy", "to": "Sunny", "value": "0.5"}',
+        ]
+    )
+
+    result = runner.invoke(
+        main,
+        ["solve", "--definition", "-", "--outdir", str(tmp_path / "output")],
+        input=definition,
+    )
+
+    assert_that(result.exit_code).is_equal_to(0)
+    assert_that(result.output).matches(r"Sunny.+0\.833333333333333")
+
+
+def test_solve_command_from_stdin_mtx(runner, tmp_path):
+    definition = "\n".join(
+        [
+            "%%MatrixMarket matrix coordinate real general",
+            "2 2 4",
+            "1 1 -1",
+            "1 2 1",
+            "2 1 2",
+            "2 2 -2",
+        ]
+    )
+
+    result = runner.invoke(
+        main,
+        [
+            "solve",
+            "--definition",
+            "-",
+            "--stdin-format",
+            "mtx",
+            "--outdir",
+            str(tmp_path / "output"),
+        ],
+        input=definition,
+    )
+
+    assert_that(result.exit_code).is_equal_to(0)
+    assert_that(result.output).matches(r"0\.66666666666")
+
+
+def test_solve_command_top_k_min_prob(runner, tmp_path):
+    definition = tmp_path / "chain.ndjson"
+    definition.write_text(
+        "".join(
+            '{{"from": "S{}", "to": "S{}", "value": "{}"}}\n'.format(
+                i, (i + 1) % 4, i + 1
+            )
+            for i in range(4)
+        )
+    )
+    outdir = tmp_path / "output"
+
+    result = runner.invoke(
+        main,
+        [
+            "solve",
+            "--definition",
+            str(definition),
+            "--outdir",
+            str(outdir),
+            "--method",
+            "numeric",
+            "--top-k",
+            "2",
+            "--min-prob",
+            "0.2",
+        ],
+    )
+
+    assert_that(result.output).matches(r"S0\.+0\.48")
+    assert_that(result.output).matches(r"S1\.+0\.24")
+    assert_that(result.output).does_not_match(r"S2\.+")
+    assert_that(result.output).does_not_match(r"S3\.+")
+    assert_that((outdir / "result.csv").read_text().count("\n")).is_equal_to(5)
+
+
+def test_solve_command_results_format(runner, tmp_path):
+    definition = tmp_path / "chain.ndjson"
+    definition.write_text(
+        '{"from": "Sunny", "to": "Rainy", "value": "0.1"}\n'
+        '{"from": "Rainy", "to": "Sunny", "value": "0.5"}\n'
+    )
+    outdir = tmp_path / "output"
+
+    runner.invoke(
+        main,
+        [
+            "solve",
+            "--definition",
+            str(definition),
+            "--outdir",
+            str(outdir),
+            "--method",
+            "numeric",
+            "--results-format",
+            "npz",
+        ],
+    )
+
+    assert_that(str(outdir / "result.npz")).exists()
+    assert_that(str(outdir / "result.txt")).exists()
+
+
+def test_solve_command_iad(runner, tmp_path):
+    definition = tmp_path / "chain.ndjson"
+    definition.write_text(
+        '{"from": "A0B0", "to": "A0B1", "value": "5"}\n'
+        '{"from": "A0B1", "to": "A0B0", "value": "2"}\n'
+        '{"from": "A1B0", "to": "A1B1", "value": "5"}\n'
+        '{"from": "A1B1", "to": "A1B0", "value": "2"}\n'
+        '{"from": "A0B1", "to": "A1B0", "value": "0.001"}\n'
+        '{"from": "A1B1", "to": "A0B0", "value": "0.001"}\n'
+    )
+
+    result = runner.invoke(
+        main,
+        [
+            "solve",
+            "--definition",
+            str(definition),
+            "--outdir",
+            str(tmp_path / "output"),
+            "--method",
+            "iad",
+        ],
+    )
+
+    assert_that(result.output).matches(r"method\.+iad")
+    assert_that(result.output).matches(r"iterations\.+\d")
+    assert_that(result.output).matches(r"A0B1\.+0\.357091844")
+
+
+def test_solve_command_krylov(runner, tmp_path):
+    definition = tmp_path / "chain.ndjson"
+    definition.write_text(
+        '{"from": "Sunny", "to": "Rainy", "value": "0.1"}\n'
+        '{"from": "Rainy", "to": "Sunny", "value": "0.5"}\n'
+    )
+
+    result = runner.invoke(
+        main,
+        [
+            "solve",
+            "--definition",
+            str(definition),
+            "--outdir",
+            str(tmp_path / "output"),
+            "--method",
+            "krylov",
+            "--preconditioner",
+            "ilut",
+        ],
+    )
+
+    assert_that(result.output).matches(r"preconditioner\.+ilut")
+    assert_that(result.output).matches(r"setup time \(s\)\.+")
+    assert_that(result.output).matches(r"Sunny\.+0\.83333333")
+
+
+def test_solve_command_refinement(runner, tmp_path):
+    definition = tmp_path / "chain.ndjson"
+    definition.write_text(
+        '{"from": "Sunny", "to": "Rainy", "value": "0.1"}\n'
+        '{"from": "Rainy", "to": "Sunny", "value": "0.5"}\n'
+    )
+
+    result = runner.invoke(
+        main,
+        [
+            "solve",
+            "--definition",
+            str(definition),
+            "--outdir",
+            str(tmp_path / "output"),
+            "--method",
+            "numeric",
+            "--refinement-steps",
+            "1",
+            "--precision",
+            "longdouble",
+        ],
+    )
+
+    assert_that(result.output).matches(r"precision\.+longdouble")
+    assert_that(result.output).matches(r"balance residual\.+")
+    assert_that(result.output).matches(r"Sunny\.+0\.83333333")
+
+
+def test_solve_command_iad_without_partition(runner, tmp_path):
+    definition = tmp_path / "chain.ndjson"
+    definition.write_text(
+        '{"from": "Sunny", "to": "Rainy", "value": "0.1"}\n'
+        '{"from": "Rainy", "to": "Sunny", "value": "0.5"}\n'
+    )
+
+    result = runner.invoke(
+        main,
+        ["solve", "--definition", str(definition), "--method", "iad"],
+    )
+
+    assert_that(result.exit_code).is_equal_to(2)
+    assert_that(result.output).contains("Cannot detect a partition")
+
+
+def test_passage_command(runner, resource_path_root, tmp_path):
+    definition_file_path = resource_path_root.joinpath(
+        "definitions/symbolic/symbolic.definition.yaml"
+    )
+    outdir = tmp_path / "output"
+
+    result = runner.invoke(
+        main,
+        [
+            "passage",
+            "--definition",
+            str(definition_file_path),
+            "--target",
+            "3",
+            "--moments",
+            "2",
+            "--time",
+            "1",
+            "--time",
+            "10",
+            "--outdir",
+            str(outdir),
+        ],
+    )
+
+    assert_that(result.exit_code).is_equal_to(0)
+    assert_that(result.output).matches(r"0\.+7\.037037037")
+    assert_that(result.output).contains("passage time cdf")
+    assert_that((outdir / "passage.csv").read_text()).starts_with(
+        "index,state,moment_1,moment_2\n"
+    )
+    assert_that((outdir / "passage_cdf.csv").read_text()).starts_with(
+        "index,state,time,probability\n0,0,1.0,"
+    )
+
+
+def test_passage_command_krylov(runner, resource_path_root, tmp_path):
+    definition_file_path = resource_path_root.joinpath(
+        "definitions/symbolic/symbolic.definition.yaml"
+    )
+
+    result = runner.invoke(
+        main,
+        [
+            "passage",
+            "--definition",
+            str(definition_file_path),
+            "--target",
+            "3",
+            "--method",
+            "krylov",
+            "--preconditioner",
+            "block-jacobi",
+            "--outdir",
+            str(tmp_path / "output"),
+        ],
+    )
+
+    assert_that(result.exit_code).is_equal_to(0)
+    assert_that(result.output).matches(r"preconditioner\.+block-jacobi")
+    assert_that(result.output).matches(r"0\.+7\.037037037")
+
+
+def test_passage_command_unknown_target(runner, resource_path_root, tmp_path):
+    definition_file_path = resource_path_root.joinpath(
+        "definitions/symbolic/symbolic.definition.yaml"
+    )
+
+    result = runner.invoke(
+        main,
+        ["passage", "--definition", str(definition_file_path), "--target", "9"],
+    )
+
+    assert_that(result.exit_code).is_equal_to(2)
+    assert_that(result.output).contains("Unknown target state: 9")
+
+
+def test_solve_command_invalid_chain(runner, tmp_path):
+    definition = tmp_path / "chain.ndjson"
+    definition.write_text(
+        '{"from": "Sunny", "to": "Rainy", "value": "-0.1"}\n'
+        '{"from": "Rainy", "to": "Sunny", "value": "mu"}\n'
+    )
+
+    result = runner.invoke(
+        main,
+        ["solve", "--definition", str(definition), "--outdir", str(tmp_path)],
+    )
+
+    assert_that(result.exit_code).is_equal_to(1)
+    assert_that(result.output).contains("Invalid chain definition")
+    assert_that(result.output).contains("Link Sunny -> Rainy has value -0.1")
+    assert_that(result.output).contains("Symbol mu is not defined")
+
+
+def test_validate_command(runner, tmp_path):
+    definition = tmp_path / "chain.ndjson"
+    definition.write_text(
+        '{"from": "Sunny", "to": "Sunny", "value": "0.9"}\n'
+        '{"from": "Sunny", "to": "Rainy", "value": "0.1"}\n'
+        '{"from": "Rainy", "to": "Sunny", "value": "0.4"}\n'
+    )
+
+    result = runner.invoke(main, ["validate", "--definition", str(definition)])
+    assert_that(result.exit_code).is_equal_to(0)
+    assert_that(result.output).contains("No violations")
+
+    result = runner.invoke(
+        main, ["validate", "--definition", str(definition), "--stochastic"]
+    )
+    assert_that(result.exit_code).is_equal_to(1)
+    assert_that(result.output).contains("Probabilities out of Rainy sum to 0.4")
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from assertpy import assert_that
+
+from markov_solver.utils.async_utils import (
+    get_default_executor,
+    run_blocking,
+    set_default_executor,
+)
+
+
+class TestAsyncUtils:
+    def test_run_blocking(self) -> None:
+        result = asyncio.run(run_blocking(pow, 2, 10))
+        assert_that(result).is_equal_to(1024)
+
+    def test_run_blocking_kwargs(self) -> None:
+        result = asyncio.run(run_blocking(int, "ff", base=16))
+        assert_that(result).is_equal_to(255)
+
+    def test_run_blocking_does_not_block_loop(self) -> None:
+        def blocking() -> float:
+            time.sleep(0.2)
+            return time.monotonic()
+
+        async def scenario() -> tuple:  # type: ignore[type-arg]
+            ticks = []
+
+            async def ticker() -> None:
+                for _ in range(3):
+                    ticks.append(time.monotonic())
+                    await asyncio.sleep(0.01)
+
+            done, _ = await asyncio.gather(run_blocking(blocking), ticker())
+            return done, ticks
+
+        done, ticks = asyncio.run(scenario())
+        assert_that(ticks).is_length(3)
+        # The loop ticked while the blocking call was still running.
+        assert_that(max(ticks)).is_less_than(done)
+
+    def test_run_blocking_timeout(self) -> None:
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run_blocking(time.sleep, 1, timeout=0.01))
+
+    def test_run_blocking_executor(self) -> None:
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="custom") as executor:
+            name = asyncio.run(
+                run_blocking(lambda: threading.current_thread().name, executor=executor)
+            )
+        assert_that(name).starts_with("custom")
+
+    def test_default_executor(self) -> None:
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="default"
+        ) as executor:
+            set_default_executor(executor)
+            try:
+                assert_that(get_default_executor()).is_same_as(executor)
+                name = asyncio.run(
+                    run_blocking(lambda: threading.current_thread().name)
+                )
+            finally:
+                set_default_executor(None)
+        assert_that(name).starts_with("default")
+        assert_that(get_default_executor()).is_none()
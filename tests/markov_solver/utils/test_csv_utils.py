@@ -1,6 +1,6 @@
 from assertpy import assert_that
 
-from markov_solver.utils.csv_utils import read_csv, save_csv, str_csv
+from markov_solver.utils.csv_utils import CsvWriter, read_csv, save_csv, str_csv
 
 
 class TestCsvUtils:
@@ -41,6 +41,31 @@ class TestCsvUtils:
         content = test_file.read_text()
         assert_that(content).does_not_contain("old")
 
+    def test_save_csv_append_header_once(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "test.csv"
+        save_csv(str(test_file), ["name", "age"], [("John", "30")], append=True)
+        save_csv(str(test_file), ["name", "age"], [("Jane", "25")], append=True)
+        content = test_file.read_text()
+        assert_that(content).is_equal_to("name,age\nJohn,30\nJane,25\n")
+
+    def test_csv_writer(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "out" / "test.csv"
+        with CsvWriter(str(test_file), ["Name", "Age"], flush_rows=2) as writer:
+            writer.write_row(("John", 30))
+            writer.write_rows([("Jane", 25), ("Jim", 40)])
+        content = test_file.read_text()
+        assert_that(content).is_equal_to("name,age\nJohn,30\nJane,25\nJim,40\n")
+
+    def test_csv_writer_flush_rows(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        test_file = tmp_path / "test.csv"
+        writer = CsvWriter(str(test_file), ["name"], flush_rows=2)
+        writer.write_row(("John",))
+        assert_that(test_file.read_text()).is_empty()
+        writer.write_row(("Jane",))
+        assert_that(test_file.read_text()).is_equal_to("name\nJohn\nJane\n")
+        writer.close()
+        writer.close()
+
     def test_str_csv(self) -> None:
         assert_that(str_csv("Hello World")).is_equal_to("hello_world")
         assert_that(str_csv("path/to/file")).is_equal_to("path_to_file")
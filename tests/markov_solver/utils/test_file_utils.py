@@ -1,3 +1,4 @@
+import pytest
 from assertpy import assert_that
 
 from markov_solver.utils.file_utils import (
@@ -36,6 +37,10 @@ class TestFileUtils:
         test_file.write_text("content")
         assert_that(is_empty_file(str(test_file))).is_false()
 
+    def test_is_empty_file_missing(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        with pytest.raises(FileNotFoundError):
+            is_empty_file(str(tmp_path / "missing.txt"))
+
     def test_empty_file(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
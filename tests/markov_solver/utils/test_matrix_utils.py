@@ -0,0 +1,27 @@
+import pytest
+from assertpy import assert_that
+
+from markov_solver.utils.matrix_utils import (
+    read_state_names,
+    states_sidecar_path,
+    write_state_names,
+)
+
+
+class TestMatrixUtils:
+    def test_states_sidecar_path(self) -> None:
+        assert_that(str(states_sidecar_path("out/chain.mtx"))).is_equal_to(
+            "out/chain.states"
+        )
+
+    def test_write_read_state_names(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        path = tmp_path / "chain.states"
+        write_state_names(path, ["A", "state B", ""])
+        assert_that(read_state_names(path)).is_equal_to(["A", "state B", ""])
+
+    def test_read_state_names_missing(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        assert_that(read_state_names(tmp_path / "chain.states")).is_none()
+
+    def test_write_state_names_line_break(self, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        with pytest.raises(ValueError, match="line break"):
+            write_state_names(tmp_path / "chain.states", ["A\nB"])
@@ -0,0 +1,90 @@
+import pickle
+
+import numpy as np
+import pytest
+from assertpy import assert_that
+from scipy import sparse
+
+from markov_solver.utils import shared_memory
+from markov_solver.utils.shared_memory import (
+    SharedArrays,
+    attach_array,
+    attach_generator,
+    attach_matrix,
+    detach,
+    detach_all,
+)
+
+
+class TestSharedMemory:
+    def test_share_array(self) -> None:
+        with SharedArrays() as arrays:
+            handle = arrays.share_array(np.arange(6, dtype=np.int32).reshape(2, 3))
+            view = attach_array(handle)
+            assert_that(view.dtype).is_equal_to(np.dtype(np.int32))
+            assert_that(view.tolist()).is_equal_to([[0, 1, 2], [3, 4, 5]])
+            del view
+            detach_all()
+
+    def test_create_array_is_shared(self) -> None:
+        with SharedArrays() as arrays:
+            handle, owner_view = arrays.create_array((2, 2))
+            assert_that(owner_view.tolist()).is_equal_to([[0.0, 0.0], [0.0, 0.0]])
+            attach_array(handle)[1, 0] = 3.5
+            assert_that(owner_view[1, 0]).is_equal_to(3.5)
+            del owner_view
+            detach_all()
+
+    def test_empty_array(self) -> None:
+        with SharedArrays() as arrays:
+            handle = arrays.share_array(np.zeros(0))
+            assert_that(attach_array(handle).shape).is_equal_to((0,))
+            detach_all()
+
+    def test_share_matrix(self) -> None:
+        matrix = sparse.random(30, 30, density=0.2, format="csr", random_state=1)
+        with SharedArrays() as arrays:
+            handle = arrays.share_matrix(matrix)
+            shared = attach_matrix(handle)
+            assert_that((shared != matrix).nnz).is_equal_to(0)
+            del shared
+            detach_all()
+
+    def test_share_generator(self) -> None:
+        generator = sparse.csr_matrix([[-1.0, 1.0], [2.0, -2.0]])
+        with SharedArrays() as arrays:
+            handle = arrays.share_generator(["A", "state B"], generator)
+            names, matrix = attach_generator(handle)
+            assert_that(names.tolist()).is_equal_to(["A", "state B"])
+            assert_that(matrix.toarray().tolist()).is_equal_to(
+                [[-1.0, 1.0], [2.0, -2.0]]
+            )
+            del names, matrix
+            detach_all()
+
+    def test_detach(self) -> None:
+        with SharedArrays() as arrays:
+            handle = arrays.share_generator(["A", "B"], sparse.identity(2))
+            other = arrays.share_array(np.ones(2))
+            names, matrix = attach_generator(handle)
+            assert_that(attach_array(other).tolist()).is_equal_to([1.0, 1.0])
+            del names, matrix
+            detach(handle)
+            assert_that(list(shared_memory._attached)).is_equal_to([other.name])
+            detach(handle, other)
+            assert_that(shared_memory._attached).is_empty()
+
+    def test_handle_size_does_not_depend_on_matrix(self) -> None:
+        small = sparse.identity(10, format="csr")
+        large = sparse.identity(100000, format="csr")
+        with SharedArrays() as arrays:
+            small_handle = pickle.dumps(arrays.share_matrix(small))
+            large_handle = pickle.dumps(arrays.share_matrix(large))
+            assert_that(len(large_handle)).is_less_than(len(small_handle) + 16)
+
+    def test_close_unlinks(self) -> None:
+        arrays = SharedArrays()
+        handle = arrays.share_array(np.ones(3))
+        arrays.close()
+        with pytest.raises(FileNotFoundError):
+            attach_array(handle)